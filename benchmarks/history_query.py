@@ -0,0 +1,108 @@
+"""历史数据库查询基准：向临时数据库写入大量信道测试样本，测量写入速率以及按信道和时间范围的聚合与百分位查询耗时
+
+用法:
+    python benchmarks/history_query.py                        # 单个信道100万个样本(每秒一个，约11.6天)
+    python benchmarks/history_query.py --rows 5000000         # 更大的数据量
+    python benchmarks/history_query.py --max-ms 50            # 任一查询中位数超过50 ms时退出码为1
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.models.data_models import ChannelTestDataStore  # noqa: E402
+from src.services.history_store import HistoryStore  # noqa: E402
+
+
+BAND = '5GHz'
+CHANNEL = 36
+# 样本间隔(秒)
+SAMPLE_INTERVAL = 1.0
+DAY = 86400.0
+
+
+@dataclass
+class Query:
+    name: str
+    run: Callable[[HistoryStore], Optional[float]]
+
+
+def populate(store: HistoryStore, rows: int, batch: int, seed: int) -> float:
+    """分批写入样本，返回写入耗时(秒)；相邻信道写入同样数量的样本作为干扰数据"""
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    for offset in range(0, rows, batch):
+        count = min(batch, rows - offset)
+        timestamp_ns = ((offset + np.arange(count)) * SAMPLE_INTERVAL * 1e9).astype(np.int64)
+        store.record_channel_tests({
+            channel: {'test_data': ChannelTestDataStore(
+                channel, BAND, 80.0, rssi=rng.integers(-90, -30, count), snr=rng.random(count) * 40,
+                throughput=rng.random(count) * 500, packet_loss=rng.random(count), timestamp_ns=timestamp_ns
+            )}
+            for channel in (CHANNEL, CHANNEL + 4)
+        })
+    return time.perf_counter() - start
+
+
+def measure(store: HistoryStore, query: Query, repeat: int) -> float:
+    """返回多次查询耗时的中位数(毫秒)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query.run(store)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="历史数据库查询耗时基准")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="每个信道写入的样本数")
+    parser.add_argument('--batch', type=int, default=100_000, help="每次写入的样本数")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-ms', type=float, default=0.0, help="任一查询的中位数超过该值(毫秒)时失败，0表示不检查")
+    args = parser.parse_args(argv)
+    
+    # 时间范围不与预聚合的时间桶对齐，两端的部分时间桶需要扫描原始行
+    now = args.rows * SAMPLE_INTERVAL - 123.0
+    queries = [
+        Query('avg throughput', lambda s: s.channel_stat('throughput', BAND, CHANNEL, 'avg')),
+        Query('median throughput', lambda s: s.channel_stat('throughput', BAND, CHANNEL, 'median')),
+        Query('p95 rssi', lambda s: s.channel_stat('rssi', BAND, CHANNEL, 'p95')),
+        Query('p99 snr', lambda s: s.channel_stat('snr', BAND, CHANNEL, 'p99')),
+        Query('median throughput, last week',
+              lambda s: s.channel_stat('throughput', BAND, CHANNEL, 'median', start=now - 7 * DAY, end=now)),
+        Query('p95 rssi, last day',
+              lambda s: s.channel_stat('rssi', BAND, CHANNEL, 'p95', start=now - DAY, end=now)),
+        Query('avg snr, last hour', lambda s: s.channel_stat('snr', BAND, CHANNEL, 'avg', start=now - 3600, end=now)),
+    ]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, 'history.db'), site='bench', max_samples_per_channel=args.batch)
+        elapsed = populate(store, args.rows, args.batch, args.seed)
+        print(f"Inserted {args.rows * 2:,} samples ({args.rows:,} on channel {CHANNEL}) in {elapsed:.1f} s "
+              f"({args.rows * 2 / elapsed:,.0f} rows/s)")
+        
+        violations = []
+        for query in queries:
+            median_ms = measure(store, query, args.repeat)
+            print(f"[{query.name}] {median_ms:10.2f} ms  (median of {args.repeat})")
+            if args.max_ms and median_ms > args.max_ms:
+                violations.append(f"{query.name}: {median_ms:.2f} ms > {args.max_ms:.2f} ms")
+        store.close()
+    
+    for violation in violations:
+        print(f"FAIL {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""回放吞吐量基准：以最快速度回放录制的扫描数据，测量分析流程每秒处理的扫描次数，无需无线网卡
+
+用法:
+    python benchmarks/replay_throughput.py                        # 回放tests/fixtures/scans中的扫描输出
+    python benchmarks/replay_throughput.py --source survey.wts    # 回放录制的会话文件
+    python benchmarks/replay_throughput.py --test-count 100       # 每次扫描后再运行推荐分析
+    python benchmarks/replay_throughput.py --min-rate 200         # 低于每秒200次扫描时退出码为1
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.managers.channel_scan_manager import SOURCE_REPLAY, ChannelScanManager  # noqa: E402
+from src.managers.recommendation_manager import RecommendationManager  # noqa: E402
+from src.services.scan_replay import SPEED_UNLIMITED, ScanReplay  # noqa: E402
+from src.services.session_store import (COMPRESSION_NONE, COMPRESSION_ZLIB, SessionWriter,  # noqa: E402
+                                        is_session_file)
+
+
+DEFAULT_SOURCE = os.path.join(ROOT, 'tests', 'fixtures', 'scans')
+
+
+@dataclass
+class Scenario:
+    name: str
+    replay: Callable[[], ScanReplay]
+
+
+def record_session(source: str, path: str, scans: int, compression: str):
+    """把扫描输出文件的回放结果录制为会话文件，供会话回放场景使用"""
+    manager = ChannelScanManager(scanner=ScanReplay.from_path(source, speed=SPEED_UNLIMITED, loop=True),
+                                 history=None, source=SOURCE_REPLAY)
+    with SessionWriter(path, compression=compression) as writer:
+        for i in range(scans):
+            writer.write_scan(manager.scan(fallback=False), timestamp=float(i))
+
+
+def measure(scenario: Scenario, scans: int, band: str, test_count: int, repeat: int) -> float:
+    """返回多轮测量中每秒扫描次数的中位数"""
+    rates = []
+    for _ in range(repeat):
+        manager = ChannelScanManager(scanner=scenario.replay(), history=None, source=SOURCE_REPLAY)
+        recommender = RecommendationManager(workers=1, seed=0, history=None) if test_count else None
+        
+        start = time.perf_counter()
+        for _ in range(scans):
+            result = manager.scan(fallback=False)
+            if recommender is not None:
+                recommender.recommend(result.channels(band), test_count)
+        rates.append(scans / (time.perf_counter() - start))
+    return statistics.median(rates)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="扫描回放流程吞吐量基准")
+    parser.add_argument('--source', default=DEFAULT_SOURCE, help="会话文件、扫描输出文件或目录")
+    parser.add_argument('--scans', type=int, default=2000, help="每轮回放的扫描次数(不足时循环回放)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--band', default='5GHz', help="推荐分析使用的频段")
+    parser.add_argument('--test-count', type=int, default=0, help="每次扫描后推荐分析的每信道测试次数，0表示只扫描")
+    parser.add_argument('--min-rate', type=float, default=0.0, help="任一场景低于该扫描速率(次/秒)时失败")
+    args = parser.parse_args(argv)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        scenarios = [Scenario(f"source {os.path.basename(args.source.rstrip(os.sep)) or args.source}",
+                              lambda: ScanReplay.from_path(args.source, speed=SPEED_UNLIMITED, loop=True))]
+        # 扫描输出文件额外录制为会话文件，对比解析聚合与会话解码的开销
+        if not is_session_file(args.source):
+            for compression in (COMPRESSION_NONE, COMPRESSION_ZLIB):
+                path = os.path.join(directory, f'replay_{compression}.wts')
+                record_session(args.source, path, args.scans, compression)
+                scenarios.append(Scenario(f'session ({compression})',
+                                          lambda path=path: ScanReplay.from_session(path, speed=SPEED_UNLIMITED,
+                                                                                    loop=True)))
+        
+        violations = []
+        for scenario in scenarios:
+            rate = measure(scenario, args.scans, args.band, args.test_count, args.repeat)
+            print(f"[{scenario.name}] {rate:10.1f} scans/s  ({args.scans} scans, test_count {args.test_count}, "
+                  f"median of {args.repeat})")
+            if rate < args.min_rate:
+                violations.append(f"{scenario.name}: {rate:.1f} scans/s < {args.min_rate:.1f}")
+    
+    for violation in violations:
+        print(f"FAIL {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
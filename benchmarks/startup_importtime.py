@@ -0,0 +1,139 @@
+"""启动耗时基准：以 -X importtime 统计界面与命令行启动路径的导入耗时，并检查不应在启动时导入的模块
+
+用法:
+    python benchmarks/startup_importtime.py                 # 全部场景，超出预算或导入了禁止的模块时退出码为1
+    python benchmarks/startup_importtime.py --scenario gui --top 20
+    python benchmarks/startup_importtime.py --offscreen     # 无显示器时以offscreen平台测量窗口显示耗时
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IMPORT_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+@dataclass
+class Scenario:
+    name: str
+    code: str
+    budget_ms: float
+    forbidden: Tuple[str, ...] = ()
+
+
+SCENARIOS = {
+    # 主窗口框架：面板、matplotlib和测速服务都应推迟到窗口显示之后
+    'gui': Scenario(
+        name='gui',
+        code="import main; import src.ui.main_window",
+        budget_ms=250,
+        forbidden=('matplotlib', 'src.ui.channel_analysis_panel', 'src.ui.recommend_panel', 'src.cli')
+    ),
+    # 创建、显示并绘制主窗口框架(面板在随后的事件循环中创建，不计入)
+    'window': Scenario(
+        name='window',
+        code=("from PyQt5.QtWidgets import QApplication; app = QApplication([]); "
+              "from src.ui.main_window import MainWindow; w = MainWindow(); w.show(); w.repaint()"),
+        budget_ms=300,
+        forbidden=('matplotlib', 'src.ui.channel_analysis_panel', 'src.ui.recommend_panel')
+    ),
+    # 无界面命令行不得加载Qt和matplotlib
+    'cli': Scenario(
+        name='cli',
+        code="import src.cli",
+        budget_ms=600,
+        forbidden=('PyQt5', 'matplotlib')
+    ),
+}
+
+
+@dataclass
+class Measurement:
+    wall_ms: float
+    import_ms: float
+    modules: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # 模块 -> (自身耗时, 累计耗时)，微秒
+
+
+def measure(scenario: Scenario, env: Dict[str, str]) -> Measurement:
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', scenario.code],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"Scenario {scenario.name} failed:\n{completed.stderr[-2000:]}")
+    
+    modules = {}
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match.group(1)), int(match.group(2)), match.group(3), match.group(4)
+        modules[name] = (self_us, cumulative_us)
+        # 缩进为一个空格的是顶层导入，其累计耗时之和即总导入耗时
+        if len(indent) == 1:
+            total_us += cumulative_us
+    return Measurement(wall_ms=wall_ms, import_ms=total_us / 1000, modules=modules)
+
+
+def run_scenario(scenario: Scenario, repeat: int, top: int, env: Dict[str, str]) -> List[str]:
+    """返回违反的约束，为空表示通过"""
+    measurements = [measure(scenario, env) for _ in range(repeat)]
+    # 取导入耗时中位数的那一次作为代表
+    measurements.sort(key=lambda m: m.import_ms)
+    representative = measurements[len(measurements) // 2]
+    wall_ms = statistics.median(m.wall_ms for m in measurements)
+    
+    print(f"[{scenario.name}] imports {representative.import_ms:.1f} ms, process wall {wall_ms:.1f} ms "
+          f"(median of {repeat}, budget {scenario.budget_ms:.0f} ms)")
+    slowest = sorted(representative.modules.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"    {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+    
+    violations = []
+    if representative.import_ms > scenario.budget_ms:
+        violations.append(f"{scenario.name}: imports took {representative.import_ms:.1f} ms > {scenario.budget_ms:.0f} ms")
+    for prefix in scenario.forbidden:
+        imported = sorted(name for name in representative.modules if name == prefix or name.startswith(prefix + '.'))
+        if imported:
+            violations.append(f"{scenario.name}: must not import {prefix} at startup (got {', '.join(imported[:3])})")
+    return violations
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="启动导入耗时基准与回归检查")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), action='append', help="默认运行全部场景")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10, help="列出累计耗时最长的N个模块")
+    parser.add_argument('--budget-scale', type=float, default=1.0, help="按机器性能放宽或收紧各场景的预算")
+    parser.add_argument('--offscreen', action='store_true', help="设置QT_QPA_PLATFORM=offscreen")
+    args = parser.parse_args(argv)
+    
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    if args.offscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+    
+    violations = []
+    for name in args.scenario or sorted(SCENARIOS):
+        scenario = SCENARIOS[name]
+        scenario.budget_ms *= args.budget_scale
+        violations.extend(run_scenario(scenario, args.repeat, args.top, env))
+    
+    for violation in violations:
+        print(f"FAIL {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
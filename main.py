@@ -1,13 +1,20 @@
 import sys
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt
-from src.ui.main_window import MainWindow
 from src.utils.logger import logger
-from src.utils.exception_handler import setup_global_exception_handler
 from src.services.config_service import config_service
 
 
 def main():
+    # 带子命令时走无界面的命令行模式，不加载PyQt5和matplotlib；界面模式不导入命令行依赖的测速服务
+    if len(sys.argv) > 1:
+        from src import cli
+        if sys.argv[1] in cli.COMMANDS:
+            sys.exit(cli.main(sys.argv[1:]))
+    
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import Qt
+    from src.ui.main_window import MainWindow
+    from src.utils.exception_handler import setup_global_exception_handler
+    
     setup_global_exception_handler()
     
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
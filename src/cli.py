@@ -0,0 +1,339 @@
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from typing import List, Optional, TextIO
+import numpy as np
+from src.managers.channel_scan_manager import SOURCE_REPLAY, ChannelScanManager, channel_scan_manager
+from src.managers.recommendation_manager import RecommendationManager
+from src.models.data_models import (ChannelInfo, ChannelScanResult, LatencyResult, ServerProbeResult,
+                                    SpeedTestResult, ThroughputResult)
+from src.services.channel_scoring import calculate_weighted_score
+from src.services.config_service import config_service
+from src.services.connection_pool import ConnectionPool
+from src.services.history_store import history_store
+from src.services.latency_probe import latency_probe
+from src.services.scan_replay import ReplayExhausted, ScanReplay
+from src.services.server_selector import server_selector
+from src.services.session_store import SessionReader, SessionWriter
+from src.services.speed_test_service import speed_test_service
+from src.utils.logger import logger
+
+
+# 无界面命令行入口：不导入PyQt5和matplotlib，每条结果输出为一行JSON，适合在无显示器的监测主机上批量运行
+COMMANDS = ('scan', 'recommend', 'speed', 'session')
+
+BAND_ALL = 'all'
+
+
+class JsonLinesWriter:
+    """将每条记录序列化为一行JSON并立即刷新，便于下游逐行消费"""
+    
+    def __init__(self, stream: TextIO = None):
+        self._stream = stream or sys.stdout
+        self.run = 0
+    
+    def emit(self, record_type: str, **fields):
+        record = {'type': record_type, 'run': self.run, 'timestamp': datetime.now().isoformat(timespec='milliseconds')}
+        record.update(fields)
+        self._stream.write(json.dumps(record, ensure_ascii=False, default=_json_default) + '\n')
+        self._stream.flush()
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _channel_record(channel_info: ChannelInfo, include_networks: bool) -> dict:
+    record = {
+        'band': channel_info.band,
+        'channel': channel_info.channel,
+        'frequency': channel_info.frequency,
+        'signal_strength': channel_info.signal_strength,
+        'occupancy': channel_info.occupancy,
+        'interference': channel_info.interference,
+        'quality_score': channel_info.get_quality_score(),
+        'network_count': len(channel_info.networks),
+    }
+    if include_networks:
+        record['networks'] = [asdict(network) if is_dataclass(network) else network
+                              for network in channel_info.networks]
+    return record
+
+
+def _latency_record(result: LatencyResult) -> dict:
+    record = asdict(result)
+    record.pop('samples')
+    record['loss'] = result.loss
+    return record
+
+
+def _throughput_record(result: ThroughputResult, include_samples: bool) -> dict:
+    record = asdict(result)
+    if not include_samples:
+        record.pop('samples')
+        record.pop('sample_times')
+    return record
+
+
+def _probe_record(result: ServerProbeResult) -> dict:
+    record = asdict(result)
+    record['usable'] = result.usable
+    return record
+
+
+def _scan(args) -> ChannelScanResult:
+    bands = None if args.band == BAND_ALL else [args.band]
+    return args.scan_manager.scan(bands, simulate=args.simulate, fallback=not args.no_fallback)
+
+
+def run_scan(args, writer: JsonLinesWriter) -> int:
+    result = _scan(args)
+    if args.session is not None:
+        args.session.write_scan(result)
+    for channels in result.bands.values():
+        for channel_info in channels:
+            writer.emit('channel', source=result.source, **_channel_record(channel_info, args.networks))
+    
+    writer.emit('scan', source=result.source, duration=result.duration,
+                channels={band: len(channels) for band, channels in result.bands.items()})
+    return 0
+
+
+def run_recommend(args, writer: JsonLinesWriter) -> int:
+    start = time.monotonic()
+    scan_result = _scan(args)
+    test_count = args.test_count or config_service.get_test_count()
+    if args.session is not None:
+        args.session.write_scan(scan_result)
+    
+    def on_progress(percent: int, rate: float, eta: float):
+        writer.emit('progress', percent=percent, rate=rate, eta=eta)
+    
+    def on_channel(channel_data: dict):
+        channel_info = channel_data['channel_info']
+        writer.emit('channel_result', band=channel_info.band, channel=channel_info.channel,
+                    score=calculate_weighted_score(channel_data['analysis']), analysis=channel_data['analysis'])
+        if args.session is not None:
+            args.session.write_samples(channel_data['test_data'])
+    
+    recommendation = RecommendationManager(workers=args.workers, seed=args.seed).recommend(
+        scan_result.channels(args.band),
+        test_count,
+        progress_callback=on_progress if args.progress else None,
+        channel_callback=on_channel
+    )
+    writer.emit('recommendation', source=scan_result.source, band=recommendation.band, channel=recommendation.channel,
+                quality_score=recommendation.quality_score, reason=recommendation.reason,
+                expected_improvement=recommendation.expected_improvement, test_count=test_count,
+                duration=time.monotonic() - start, analysis=recommendation.analysis_details)
+    return 0
+
+
+async def _run_speed(args, writer: JsonLinesWriter) -> int:
+    failures = 0
+    summary = {'download': None, 'upload': None, 'latency': None, 'jitter': None}
+    server = None
+    
+    if not args.no_latency:
+        host = args.latency_host or config_service.get_ping_server()
+        try:
+            latency = await latency_probe.probe(host)
+            writer.emit('latency', **_latency_record(latency))
+            if latency.received:
+                summary['latency'] = latency.avg
+                summary['jitter'] = latency.jitter
+        except OSError as e:
+            failures += 1
+            writer.emit('error', phase='latency', target=host, message=str(e))
+    
+    async with ConnectionPool() as pool:
+        if not args.no_download:
+            ranked = await server_selector.probe_all(args.servers or config_service.get_test_servers(), pool=pool)
+            for probe in ranked:
+                writer.emit('server_probe', **_probe_record(probe))
+            
+            for server_url in [probe.url for probe in ranked if probe.usable][:args.top_k or server_selector.top_k]:
+                try:
+                    result = await speed_test_service.measure_download(server_url, pool=pool)
+                except Exception as e:
+                    failures += 1
+                    writer.emit('error', phase='download', target=server_url, message=str(e))
+                    continue
+                writer.emit('throughput', **_throughput_record(result, args.samples))
+                if result.throughput > (summary['download'] or 0.0):
+                    summary['download'] = result.throughput
+                    server = server_url
+        
+        upload_url = args.upload_url or config_service.get_upload_server()
+        if not args.no_upload and upload_url:
+            try:
+                result = await speed_test_service.measure_upload(upload_url, pool=pool)
+                writer.emit('throughput', **_throughput_record(result, args.samples))
+                summary['upload'] = result.throughput
+            except Exception as e:
+                failures += 1
+                writer.emit('error', phase='upload', target=upload_url, message=str(e))
+        
+        writer.emit('speed', connection_stats=asdict(pool.stats), **summary)
+    
+    # 全部阶段失败时没有可记录的结果
+    if any(value is not None for value in summary.values()):
+        history_store.record_speed_test(SpeedTestResult(
+            download_speed=summary['download'] or 0.0,
+            upload_speed=summary['upload'] or 0.0,
+            latency=summary['latency'] or 0.0,
+            jitter=summary['jitter'] or 0.0,
+            timestamp=datetime.now(),
+            server=server or upload_url or ''
+        ))
+    
+    return 1 if failures else 0
+
+
+def run_speed(args, writer: JsonLinesWriter) -> int:
+    return asyncio.run(_run_speed(args, writer))
+
+
+def run_session(args, writer: JsonLinesWriter) -> int:
+    with SessionReader(args.path) as reader:
+        if args.channels:
+            for timestamp, result in reader.iter_snapshots():
+                for channels in result.bands.values():
+                    for channel_info in channels:
+                        writer.emit('channel', source=result.source, snapshot_time=timestamp,
+                                    **_channel_record(channel_info, include_networks=True))
+        if args.samples:
+            for samples in reader.iter_samples():
+                writer.emit('samples', band=samples.band, channel=samples.channel, count=len(samples),
+                            rssi=float(np.mean(samples.rssi)), throughput=float(np.mean(samples.throughput)),
+                            packet_loss=float(np.mean(samples.packet_loss)))
+        
+        writer.emit('session', path=args.path, compression=reader.compression,
+                    created=datetime.fromtimestamp(reader.created), metadata=reader.metadata,
+                    snapshots=reader.snapshot_count, time_range=reader.time_range(),
+                    sample_sets=reader.sample_set_count, samples=reader.sample_count)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    bands = config_service.get_bands()
+    
+    batch = argparse.ArgumentParser(add_help=False)
+    batch.add_argument('--repeat', type=int, default=1, help="重复运行次数，0表示持续运行")
+    batch.add_argument('--interval', type=float, default=0.0, help="两次运行之间的间隔(秒)")
+    
+    scan_source = argparse.ArgumentParser(add_help=False)
+    scan_source.add_argument('--simulate', action='store_true', help="不扫描，直接使用模拟信道数据")
+    scan_source.add_argument('--no-fallback', action='store_true', help="扫描失败时报错而不是退回模拟数据")
+    scan_source.add_argument('--record', metavar='PATH', help="将扫描快照和测试样本录制到会话文件")
+    scan_source.add_argument('--replay', metavar='PATH',
+                             help="回放会话文件或netsh/nmcli/iw扫描输出文件(目录)，代替实际扫描")
+    scan_source.add_argument('--replay-speed', type=float, default=0.0,
+                             help="回放速度倍数，1为按录制时的间隔实时回放，0(默认)为尽快回放")
+    scan_source.add_argument('--replay-loop', action='store_true', help="回放结束后从头循环")
+    
+    parser = argparse.ArgumentParser(prog='wifi-test', description="WiFi信道分析与测速(无界面模式，输出JSON Lines)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    scan = commands.add_parser('scan', parents=[batch, scan_source], help="扫描各频段信道")
+    scan.add_argument('--band', choices=bands + [BAND_ALL], default=BAND_ALL)
+    scan.add_argument('--networks', action='store_true', help="输出每个信道上的网络(BSSID)")
+    scan.set_defaults(handler=run_scan)
+    
+    recommend = commands.add_parser('recommend', parents=[batch, scan_source], help="测试各信道并推荐最优信道")
+    recommend.add_argument('--band', choices=bands, default=bands[0])
+    recommend.add_argument('--test-count', type=int, help="每个信道的测试次数，默认取wifi.test_count")
+    recommend.add_argument('--progress', action='store_true', help="输出进度记录")
+    recommend.add_argument('--workers', type=int, help="并行测试的进程数，0表示使用全部CPU，默认取recommendation.workers")
+    recommend.add_argument('--seed', type=int, help="随机种子，相同种子得到相同的测试样本")
+    recommend.set_defaults(handler=run_recommend)
+    
+    speed = commands.add_parser('speed', parents=[batch], help="测试延迟、下载和上传速度")
+    speed.add_argument('--servers', nargs='+', help="下载测速服务器，默认取network.test_servers")
+    speed.add_argument('--top-k', type=int, help="完整测速的服务器数量")
+    speed.add_argument('--upload-url', help="上传测速地址，默认取network.upload_server")
+    speed.add_argument('--latency-host', help="延迟探测目标，默认取network.ping_server")
+    speed.add_argument('--no-latency', action='store_true')
+    speed.add_argument('--no-download', action='store_true')
+    speed.add_argument('--no-upload', action='store_true')
+    speed.add_argument('--samples', action='store_true', help="输出吞吐量采样序列")
+    speed.set_defaults(handler=run_speed)
+    
+    session = commands.add_parser('session', help="查看录制的会话文件")
+    session.add_argument('path')
+    session.add_argument('--channels', action='store_true', help="逐条输出各扫描快照中的信道")
+    session.add_argument('--samples', action='store_true', help="输出每组测试样本的统计")
+    session.set_defaults(handler=run_session, repeat=1, interval=0.0)
+    
+    return parser
+
+
+def _open_sources(args):
+    """按参数准备扫描数据来源(实际扫描或回放)与录制用的会话文件"""
+    args.scan_manager = channel_scan_manager
+    if getattr(args, 'replay', None):
+        replay = ScanReplay.from_path(args.replay, speed=args.replay_speed, loop=args.replay_loop)
+        args.scan_manager = ChannelScanManager(scanner=replay, history=None, source=SOURCE_REPLAY)
+    
+    # 批量运行的各轮录制到同一个会话文件
+    args.session = None
+    if getattr(args, 'record', None):
+        args.session = SessionWriter(args.record, metadata={
+            'command': args.command,
+            'site': socket.gethostname(),
+            'app_version': config_service.get_app_version()
+        })
+
+
+def main(argv: Optional[List[str]] = None, stream: TextIO = None) -> int:
+    args = build_parser().parse_args(argv)
+    writer = JsonLinesWriter(stream)
+    exit_code = 0
+    
+    try:
+        _open_sources(args)
+    except (OSError, ValueError) as e:
+        writer.emit('error', phase=args.command, message=str(e))
+        return 1
+    
+    try:
+        while True:
+            writer.run += 1
+            try:
+                exit_code = max(exit_code, args.handler(args, writer))
+            except ReplayExhausted as e:
+                # 批量模式下回放完全部录制数据即正常结束
+                if writer.run == 1:
+                    writer.emit('error', phase=args.command, message=str(e))
+                    exit_code = 1
+                break
+            except Exception as e:
+                logger.error(f"{args.command} failed: {e}", exc_info=True)
+                writer.emit('error', phase=args.command, message=str(e))
+                exit_code = 1
+            
+            if args.repeat and writer.run >= args.repeat:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if args.session is not None:
+            args.session.close()
+    
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
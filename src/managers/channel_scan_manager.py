@@ -0,0 +1,68 @@
+import time
+from typing import Callable, Dict, List, Optional
+from src.models.data_models import ChannelInfo, ChannelScanResult
+from src.services.config_service import config_service
+from src.services.history_store import HistoryStore, history_store
+from src.services.scan_replay import create_configured_replay
+from src.services.wifi_scanner import scan_all_bands, simulate_band_channels
+from src.utils.logger import logger
+
+
+SOURCE_SCAN = "scan"
+SOURCE_SIMULATED = "simulated"
+SOURCE_REPLAY = "replay"
+
+
+class ChannelScanManager:
+    """信道扫描流程：一次扫描得到所有频段的信道数据，扫描失败时按需退回模拟数据"""
+    
+    def __init__(self, scanner: Callable[[], Dict[str, List[ChannelInfo]]] = scan_all_bands,
+                 simulator: Callable[[str], List[ChannelInfo]] = simulate_band_channels,
+                 history: Optional[HistoryStore] = history_store, source: str = SOURCE_SCAN):
+        self._scanner = scanner
+        self._simulator = simulator
+        self._history = history
+        self.source = source
+    
+    def scan(self, bands: Optional[List[str]] = None, simulate: bool = False,
+             fallback: bool = True) -> ChannelScanResult:
+        """扫描指定频段(默认全部)并记录到历史数据库；simulate为True时不扫描，fallback为False时扫描失败直接抛出异常"""
+        result = self._scan(bands, simulate, fallback)
+        if self._history is not None:
+            self._history.record_scan(result.bands, result.source)
+        return result
+    
+    def _scan(self, bands: Optional[List[str]], simulate: bool, fallback: bool) -> ChannelScanResult:
+        bands = bands or config_service.get_bands()
+        start = time.monotonic()
+        
+        if not simulate:
+            try:
+                results = self._scanner()
+                return ChannelScanResult(
+                    bands={band: results.get(band, []) for band in bands},
+                    source=self.source,
+                    duration=time.monotonic() - start
+                )
+            except Exception as e:
+                # 回放需要可复现，不退回随机的模拟数据
+                if not fallback or self.source == SOURCE_REPLAY:
+                    raise
+                logger.warning(f"Channel scan failed, using simulated data: {e}")
+        
+        return ChannelScanResult(
+            bands={band: self._simulator(band) for band in bands},
+            source=SOURCE_SIMULATED,
+            duration=time.monotonic() - start
+        )
+
+
+def create_channel_scan_manager() -> ChannelScanManager:
+    """按配置创建：replay.source非空时回放录制的扫描数据，回放结果不写入历史数据库"""
+    replay = create_configured_replay()
+    if replay is None:
+        return ChannelScanManager()
+    return ChannelScanManager(scanner=replay, history=None, source=SOURCE_REPLAY)
+
+
+channel_scan_manager = create_channel_scan_manager()
@@ -0,0 +1,159 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from src.models.data_models import ChannelInfo, ChannelRecommendation, ChannelTestDataStore
+from src.services.channel_scoring import build_recommendation
+from src.services.channel_test_engine import test_channel_seeded
+from src.services.config_service import config_service
+from src.services.history_store import HistoryStore, history_store
+from src.utils.logger import logger
+from src.utils.progress_reporter import ProgressReporter
+
+
+# 多进程模式下检查取消请求的间隔(秒)
+_CANCEL_POLL_INTERVAL = 0.1
+
+
+class AnalysisCancelled(Exception):
+    """推荐分析被取消，携带已完成信道的检查点"""
+    
+    def __init__(self, checkpoint: dict):
+        super().__init__("Recommendation analysis cancelled")
+        self.checkpoint = checkpoint
+
+
+class RecommendationManager:
+    """信道推荐流程：逐信道批量测试，支持检查点续测、取消和进度回调，最后按加权评分给出推荐"""
+    
+    def __init__(self, workers: Optional[int] = None, seed: Optional[int] = None,
+                 parallel_min_samples: Optional[int] = None, history: Optional[HistoryStore] = history_store):
+        workers = workers if workers is not None else config_service.get_recommendation_workers()
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.seed = seed if seed is not None else config_service.get_recommendation_seed()
+        self.parallel_min_samples = (parallel_min_samples if parallel_min_samples is not None
+                                     else config_service.get_recommendation_parallel_min_samples())
+        self._history = history
+    
+    def recommend(self, channels: List[ChannelInfo], test_count: int,
+                  checkpoint: Optional[dict] = None,
+                  cancel_event: Optional[threading.Event] = None,
+                  progress_callback: Optional[Callable[[int, float, float], None]] = None,
+                  channel_callback: Optional[Callable[[dict], None]] = None) -> ChannelRecommendation:
+        """测试全部信道并返回推荐，测试样本与推荐结果记录到历史数据库；取消时抛出携带检查点的AnalysisCancelled"""
+        channel_test_results = self.test_channels(channels, test_count, checkpoint, cancel_event,
+                                                  progress_callback, channel_callback)
+        # 使用加权算法评估各信道
+        recommendation = build_recommendation(channel_test_results)
+        if self._history is not None:
+            self._history.record_channel_tests(channel_test_results)
+            self._history.record_recommendation(recommendation, test_count)
+        return recommendation
+    
+    def test_channels(self, channels: List[ChannelInfo], test_count: int,
+                      checkpoint: Optional[dict] = None,
+                      cancel_event: Optional[threading.Event] = None,
+                      progress_callback: Optional[Callable[[int, float, float], None]] = None,
+                      channel_callback: Optional[Callable[[dict], None]] = None) -> Dict[int, dict]:
+        """对每个信道批量执行test_count次测试，返回按信道顺序排列、以信道号为键的测试结果"""
+        if not channels:
+            raise ValueError("No channel data available")
+        
+        # 从检查点恢复已完成信道的测试结果
+        channel_test_results = {}
+        if checkpoint and self.is_resumable(checkpoint, channels, test_count):
+            channel_test_results = dict(checkpoint['channel_test_results'])
+            logger.info(f"Resuming recommendation with {len(channel_test_results)} channels already tested")
+        
+        progress = ProgressReporter(len(channels) * test_count, progress_callback or (lambda *_: None))
+        progress.start(len(channel_test_results) * test_count)
+        
+        def record(channel_info: ChannelInfo, samples: ChannelTestDataStore, analysis: dict):
+            channel_data = {
+                'channel_info': channel_info,
+                'test_data': samples,
+                'analysis': analysis
+            }
+            channel_test_results[channel_info.channel] = channel_data
+            progress.advance(test_count)
+            if channel_callback is not None:
+                channel_callback(channel_data)
+        
+        # 每个信道按其在列表中的位置派生独立种子，串行与多进程执行得到相同的样本
+        seeds = dict(zip((channel_info.channel for channel_info in channels),
+                         np.random.SeedSequence(self.seed).spawn(len(channels))))
+        pending = [channel_info for channel_info in channels if channel_info.channel not in channel_test_results]
+        
+        if self._use_processes(len(pending), test_count):
+            self._test_in_processes(pending, test_count, seeds, record, cancel_event, channels, channel_test_results)
+        else:
+            for channel_info in pending:
+                # 取消检查点
+                if cancel_event is not None and cancel_event.is_set():
+                    raise AnalysisCancelled(self.make_checkpoint(channels, test_count, channel_test_results))
+                record(channel_info, *test_channel_seeded(channel_info, test_count, seeds[channel_info.channel]))
+        
+        progress.finish()
+        return {channel_info.channel: channel_test_results[channel_info.channel] for channel_info in channels}
+    
+    def _use_processes(self, pending: int, test_count: int) -> bool:
+        # 样本量较小时进程启动和结果回传的开销超过并行收益
+        return self.workers > 1 and pending > 1 and pending * test_count >= self.parallel_min_samples
+    
+    def _test_in_processes(self, pending: List[ChannelInfo], test_count: int,
+                           seeds: Dict[int, np.random.SeedSequence], record: Callable,
+                           cancel_event: Optional[threading.Event], channels: List[ChannelInfo],
+                           channel_test_results: Dict[int, dict]):
+        """将信道分发到进程池并行测试，按完成顺序合并结果；取消时丢弃排队中的信道，保留已完成的"""
+        workers = min(self.workers, len(pending))
+        logger.info(f"Testing {len(pending)} channels in {workers} processes")
+        futures = {}
+        
+        # 调用方通常运行在带有其他线程的GUI进程中，使用spawn避免fork继承线程与锁的状态
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        try:
+            futures = {
+                executor.submit(test_channel_seeded, channel_info, test_count, seeds[channel_info.channel]): channel_info
+                for channel_info in pending
+            }
+            not_done = set(futures)
+            while not_done:
+                done, not_done = wait(not_done, timeout=_CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(futures[future], *future.result())
+                
+                if not_done and cancel_event is not None and cancel_event.is_set():
+                    _cancel_pending(not_done)
+                    executor.shutdown(wait=True)
+                    for future in not_done:
+                        if not future.cancelled() and future.exception() is None:
+                            record(futures[future], *future.result())
+                    raise AnalysisCancelled(self.make_checkpoint(channels, test_count, channel_test_results))
+        finally:
+            _cancel_pending(futures)
+            executor.shutdown(wait=True)
+    
+    @staticmethod
+    def make_checkpoint(channels: List[ChannelInfo], test_count: int, channel_test_results: dict) -> dict:
+        return {
+            'channels': list(channels),
+            'test_count': test_count,
+            'channel_test_results': dict(channel_test_results)
+        }
+    
+    @staticmethod
+    def is_resumable(checkpoint: dict, channels: List[ChannelInfo], test_count: int) -> bool:
+        """检查点仅适用于同一份信道数据和相同的测试次数"""
+        return (
+            bool(checkpoint)
+            and checkpoint['test_count'] == test_count
+            and checkpoint['channels'] == list(channels)
+        )
+
+
+def _cancel_pending(futures):
+    # shutdown(cancel_futures=True)需要Python 3.9，逐个取消尚未开始的任务
+    for future in futures:
+        future.cancel()
@@ -1,6 +1,8 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
+import numpy as np
 
 
 @dataclass
@@ -16,6 +18,107 @@ class SpeedTestResult:
         return f"下载: {self.download_speed:.2f} Mbps, 上传: {self.upload_speed:.2f} Mbps, 延迟: {self.latency:.2f} ms"
 
 
+@dataclass
+class LatencyResult:
+    target: str
+    protocol: str
+    sent: int
+    received: int
+    min: float
+    avg: float
+    p50: float
+    p95: float
+    p99: float
+    jitter: float
+    samples: List[float] = field(default_factory=list)
+    
+    @property
+    def loss(self) -> float:
+        if self.sent <= 0:
+            return 0.0
+        return (self.sent - self.received) / self.sent * 100
+    
+    def __str__(self):
+        return (f"延迟: 平均 {self.avg:.2f} ms (最小 {self.min:.2f}, P50 {self.p50:.2f}, P95 {self.p95:.2f}, "
+                f"P99 {self.p99:.2f}), 抖动: {self.jitter:.2f} ms, 丢包: {self.loss:.1f}%")
+
+
+@dataclass
+class ServerProbeResult:
+    url: str
+    rtt: Optional[float] = None
+    throughput: Optional[float] = None
+    probe_bytes: int = 0
+    pruned: bool = False
+    error: Optional[str] = None
+    
+    @property
+    def usable(self) -> bool:
+        return self.error is None and not self.pruned and self.rtt is not None and self.throughput is not None
+    
+    def __str__(self):
+        if self.usable:
+            return f"{self.url}: RTT {self.rtt:.1f} ms, 探测速率 {self.throughput:.2f} Mbps"
+        if self.pruned:
+            return f"{self.url}: RTT {self.rtt:.1f} ms (延迟过高，已剔除)"
+        return f"{self.url}: 不可用 ({self.error})"
+
+
+@dataclass
+class ConnectionStats:
+    connections_opened: int = 0
+    connections_reused: int = 0
+    requests: int = 0
+    handshake_time: float = 0.0
+    transfer_time: float = 0.0
+    
+    def snapshot(self) -> 'ConnectionStats':
+        return ConnectionStats(self.connections_opened, self.connections_reused, self.requests,
+                               self.handshake_time, self.transfer_time)
+    
+    def __sub__(self, other: 'ConnectionStats') -> 'ConnectionStats':
+        return ConnectionStats(
+            self.connections_opened - other.connections_opened,
+            self.connections_reused - other.connections_reused,
+            self.requests - other.requests,
+            self.handshake_time - other.handshake_time,
+            self.transfer_time - other.transfer_time
+        )
+    
+    @property
+    def avg_handshake_ms(self) -> float:
+        if self.connections_opened <= 0:
+            return 0.0
+        return self.handshake_time / self.connections_opened * 1000
+    
+    def __str__(self):
+        return (f"新建连接: {self.connections_opened}, 复用: {self.connections_reused}, "
+                f"握手: {self.handshake_time * 1000:.1f} ms (平均 {self.avg_handshake_ms:.1f} ms), "
+                f"传输: {self.transfer_time:.2f}s")
+
+
+@dataclass
+class ThroughputResult:
+    server: str
+    direction: str
+    streams: int
+    bytes_transferred: int
+    duration: float
+    throughput: float
+    converged: bool
+    samples: List[float] = field(default_factory=list)
+    sample_times: List[float] = field(default_factory=list)
+    ttfb: Optional[float] = None
+    connection_stats: Optional[ConnectionStats] = None
+    
+    def __str__(self):
+        direction = "下载" if self.direction == "download" else "上传"
+        text = f"{direction}: {self.throughput:.2f} Mbps ({self.streams} 连接, {self.duration:.2f}s, {self.bytes_transferred / 1024 / 1024:.2f}MB)"
+        if self.ttfb is not None:
+            text += f", 首字节: {self.ttfb:.1f} ms"
+        return text
+
+
 @dataclass
 class NetworkInfo:
     ssid: str
@@ -47,6 +150,20 @@ class ChannelInfo:
         return max(0.0, min(100.0, score))
 
 
+@dataclass
+class ChannelScanResult:
+    bands: Dict[str, List[ChannelInfo]]
+    source: str
+    duration: float
+    
+    def channels(self, band: str) -> List[ChannelInfo]:
+        return self.bands.get(band, [])
+    
+    def __str__(self):
+        counts = ", ".join(f"{band}: {len(channels)}" for band, channels in self.bands.items())
+        return f"信道扫描 ({self.source}, {self.duration:.2f}s) - {counts}"
+
+
 @dataclass
 class ChannelTestData:
     channel: int
@@ -62,6 +179,81 @@ class ChannelTestData:
         return f"信道 {self.channel}: RSSI={self.rssi}dBm, SNR={self.snr}dB, 带宽={self.bandwidth}MHz, 速率={self.throughput}Mbps, 丢包率={self.packet_loss}%"
 
 
+class ChannelTestDataStore(Sequence):
+    """按列存储的信道测试数据，行对象(ChannelTestData)在访问时惰性生成"""
+    
+    __slots__ = ('channel', 'band', 'bandwidth', 'rssi', 'snr', 'throughput', 'packet_loss', 'timestamp_ns')
+    
+    def __init__(self, channel: int, band: str, bandwidth: float, rssi, snr, throughput, packet_loss, timestamp_ns):
+        self.channel = channel
+        self.band = band
+        self.bandwidth = float(bandwidth)
+        self.rssi = np.asarray(rssi, dtype=np.int16)
+        self.snr = np.asarray(snr, dtype=np.float32)
+        self.throughput = np.asarray(throughput, dtype=np.float32)
+        self.packet_loss = np.asarray(packet_loss, dtype=np.float32)
+        self.timestamp_ns = np.asarray(timestamp_ns, dtype=np.int64)
+        
+        lengths = {len(self.rssi), len(self.snr), len(self.throughput), len(self.packet_loss), len(self.timestamp_ns)}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+    
+    @classmethod
+    def from_records(cls, records: Iterable[ChannelTestData]) -> 'ChannelTestDataStore':
+        records = list(records)
+        if not records:
+            raise ValueError("Cannot build a store from an empty record list")
+        
+        first = records[0]
+        return cls(
+            channel=first.channel,
+            band=first.band,
+            bandwidth=first.bandwidth,
+            rssi=[r.rssi for r in records],
+            snr=[r.snr for r in records],
+            throughput=[r.throughput for r in records],
+            packet_loss=[r.packet_loss for r in records],
+            timestamp_ns=[int(r.timestamp.timestamp() * 1e9) for r in records]
+        )
+    
+    def __len__(self) -> int:
+        return len(self.rssi)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ChannelTestDataStore(
+                self.channel, self.band, self.bandwidth,
+                self.rssi[index], self.snr[index], self.throughput[index],
+                self.packet_loss[index], self.timestamp_ns[index]
+            )
+        
+        return ChannelTestData(
+            channel=self.channel,
+            band=self.band,
+            rssi=int(self.rssi[index]),
+            snr=float(self.snr[index]),
+            bandwidth=self.bandwidth,
+            throughput=float(self.throughput[index]),
+            packet_loss=float(self.packet_loss[index]),
+            timestamp=datetime.fromtimestamp(int(self.timestamp_ns[index]) / 1e9)
+        )
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+    
+    def to_records(self) -> List[ChannelTestData]:
+        return list(self)
+    
+    @property
+    def nbytes(self) -> int:
+        return (self.rssi.nbytes + self.snr.nbytes + self.throughput.nbytes +
+                self.packet_loss.nbytes + self.timestamp_ns.nbytes)
+    
+    def __repr__(self):
+        return f"ChannelTestDataStore(channel={self.channel}, band={self.band!r}, samples={len(self)})"
+
+
 @dataclass
 class ChannelRecommendation:
     channel: int
@@ -69,7 +261,7 @@ class ChannelRecommendation:
     quality_score: float
     reason: str
     expected_improvement: str
-    test_data: List[ChannelTestData]
+    test_data: Sequence
     analysis_details: dict
     
     def __str__(self):
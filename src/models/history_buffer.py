@@ -0,0 +1,65 @@
+import time
+from typing import Dict, Iterable, Optional, Sequence
+import numpy as np
+from src.models.data_models import ChannelInfo
+
+
+class ChannelHistoryBuffer:
+    """固定容量的信道扫描历史环形缓冲区，长时间监测时内存占用保持不变"""
+    
+    METRICS = ('occupancy', 'interference')
+    
+    def __init__(self, channels: Sequence[int], capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        
+        self.channels = tuple(channels)
+        self.capacity = capacity
+        self._columns: Dict[int, int] = {channel: i for i, channel in enumerate(self.channels)}
+        self._data = {
+            metric: np.full((capacity, len(self.channels)), np.nan, dtype=np.float32)
+            for metric in self.METRICS
+        }
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self._index = 0
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def append(self, channel_infos: Iterable[ChannelInfo], timestamp_ns: Optional[int] = None):
+        """写入一次扫描结果，缓冲区满时覆盖最旧的一行"""
+        row = self._index
+        for metric in self.METRICS:
+            self._data[metric][row].fill(np.nan)
+        
+        for channel_info in channel_infos:
+            column = self._columns.get(channel_info.channel)
+            if column is None:
+                continue
+            self._data['occupancy'][row, column] = channel_info.occupancy
+            self._data['interference'][row, column] = channel_info.interference
+        
+        self._timestamps[row] = timestamp_ns if timestamp_ns is not None else time.time_ns()
+        self._index = (row + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+    
+    def ordered(self, metric: str, out: np.ndarray) -> np.ndarray:
+        """按时间倒序(最新一行在前)把指定指标写入预分配的out数组，不产生新分配"""
+        data = self._data[metric]
+        start = self._index
+        out[:start] = data[:start][::-1]
+        out[start:] = data[start:][::-1]
+        return out
+    
+    def latest_timestamp_ns(self) -> Optional[int]:
+        if self._count == 0:
+            return None
+        return int(self._timestamps[(self._index - 1) % self.capacity])
+    
+    def clear(self):
+        for metric in self.METRICS:
+            self._data[metric].fill(np.nan)
+        self._timestamps.fill(0)
+        self._index = 0
+        self._count = 0
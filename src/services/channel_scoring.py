@@ -0,0 +1,92 @@
+from typing import Dict, Optional, Tuple
+from src.models.data_models import ChannelRecommendation
+
+
+# 加权评分的各项权重
+SCORE_WEIGHTS = {
+    'rssi': 0.25,        # 信号强度
+    'snr': 0.2,          # 信噪比
+    'throughput': 0.3,   # 传输速率
+    'packet_loss': 0.15, # 丢包率
+    'consistency': 0.1   # 一致性
+}
+
+
+def calculate_weighted_score(analysis: dict) -> float:
+    """根据信道测试分析结果计算0~100的加权评分"""
+    rssi_score = min((analysis.get('avg_rssi', -100) + 100) * 1.0, 100)
+    snr_score = min(analysis.get('avg_snr', 0), 100)
+    throughput_score = min(analysis.get('avg_throughput', 0) / 500 * 100, 100)  # 假设最大500Mbps
+    packet_loss_score = max(100 - analysis.get('avg_packet_loss', 10) * 10, 0)
+    consistency_score = analysis.get('consistency_score', 0)
+    
+    total_score = (
+        rssi_score * SCORE_WEIGHTS['rssi'] +
+        snr_score * SCORE_WEIGHTS['snr'] +
+        throughput_score * SCORE_WEIGHTS['throughput'] +
+        packet_loss_score * SCORE_WEIGHTS['packet_loss'] +
+        consistency_score * SCORE_WEIGHTS['consistency']
+    )
+    
+    return max(0.0, min(100.0, total_score))
+
+
+def select_best_channel(channel_test_results: Dict[int, dict]) -> Optional[dict]:
+    """评估所有信道并返回加权评分最高的信道测试结果"""
+    best_score = -1
+    best_channel_data = None
+    
+    for channel_data in channel_test_results.values():
+        score = calculate_weighted_score(channel_data['analysis'])
+        if score > best_score:
+            best_score = score
+            best_channel_data = channel_data
+    
+    return best_channel_data
+
+
+def generate_recommendation_details(analysis: dict, quality_score: float) -> Tuple[str, str]:
+    """生成推荐理由和预期改善"""
+    if quality_score >= 80:
+        reason = f"该信道信号强度良好（平均RSSI: {analysis.get('avg_rssi', -100):.1f}dBm），"
+        reason += f"信噪比高（平均SNR: {analysis.get('avg_snr', 0):.1f}dB），"
+        reason += f"传输速率快（平均: {analysis.get('avg_throughput', 0):.1f}Mbps），"
+        reason += f"丢包率低（平均: {analysis.get('avg_packet_loss', 10):.1f}%），"
+        reason += f"网络稳定性好（一致性评分: {analysis.get('consistency_score', 0):.1f}）"
+        improvement = "预期网络质量提升 25-35%"
+    elif quality_score >= 60:
+        reason = f"该信道信号强度适中（平均RSSI: {analysis.get('avg_rssi', -100):.1f}dBm），"
+        reason += f"信噪比合理（平均SNR: {analysis.get('avg_snr', 0):.1f}dB），"
+        reason += f"传输速率良好（平均: {analysis.get('avg_throughput', 0):.1f}Mbps），"
+        reason += f"丢包率可接受（平均: {analysis.get('avg_packet_loss', 10):.1f}%）"
+        improvement = "预期网络质量提升 15-25%"
+    else:
+        reason = f"当前环境所有信道都较为拥挤，"
+        reason += f"该信道相对表现较好（信号强度: {analysis.get('avg_rssi', -100):.1f}dBm，"
+        reason += f"传输速率: {analysis.get('avg_throughput', 0):.1f}Mbps，"
+        reason += f"丢包率: {analysis.get('avg_packet_loss', 10):.1f}%）"
+        improvement = "预期网络质量提升 5-15%"
+    
+    return reason, improvement
+
+
+def build_recommendation(channel_test_results: Dict[int, dict]) -> ChannelRecommendation:
+    """由各信道的测试结果生成最优信道推荐"""
+    best_channel_data = select_best_channel(channel_test_results)
+    if best_channel_data is None:
+        raise ValueError("No channel test results to evaluate")
+    
+    best_channel_info = best_channel_data['channel_info']
+    analysis = best_channel_data['analysis']
+    quality_score = calculate_weighted_score(analysis)
+    reason, improvement = generate_recommendation_details(analysis, quality_score)
+    
+    return ChannelRecommendation(
+        channel=best_channel_info.channel,
+        band=best_channel_info.band,
+        quality_score=quality_score,
+        reason=reason,
+        expected_improvement=improvement,
+        test_data=best_channel_data['test_data'],
+        analysis_details=analysis
+    )
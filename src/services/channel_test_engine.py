@@ -0,0 +1,105 @@
+import time
+from typing import Optional, Tuple
+import numpy as np
+from src.models.data_models import ChannelInfo, ChannelTestDataStore
+
+
+# 各频段的信道带宽(MHz)与理论最大吞吐量(Mbps)
+BAND_PROFILES = {
+    "2.4GHz": (20.0, 72.2),
+    "5GHz": (80.0, 433.3),
+}
+
+# 相邻测试样本的时间间隔(纳秒)，样本时间戳从生成时刻起按该间隔递增
+SAMPLE_INTERVAL_NS = 1_000_000
+
+
+class ChannelTestEngine:
+    """批量信道测试引擎：以NumPy数组一次性生成并分析单个信道的全部测试样本"""
+    
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        self._rng = rng if rng is not None else np.random.default_rng()
+    
+    def test_channel(self, channel_info: ChannelInfo, test_count: int) -> Tuple[ChannelTestDataStore, dict]:
+        """执行单个信道的批量测试，返回列式样本和分析结果"""
+        samples = self.generate_samples(channel_info, test_count)
+        return samples, self.analyze_samples(samples)
+    
+    def generate_samples(self, channel_info: ChannelInfo, test_count: int) -> ChannelTestDataStore:
+        """基于信道信息批量生成测试样本"""
+        if test_count <= 0:
+            raise ValueError("test_count must be positive")
+        
+        rng = self._rng
+        bandwidth, max_throughput = BAND_PROFILES.get(channel_info.band, BAND_PROFILES["5GHz"])
+        
+        # 添加随机波动
+        rssi = channel_info.signal_strength + rng.integers(-5, 6, size=test_count)
+        snr = (rssi + 100) * rng.uniform(0.8, 1.2, size=test_count)
+        
+        # 基于占用率和干扰计算吞吐量
+        throughput_factor = 1.0 - (channel_info.occupancy + channel_info.interference) / 200.0
+        throughput = max_throughput * throughput_factor * rng.uniform(0.7, 1.0, size=test_count)
+        
+        # 基于干扰计算丢包率
+        packet_loss = (channel_info.interference / 100.0) * rng.uniform(0.5, 1.5, size=test_count)
+        np.minimum(packet_loss, 10.0, out=packet_loss)
+        
+        return ChannelTestDataStore(
+            channel=channel_info.channel,
+            band=channel_info.band,
+            bandwidth=bandwidth,
+            rssi=rssi,
+            snr=snr,
+            throughput=throughput,
+            packet_loss=packet_loss,
+            timestamp_ns=time.time_ns() + np.arange(test_count, dtype=np.int64) * SAMPLE_INTERVAL_NS
+        )
+    
+    def analyze_samples(self, samples: ChannelTestDataStore) -> dict:
+        """一次遍历计算各指标的均值、标准差、最大值和最小值"""
+        metrics = np.vstack([
+            samples.rssi,
+            samples.snr,
+            samples.throughput,
+            samples.packet_loss,
+        ]).astype(np.float64)
+        
+        count = metrics.shape[1]
+        means = metrics.mean(axis=1)
+        stds = metrics.std(axis=1, ddof=1) if count > 1 else np.zeros(len(metrics))
+        maxs = metrics.max(axis=1)
+        mins = metrics.min(axis=1)
+        
+        rssi_std, snr_std, throughput_std, packet_loss_std = (float(v) for v in stds)
+        
+        return {
+            'avg_rssi': float(means[0]),
+            'std_rssi': rssi_std,
+            'avg_snr': float(means[1]),
+            'std_snr': snr_std,
+            'avg_throughput': float(means[2]),
+            'std_throughput': throughput_std,
+            'avg_packet_loss': float(means[3]),
+            'std_packet_loss': packet_loss_std,
+            'max_throughput': float(maxs[2]),
+            'min_packet_loss': float(mins[3]),
+            'consistency_score': self.calculate_consistency_score(rssi_std, throughput_std, packet_loss_std)
+        }
+    
+    @staticmethod
+    def calculate_consistency_score(rssi_std: float, throughput_std: float, packet_loss_std: float) -> float:
+        """计算一致性评分"""
+        # 标准差越小，一致性越高
+        consistency = 100.0
+        consistency -= min(rssi_std * 2, 30)
+        consistency -= min(throughput_std * 0.1, 30)
+        consistency -= min(packet_loss_std * 5, 30)
+        
+        return max(0.0, consistency)
+
+
+def test_channel_seeded(channel_info: ChannelInfo, test_count: int,
+                        seed: np.random.SeedSequence) -> Tuple[ChannelTestDataStore, dict]:
+    """以独立的种子测试单个信道，可在子进程中执行；相同种子总是生成相同的样本"""
+    return ChannelTestEngine(np.random.default_rng(seed)).test_channel(channel_info, test_count)
@@ -54,11 +54,69 @@ class ConfigService:
             "ui": {
                 "refresh_interval": 1000,
                 "chart_update_interval": 2000,
+                "waterfall_history_size": 300,
                 "theme": "default"
             },
             "logging": {
                 "level": "INFO",
                 "file": "wifi_test.log"
+            },
+            "executor": {
+                "max_workers": 2,
+                "max_queue_size": 8
+            },
+            "speed_test": {
+                "streams": 4,
+                "warmup_seconds": 1.0,
+                "window_seconds": 1.0,
+                "sample_interval": 0.1,
+                "max_duration": 10,
+                "convergence_tolerance": 0.05,
+                "convergence_samples": 10,
+                "upload_size": 67108864,
+                "preconnect": True,
+                "max_idle_per_host": 8
+            },
+            "server_selection": {
+                "probe_timeout": 0.5,
+                "rtt_probes": 3,
+                "probe_bytes": 262144,
+                "probe_duration": 1.5,
+                "rtt_prune_factor": 3.0,
+                "top_k": 1
+            },
+            "latency": {
+                "protocol": "tcp",
+                "port": 443,
+                "count": 10,
+                "interval": 0.05,
+                "timeout": 2.0
+            },
+            "recommendation": {
+                "workers": 0,
+                "parallel_min_samples": 10000,
+                "seed": None
+            },
+            "history": {
+                "enabled": False,
+                "path": "data/history.db",
+                "site": "",
+                "max_samples_per_channel": 10000
+            },
+            "session": {
+                "compression": "zlib",
+                "block_rows": 1048576
+            },
+            "replay": {
+                "source": "",
+                "speed": 1.0,
+                "loop": True
+            },
+            "cache": {
+                "speed_test_cache_size": 10,
+                "channel_cache_ttl": 300,
+                "channel_cache_size": 8,
+                "persist_channel_cache": False
             }
         }
     
@@ -122,6 +180,69 @@ class ConfigService:
     def get_retry_count(self) -> int:
         return self.get('network.retry_count', 3)
     
+    def get_speed_test_streams(self) -> int:
+        return self.get('speed_test.streams', 4)
+    
+    def get_speed_test_warmup(self) -> float:
+        return self.get('speed_test.warmup_seconds', 1.0)
+    
+    def get_speed_test_window(self) -> float:
+        return self.get('speed_test.window_seconds', 1.0)
+    
+    def get_speed_test_sample_interval(self) -> float:
+        return self.get('speed_test.sample_interval', 0.1)
+    
+    def get_speed_test_max_duration(self) -> float:
+        return self.get('speed_test.max_duration', 10)
+    
+    def get_speed_test_convergence_tolerance(self) -> float:
+        return self.get('speed_test.convergence_tolerance', 0.05)
+    
+    def get_speed_test_convergence_samples(self) -> int:
+        return self.get('speed_test.convergence_samples', 10)
+    
+    def get_speed_test_upload_size(self) -> int:
+        return self.get('speed_test.upload_size', 64 * 1024 * 1024)
+    
+    def get_speed_test_preconnect(self) -> bool:
+        return self.get('speed_test.preconnect', True)
+    
+    def get_pool_max_idle_per_host(self) -> int:
+        return self.get('speed_test.max_idle_per_host', 8)
+    
+    def get_server_probe_timeout(self) -> float:
+        return self.get('server_selection.probe_timeout', 0.5)
+    
+    def get_server_rtt_probes(self) -> int:
+        return self.get('server_selection.rtt_probes', 3)
+    
+    def get_server_probe_bytes(self) -> int:
+        return self.get('server_selection.probe_bytes', 256 * 1024)
+    
+    def get_server_probe_duration(self) -> float:
+        return self.get('server_selection.probe_duration', 1.5)
+    
+    def get_server_rtt_prune_factor(self) -> float:
+        return self.get('server_selection.rtt_prune_factor', 3.0)
+    
+    def get_server_top_k(self) -> int:
+        return self.get('server_selection.top_k', 1)
+    
+    def get_latency_probe_protocol(self) -> str:
+        return self.get('latency.protocol', 'tcp')
+    
+    def get_latency_probe_port(self) -> int:
+        return self.get('latency.port', 443)
+    
+    def get_latency_probe_count(self) -> int:
+        return self.get('latency.count', 10)
+    
+    def get_latency_probe_interval(self) -> float:
+        return self.get('latency.interval', 0.05)
+    
+    def get_latency_probe_timeout(self) -> float:
+        return self.get('latency.timeout', 2.0)
+    
     def get_scan_interval(self) -> int:
         return self.get('wifi.scan_interval', 5)
     
@@ -134,17 +255,76 @@ class ConfigService:
     def get_channels_5ghz(self) -> list:
         return self.get('wifi.channels_5ghz', [36, 40, 44, 48, 52, 56, 60, 64, 100, 104, 108, 112, 116, 120, 124, 128, 132, 136, 140, 144, 149, 153, 157, 161, 165])
     
+    def get_channels_for_band(self, band: str) -> list:
+        if band == "2.4GHz":
+            return self.get_channels_2_4ghz()
+        return self.get_channels_5ghz()
+    
     def get_refresh_interval(self) -> int:
         return self.get('ui.refresh_interval', 1000)
     
     def get_chart_update_interval(self) -> int:
         return self.get('ui.chart_update_interval', 2000)
     
+    def get_waterfall_history_size(self) -> int:
+        return self.get('ui.waterfall_history_size', 300)
+    
     def get_theme(self) -> str:
         return self.get('ui.theme', 'default')
     
     def get_test_count(self) -> int:
         return self.get('wifi.test_count', 50)
+    
+    def get_recommendation_workers(self) -> int:
+        return self.get('recommendation.workers', 0)
+    
+    def get_recommendation_parallel_min_samples(self) -> int:
+        return self.get('recommendation.parallel_min_samples', 10000)
+    
+    def get_recommendation_seed(self) -> Optional[int]:
+        return self.get('recommendation.seed', None)
+    
+    def get_executor_max_workers(self) -> int:
+        return self.get('executor.max_workers', 2)
+    
+    def get_executor_queue_size(self) -> int:
+        return self.get('executor.max_queue_size', 8)
+    
+    def get_channel_cache_ttl(self) -> int:
+        return self.get('cache.channel_cache_ttl', 300)
+    
+    def get_channel_cache_size(self) -> int:
+        return self.get('cache.channel_cache_size', 8)
+    
+    def get_channel_cache_persist(self) -> bool:
+        return self.get('cache.persist_channel_cache', False)
+    
+    def get_history_enabled(self) -> bool:
+        return self.get('history.enabled', False)
+    
+    def get_history_path(self) -> str:
+        return self.get('history.path', 'data/history.db')
+    
+    def get_history_site(self) -> str:
+        return self.get('history.site', '')
+    
+    def get_history_max_samples_per_channel(self) -> int:
+        return self.get('history.max_samples_per_channel', 10000)
+    
+    def get_session_compression(self) -> str:
+        return self.get('session.compression', 'zlib')
+    
+    def get_session_block_rows(self) -> int:
+        return self.get('session.block_rows', 1048576)
+    
+    def get_replay_source(self) -> str:
+        return self.get('replay.source', '')
+    
+    def get_replay_speed(self) -> float:
+        return self.get('replay.speed', 1.0)
+    
+    def get_replay_loop(self) -> bool:
+        return self.get('replay.loop', True)
 
 
 config_service = ConfigService()
@@ -0,0 +1,513 @@
+import asyncio
+import ssl
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+from src.models.data_models import ConnectionStats
+from src.services.config_service import config_service
+from src.utils.logger import logger
+
+
+USER_AGENT = "Mozilla/5.0"
+
+# 每条连接预分配的接收缓冲区大小，响应体读入后即丢弃，内存占用与响应大小无关
+RECEIVE_BUFFER_SIZE = 256 * 1024
+
+# 响应头的最大长度
+MAX_HEAD_SIZE = 64 * 1024
+
+# 最多跟随的重定向次数
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+class HttpConnectionError(RuntimeError):
+    pass
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: Dict[str, str]
+    body_bytes: int
+    ttfb_ns: int
+    transfer_ns: int
+
+
+class _ResponseReader:
+    """单个响应的解析状态：响应头复制保留，响应体(定长/分块/读到EOF)只计数"""
+    
+    def __init__(self, head_only: bool, on_body_bytes: Optional[Callable[[int], None]]):
+        loop = asyncio.get_running_loop()
+        self._head_only = head_only
+        self._on_body_bytes = on_body_bytes
+        # 只有2xx响应的响应体计入吞吐量，错误页和重定向响应体只计数
+        self._metered = False
+        self._head: Optional[bytearray] = bytearray()
+        self._length = -1
+        self._chunked = False
+        self._chunk_remaining = 0
+        self._in_trailer = False
+        self._line = bytearray()
+        self.body_bytes = 0
+        self.keep_alive = True
+        self.first_byte_ns: Optional[int] = None
+        self.head_received = loop.create_future()
+        self.done = loop.create_future()
+    
+    def feed(self, data: memoryview):
+        if self.first_byte_ns is None:
+            self.first_byte_ns = time.perf_counter_ns()
+        if self.done.done():
+            # 响应结束后仍有数据，连接状态不可预期
+            self.keep_alive = False
+            return
+        
+        if self._head is not None:
+            self._head += data
+            end = self._head.find(b"\r\n\r\n")
+            if end < 0:
+                if len(self._head) > MAX_HEAD_SIZE:
+                    self.fail(HttpConnectionError("Response head too large"))
+                return
+            try:
+                status, headers = parse_response_head(bytes(self._head[:end]))
+            except HttpConnectionError as e:
+                self.fail(e)
+                return
+            
+            rest = memoryview(bytes(self._head[end + 4:]))
+            self._head = None
+            self._chunked = 'chunked' in headers.get('transfer-encoding', '').lower()
+            try:
+                self._length = int(headers.get('content-length', -1))
+            except ValueError:
+                self.fail(HttpConnectionError(f"Malformed Content-Length: {headers['content-length'][:20]!r}"))
+                return
+            self._metered = 200 <= status < 300
+            if headers.get('connection', '').lower() == 'close':
+                self.keep_alive = False
+            self.head_received.set_result((status, headers))
+            
+            if self._head_only or status in (204, 304) or 100 <= status < 200:
+                self._finish()
+                return
+            if not self._chunked and self._length < 0:
+                # 无长度信息，只能读到连接关闭
+                self.keep_alive = False
+            data = rest
+        
+        if self._chunked:
+            self._feed_chunked(data)
+        else:
+            self._count(len(data))
+            if 0 <= self._length <= self.body_bytes:
+                self._finish()
+    
+    def _feed_chunked(self, data: memoryview):
+        pos = 0
+        size = len(data)
+        while pos < size and not self.done.done():
+            if self._chunk_remaining:
+                take = min(self._chunk_remaining, size - pos)
+                self._count(take)
+                self._chunk_remaining -= take
+                pos += take
+                continue
+            
+            end = -1
+            for i in range(pos, size):
+                if data[i] == 0x0A:
+                    end = i
+                    break
+            if end < 0:
+                self._line += data[pos:]
+                return
+            self._line += data[pos:end]
+            pos = end + 1
+            line = bytes(self._line).strip()
+            self._line.clear()
+            
+            if self._in_trailer:
+                if not line:
+                    self._finish()
+            elif line:
+                try:
+                    chunk_size = int(line.split(b';', 1)[0], 16)
+                except ValueError:
+                    self.fail(HttpConnectionError(f"Malformed chunk size: {line[:20]!r}"))
+                    return
+                if chunk_size == 0:
+                    self._in_trailer = True
+                else:
+                    self._chunk_remaining = chunk_size
+    
+    def _count(self, nbytes: int):
+        if nbytes:
+            self.body_bytes += nbytes
+            if self._metered and self._on_body_bytes is not None:
+                self._on_body_bytes(nbytes)
+    
+    def _finish(self):
+        if not self.done.done():
+            self.done.set_result(None)
+    
+    def eof(self):
+        self.keep_alive = False
+        if self._head is None and not self._chunked and self._length < 0:
+            self._finish()
+        else:
+            self.fail(HttpConnectionError("Connection closed before the response was complete"))
+    
+    def fail(self, exc: BaseException):
+        self.keep_alive = False
+        if not self.head_received.done():
+            self.head_received.set_exception(exc)
+            self.done.cancel()
+        elif not self.done.done():
+            self.done.set_exception(exc)
+    
+    def discard(self):
+        for future in (self.head_received, self.done):
+            if not future.done():
+                future.cancel()
+
+
+class _HttpProtocol(asyncio.BufferedProtocol):
+    """HTTP/1.1连接协议：数据直接读入预分配缓冲区(readinto)，写入遵循传输层的流控"""
+    
+    def __init__(self):
+        self._buffer = memoryview(bytearray(RECEIVE_BUFFER_SIZE))
+        self.transport: Optional[asyncio.Transport] = None
+        self.response: Optional[_ResponseReader] = None
+        self.closed = False
+        self.unexpected_data = False
+        self._paused = False
+        self._drain_waiter: Optional[asyncio.Future] = None
+    
+    def connection_made(self, transport):
+        self.transport = transport
+    
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self._buffer
+    
+    def buffer_updated(self, nbytes: int):
+        if self.response is None:
+            self.unexpected_data = True
+            return
+        self.response.feed(self._buffer[:nbytes])
+    
+    def eof_received(self):
+        if self.response is not None:
+            self.response.eof()
+        return False
+    
+    def connection_lost(self, exc: Optional[Exception]):
+        self.closed = True
+        if self.response is not None:
+            self.response.fail(exc or HttpConnectionError("Connection closed"))
+        self._wake_writer(exc or HttpConnectionError("Connection closed"))
+    
+    def pause_writing(self):
+        self._paused = True
+    
+    def resume_writing(self):
+        self._paused = False
+        self._wake_writer(None)
+    
+    async def drain(self):
+        if self.closed:
+            raise HttpConnectionError("Connection closed")
+        if not self._paused:
+            return
+        self._drain_waiter = asyncio.get_running_loop().create_future()
+        await self._drain_waiter
+    
+    def _wake_writer(self, exc: Optional[BaseException]):
+        waiter = self._drain_waiter
+        self._drain_waiter = None
+        if waiter is None or waiter.done():
+            return
+        if exc is None:
+            waiter.set_result(None)
+        else:
+            waiter.set_exception(exc)
+
+
+class HttpConnection:
+    """池中的一条长连接"""
+    
+    def __init__(self, key: Tuple[str, str, int], netloc: str, transport: asyncio.Transport,
+                 protocol: _HttpProtocol, handshake_ns: int):
+        self.key = key
+        self.netloc = netloc
+        self.handshake_ns = handshake_ns
+        self.requests = 0
+        self._transport = transport
+        self._protocol = protocol
+        self._keep_alive = True
+    
+    @property
+    def reusable(self) -> bool:
+        return self._keep_alive and not self._protocol.closed and not self._protocol.unexpected_data
+    
+    async def request(self, method: str, path: str, headers: Optional[Dict[str, str]] = None,
+                      body: Optional[Iterable[memoryview]] = None,
+                      on_body_bytes: Optional[Callable[[int], None]] = None,
+                      on_sent_bytes: Optional[Callable[[int], None]] = None,
+                      on_head: Optional[Callable[[int, Dict[str, str], int], None]] = None,
+                      timeout: float = 30) -> HttpResponse:
+        """发送请求并等待响应结束；body为分块上传的数据块，on_sent_bytes只报告已写入套接字的字节"""
+        headers = dict(headers or {})
+        if body is not None:
+            headers['Transfer-Encoding'] = 'chunked'
+        
+        reader = _ResponseReader(method == "HEAD", on_body_bytes)
+        self._protocol.response = reader
+        self.requests += 1
+        self._keep_alive = False
+        try:
+            head = request_head(method, self.netloc, path, headers)
+            sent_ns = time.perf_counter_ns()
+            self._transport.write(head)
+            if body is not None:
+                await self._send_chunked(len(head), body, on_sent_bytes, timeout)
+            
+            status, response_headers = await asyncio.wait_for(asyncio.shield(reader.head_received), timeout)
+            ttfb_ns = reader.first_byte_ns - sent_ns
+            # on_head(状态码, 响应头, 首字节耗时ns)在读取响应体之前调用，抛出异常则放弃该响应
+            if on_head is not None:
+                on_head(status, response_headers, ttfb_ns)
+            
+            # 空闲超时：只要仍有数据到达就继续等待
+            while not reader.done.done():
+                received = reader.body_bytes
+                try:
+                    await asyncio.wait_for(asyncio.shield(reader.done), timeout)
+                except asyncio.TimeoutError:
+                    if reader.body_bytes == received:
+                        raise HttpConnectionError(f"Response from {self.netloc} stalled")
+            reader.done.result()
+            
+            self._keep_alive = reader.keep_alive
+            return HttpResponse(
+                status=status,
+                headers=response_headers,
+                body_bytes=reader.body_bytes,
+                ttfb_ns=ttfb_ns,
+                transfer_ns=time.perf_counter_ns() - sent_ns
+            )
+        finally:
+            reader.discard()
+            self._protocol.response = None
+    
+    async def _send_chunked(self, written: int, body: Iterable[memoryview],
+                            on_sent_bytes: Optional[Callable[[int], None]], timeout: float):
+        transport = self._transport
+        # 各数据块负载在写出流中的[起点, 终点)；请求头与分块长度行、CRLF等帧字节不计入上传量
+        pending: Deque[Tuple[int, int]] = deque()
+        
+        def report():
+            # 仍在用户态写缓冲区中的字节尚未发出，不计入
+            sent = written - transport.get_write_buffer_size()
+            payload = 0
+            while pending and pending[0][0] < sent:
+                start, end = pending[0]
+                if end > sent:
+                    payload += sent - start
+                    pending[0] = (sent, end)
+                    break
+                payload += end - start
+                pending.popleft()
+            if on_sent_bytes is not None and payload:
+                on_sent_bytes(payload)
+        
+        for chunk in body:
+            size_line = b"%x\r\n" % len(chunk)
+            transport.write(size_line)
+            transport.write(chunk)
+            transport.write(b"\r\n")
+            written += len(size_line)
+            pending.append((written, written + len(chunk)))
+            written += len(chunk) + 2
+            await asyncio.wait_for(self._protocol.drain(), timeout)
+            report()
+        
+        transport.write(b"0\r\n\r\n")
+        written += 5
+        await asyncio.wait_for(self._protocol.drain(), timeout)
+        report()
+    
+    def close(self):
+        self._keep_alive = False
+        self._transport.close()
+
+
+class ConnectionPool:
+    """按主机复用的HTTP/1.1长连接池，供延迟、下载、上传各测速阶段共享，并区分统计握手与传输耗时"""
+    
+    def __init__(self, max_idle_per_host: Optional[int] = None, timeout: Optional[float] = None):
+        self.max_idle_per_host = max_idle_per_host or config_service.get_pool_max_idle_per_host()
+        self.timeout = timeout or config_service.get_network_timeout()
+        self.stats = ConnectionStats()
+        self._idle: Dict[Tuple[str, str, int], List[HttpConnection]] = {}
+        self._connections: Set[HttpConnection] = set()
+        self._ssl_context: Optional[ssl.SSLContext] = None
+    
+    async def __aenter__(self) -> 'ConnectionPool':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+    
+    async def request(self, method: str, url: str, **kwargs) -> HttpResponse:
+        """发送请求并跟随重定向(最多MAX_REDIRECTS次)；带请求体的请求被重定向时报错，因为分块上传的数据无法重放"""
+        on_head = kwargs.pop('on_head', None)
+        
+        def head_hook(status: int, headers: Dict[str, str], ttfb_ns: int):
+            # 重定向响应不交给调用方，只有最终响应触发on_head
+            if on_head is not None and not (status in REDIRECT_STATUSES and 'location' in headers):
+                on_head(status, headers, ttfb_ns)
+        
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await self._request_once(method, url, on_head=head_hook, **kwargs)
+            location = response.headers.get('location')
+            if response.status not in REDIRECT_STATUSES or not location:
+                return response
+            if kwargs.get('body') is not None:
+                raise HttpConnectionError(f"Request with body to {url} was redirected to {location}")
+            
+            url = urljoin(url, location)
+            if response.status == 303 and method != "HEAD":
+                method = "GET"
+            logger.debug(f"Following HTTP {response.status} redirect to {url}")
+        
+        raise HttpConnectionError(f"Too many redirects (>{MAX_REDIRECTS}) for {url}")
+    
+    async def _request_once(self, method: str, url: str, **kwargs) -> HttpResponse:
+        """从池中取连接发送请求，完成后归还；复用的空闲连接若已被服务器关闭则换新连接重试一次"""
+        key, netloc, path = split_url(url)
+        kwargs.setdefault('timeout', self.timeout)
+        
+        while True:
+            connection, reused = await self._acquire(key, netloc)
+            try:
+                response = await connection.request(method, path, **kwargs)
+            except (ConnectionError, HttpConnectionError):
+                self._discard(connection)
+                if reused and kwargs.get('body') is None:
+                    continue
+                raise
+            except BaseException:
+                self._discard(connection)
+                raise
+            
+            self.stats.requests += 1
+            self.stats.transfer_time += response.transfer_ns / 1e9
+            self._release(connection)
+            return response
+    
+    async def preconnect(self, url: str, count: int = 1):
+        """预先建立连接(含TLS握手)，使握手耗时不落入后续的测量阶段"""
+        key, netloc, _ = split_url(url)
+        missing = min(count, self.max_idle_per_host) - len(self._idle.get(key, []))
+        if missing <= 0:
+            return
+        connections = await asyncio.gather(*(self._connect(key, netloc) for _ in range(missing)))
+        for connection in connections:
+            self._release(connection)
+        logger.debug(f"Pre-connected {missing} connection(s) to {netloc}")
+    
+    def idle_count(self, url: str) -> int:
+        key, _, _ = split_url(url)
+        return len(self._idle.get(key, []))
+    
+    def close(self):
+        for connection in list(self._connections):
+            connection.close()
+        self._connections.clear()
+        self._idle.clear()
+    
+    async def _acquire(self, key: Tuple[str, str, int], netloc: str) -> Tuple[HttpConnection, bool]:
+        idle = self._idle.get(key)
+        while idle:
+            connection = idle.pop()
+            if connection.reusable:
+                self.stats.connections_reused += 1
+                return connection, True
+            self._discard(connection)
+        return await self._connect(key, netloc), False
+    
+    async def _connect(self, key: Tuple[str, str, int], netloc: str) -> HttpConnection:
+        scheme, host, port = key
+        loop = asyncio.get_running_loop()
+        context = self._get_ssl_context() if scheme == 'https' else None
+        
+        start_ns = time.perf_counter_ns()
+        transport, protocol = await asyncio.wait_for(
+            loop.create_connection(_HttpProtocol, host, port, ssl=context),
+            self.timeout
+        )
+        handshake_ns = time.perf_counter_ns() - start_ns
+        
+        connection = HttpConnection(key, netloc, transport, protocol, handshake_ns)
+        self._connections.add(connection)
+        self.stats.connections_opened += 1
+        self.stats.handshake_time += handshake_ns / 1e9
+        return connection
+    
+    def _release(self, connection: HttpConnection):
+        idle = self._idle.setdefault(connection.key, [])
+        if connection.reusable and len(idle) < self.max_idle_per_host:
+            idle.append(connection)
+        else:
+            self._discard(connection)
+    
+    def _discard(self, connection: HttpConnection):
+        connection.close()
+        self._connections.discard(connection)
+    
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            # 与原测速脚本一致，不校验证书
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return self._ssl_context
+
+
+def split_url(url: str) -> Tuple[Tuple[str, str, int], str, str]:
+    """解析地址，返回(连接池键(协议, 主机, 端口), Host头, 请求路径)"""
+    parts = urlsplit(url)
+    scheme = parts.scheme or 'http'
+    port = parts.port or (443 if scheme == 'https' else 80)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    return (scheme, parts.hostname, port), parts.netloc, path
+
+
+def request_head(method: str, host: str, path: str, extra: Optional[Dict[str, str]] = None) -> bytes:
+    lines = [f"{method} {path} HTTP/1.1", f"Host: {host}", f"User-Agent: {USER_AGENT}",
+             "Accept: */*", "Connection: keep-alive"]
+    for key, value in (extra or {}).items():
+        lines.append(f"{key}: {value}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+
+def parse_response_head(head: bytes) -> Tuple[int, Dict[str, str]]:
+    lines = head.decode('latin-1').split("\r\n")
+    try:
+        status = int(lines[0].split()[1])
+    except (IndexError, ValueError):
+        raise HttpConnectionError(f"Malformed status line: {lines[0]!r}")
+    
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            key, value = line.split(':', 1)
+            headers[key.strip().lower()] = value.strip()
+    return status, headers
@@ -0,0 +1,503 @@
+import math
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from src.models.data_models import ChannelInfo, ChannelRecommendation, SpeedTestResult
+from src.services.config_service import config_service
+from src.utils.logger import logger
+
+
+# 可查询的指标及其所在的表：信道扫描快照与信道测试样本
+METRIC_TABLES = {
+    'signal_strength': 'channel_observations',
+    'occupancy': 'channel_observations',
+    'interference': 'channel_observations',
+    'network_count': 'channel_observations',
+    'rssi': 'channel_samples',
+    'snr': 'channel_samples',
+    'throughput': 'channel_samples',
+    'packet_loss': 'channel_samples',
+}
+
+_AGGREGATES = ('avg', 'min', 'max', 'count', 'sum')
+
+# 预聚合的时间桶长度(秒)：写入时按(指标, 频段, 信道, 时间桶, 站点)累加计数、总和、极值与直方图，
+# 查询时完整落在范围内的时间桶直接读取预聚合结果，只有范围两端不足一个时间桶的部分扫描原始行
+ROLLUP_INTERVAL = 3600.0
+
+# 各指标直方图的(下限, 分桶宽度, 分桶数)，超出范围的值计入两端的分桶；
+# 百分位按直方图定位排名两侧的值，整数指标是精确值，其余误差不超过半个分桶宽度
+METRIC_BINS = {
+    'signal_strength': (-128.0, 1.0, 129),
+    'occupancy': (0.0, 0.1, 1001),
+    'interference': (0.0, 0.1, 1001),
+    'network_count': (0.0, 1.0, 257),
+    'rssi': (-128.0, 1.0, 129),
+    'snr': (-50.0, 0.1, 2001),
+    'throughput': (0.0, 0.5, 4001),
+    'packet_loss': (0.0, 0.01, 1001),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS channel_observations (
+    timestamp REAL NOT NULL,
+    site TEXT NOT NULL,
+    source TEXT NOT NULL,
+    band TEXT NOT NULL,
+    channel INTEGER NOT NULL,
+    frequency REAL,
+    signal_strength INTEGER,
+    occupancy REAL,
+    interference REAL,
+    network_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_observations_band_channel_time
+    ON channel_observations (band, channel, timestamp);
+
+CREATE TABLE IF NOT EXISTS channel_samples (
+    timestamp REAL NOT NULL,
+    site TEXT NOT NULL,
+    band TEXT NOT NULL,
+    channel INTEGER NOT NULL,
+    rssi INTEGER,
+    snr REAL,
+    throughput REAL,
+    packet_loss REAL
+);
+CREATE INDEX IF NOT EXISTS idx_samples_band_channel_time
+    ON channel_samples (band, channel, timestamp);
+
+CREATE TABLE IF NOT EXISTS recommendations (
+    timestamp REAL NOT NULL,
+    site TEXT NOT NULL,
+    band TEXT NOT NULL,
+    channel INTEGER NOT NULL,
+    quality_score REAL,
+    test_count INTEGER,
+    reason TEXT,
+    expected_improvement TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_recommendations_band_time
+    ON recommendations (band, timestamp);
+
+CREATE TABLE IF NOT EXISTS speed_tests (
+    timestamp REAL NOT NULL,
+    site TEXT NOT NULL,
+    server TEXT,
+    download_speed REAL,
+    upload_speed REAL,
+    latency REAL,
+    jitter REAL
+);
+CREATE INDEX IF NOT EXISTS idx_speed_tests_time
+    ON speed_tests (timestamp);
+
+CREATE TABLE IF NOT EXISTS metric_rollups (
+    metric TEXT NOT NULL,
+    band TEXT NOT NULL,
+    channel INTEGER NOT NULL,
+    bucket REAL NOT NULL,
+    site TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    sum REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    histogram BLOB NOT NULL,
+    PRIMARY KEY (metric, band, channel, bucket, site)
+) WITHOUT ROWID;
+"""
+
+
+class HistoryStore:
+    """基于SQLite的历史测量数据库：WAL模式，批量写入，按(频段, 信道, 时间)索引支持范围与聚合查询"""
+    
+    def __init__(self, path: str, site: Optional[str] = None, enabled: bool = True,
+                 max_samples_per_channel: int = 10000):
+        self.path = path
+        self.site = site or socket.gethostname()
+        self.enabled = enabled
+        self.max_samples_per_channel = max_samples_per_channel
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        # 首次使用时才打开数据库，导入模块不产生磁盘IO
+        if self._connection is None:
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # WAL下NORMAL只在检查点时同步，断电最多丢失最近的事务，不会损坏数据库
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+    
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
+    def _write(self, description: str, statements: List[Tuple[str, object]],
+               rollups: Iterable[Tuple[str, int, np.ndarray, Dict[str, np.ndarray]]] = ()) -> bool:
+        """在一个事务中执行(SQL, 参数序列)批量写入并累加(频段, 信道, 时间戳数组, {指标: 数值数组})的预聚合，
+        失败只记录日志，不影响扫描和推荐流程"""
+        if not self.enabled:
+            return False
+        
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    for sql, rows in statements:
+                        connection.executemany(sql, rows)
+                    for band, channel, timestamps, metrics in rollups:
+                        self._add_rollups(connection, band, channel, timestamps, metrics)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to record {description} in history: {e}")
+            return False
+        
+        logger.debug(f"Recorded {description} in history in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return True
+    
+    def _add_rollups(self, connection: sqlite3.Connection, band: str, channel: int, timestamps: np.ndarray,
+                     metrics: Dict[str, np.ndarray]):
+        buckets = np.floor(timestamps / ROLLUP_INTERVAL) * ROLLUP_INTERVAL
+        for bucket in np.unique(buckets):
+            in_bucket = buckets == bucket
+            for metric, values in metrics.items():
+                values = np.asarray(values, dtype=np.float64)[in_bucket]
+                # 与COUNT/AVG等忽略NULL一致，NaN在SQLite中存为NULL
+                values = values[~np.isnan(values)]
+                if values.size:
+                    self._add_rollup(connection, (metric, band, channel, float(bucket), self.site), values)
+    
+    @staticmethod
+    def _add_rollup(connection: sqlite3.Connection, key: tuple, values: np.ndarray):
+        count, total, low, high = values.size, float(values.sum()), float(values.min()), float(values.max())
+        histogram = _histogram(key[0], values)
+        row = connection.execute(
+            "SELECT count, sum, min, max, histogram FROM metric_rollups "
+            "WHERE metric = ? AND band = ? AND channel = ? AND bucket = ? AND site = ?", key
+        ).fetchone()
+        if row is not None:
+            count, total, low, high = count + row[0], total + row[1], min(low, row[2]), max(high, row[3])
+            histogram += _unpack_histogram(row[4], histogram.size)
+        connection.execute("INSERT OR REPLACE INTO metric_rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                           key + (count, total, low, high, _pack_histogram(histogram)))
+    
+    def record_scan(self, results: Dict[str, List[ChannelInfo]], source: str = "scan",
+                    timestamp: Optional[float] = None) -> bool:
+        """记录一次扫描的各频段信道快照"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        channels = [info for channels in results.values() for info in channels]
+        rows = [
+            (timestamp, self.site, source, info.band, info.channel, info.frequency, info.signal_strength,
+             info.occupancy, info.interference, len(info.networks))
+            for info in channels
+        ]
+        rollups = [
+            (info.band, info.channel, np.array([timestamp]), {
+                'signal_strength': [info.signal_strength], 'occupancy': [info.occupancy],
+                'interference': [info.interference], 'network_count': [len(info.networks)]
+            })
+            for info in channels
+        ]
+        return self._write(f"{len(rows)} channel observations", [(
+            "INSERT INTO channel_observations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )], rollups)
+    
+    def record_channel_tests(self, channel_test_results: Dict[int, dict]) -> bool:
+        """记录各信道的测试样本，时间取样本自身的时间戳；超过max_samples_per_channel时等间隔抽样，为0时不记录"""
+        if self.max_samples_per_channel <= 0:
+            return False
+        
+        site = self.site
+        limit = self.max_samples_per_channel
+        tests = []
+        for channel_data in channel_test_results.values():
+            samples = channel_data['test_data']
+            if len(samples) > limit:
+                samples = samples[::-(-len(samples) // limit)]
+            tests.append(samples)
+        
+        def rows():
+            for samples in tests:
+                count = len(samples)
+                # 列式数据整体转换为Python列表后逐行打包，避免逐个访问NumPy标量
+                yield from zip(
+                    (samples.timestamp_ns / 1e9).tolist(), [site] * count, [samples.band] * count,
+                    [samples.channel] * count, samples.rssi.tolist(), samples.snr.tolist(),
+                    samples.throughput.tolist(), samples.packet_loss.tolist()
+                )
+        
+        rollups = [
+            (samples.band, samples.channel, samples.timestamp_ns / 1e9, {
+                'rssi': samples.rssi, 'snr': samples.snr, 'throughput': samples.throughput,
+                'packet_loss': samples.packet_loss
+            })
+            for samples in tests
+        ]
+        return self._write(f"test samples of {len(channel_test_results)} channels", [(
+            "INSERT INTO channel_samples VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows()
+        )], rollups)
+    
+    def record_recommendation(self, recommendation: ChannelRecommendation, test_count: int,
+                              timestamp: Optional[float] = None) -> bool:
+        timestamp = timestamp if timestamp is not None else time.time()
+        return self._write("recommendation", [(
+            "INSERT INTO recommendations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(timestamp, self.site, recommendation.band, recommendation.channel, recommendation.quality_score,
+              test_count, recommendation.reason, recommendation.expected_improvement)]
+        )])
+    
+    def record_speed_test(self, result: SpeedTestResult) -> bool:
+        return self._write("speed test", [(
+            "INSERT INTO speed_tests VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(result.timestamp.timestamp(), self.site, result.server, result.download_speed,
+              result.upload_speed, result.latency, result.jitter)]
+        )])
+    
+    def channel_series(self, metric: str, band: str, channel: int, start: Optional[float] = None,
+                       end: Optional[float] = None, site: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """返回时间范围内某信道指标的(时间戳数组, 数值数组)，按时间排序"""
+        sql, params = self._range_query(metric, "timestamp, " + metric, band, channel, start, end, site)
+        rows = self._query(sql + " ORDER BY timestamp", params)
+        if not rows:
+            return np.empty(0), np.empty(0)
+        data = np.array(rows, dtype=np.float64)
+        return data[:, 0], data[:, 1]
+    
+    def channel_stat(self, metric: str, band: str, channel: int, stat: str = "median",
+                     start: Optional[float] = None, end: Optional[float] = None,
+                     site: Optional[str] = None) -> Optional[float]:
+        """时间范围内某信道指标的聚合值：avg/min/max/count/sum与median/pNN(如p95)；无数据时返回None，count返回0"""
+        percentile = None if stat in _AGGREGATES else _parse_percentile(stat)
+        summary = self._summarize(metric, band, channel, start, end, site, histogram=percentile is not None)
+        if stat == 'count':
+            return float(summary.count)
+        if not summary.count:
+            return None
+        if stat == 'avg':
+            return summary.total / summary.count
+        if stat == 'sum':
+            return summary.total
+        if stat == 'min':
+            return summary.low
+        if stat == 'max':
+            return summary.high
+        
+        # 与np.percentile相同的线性插值：按直方图累计计数定位排名两侧的两个值
+        rank = (summary.count - 1) * percentile / 100.0
+        low = int(rank)
+        values = summary.order_statistics(metric, [low, min(low + 1, summary.count - 1)])
+        return float(values[0] + (values[1] - values[0]) * (rank - low))
+    
+    def _summarize(self, metric: str, band: str, channel: int, start: Optional[float], end: Optional[float],
+                   site: Optional[str], histogram: bool) -> '_Summary':
+        """合并范围内完整时间桶的预聚合与两端不足一个时间桶的原始行"""
+        _metric_table(metric)
+        first = math.ceil(start / ROLLUP_INTERVAL) * ROLLUP_INTERVAL if start is not None else None
+        last = math.floor(end / ROLLUP_INTERVAL) * ROLLUP_INTERVAL if end is not None else None
+        summary = _Summary.empty(metric)
+        with self._lock:
+            if first is not None and last is not None and first >= last:
+                return summary.merge(self._raw_summary(metric, band, channel, start, end, site, histogram))
+            
+            summary = summary.merge(self._rollup_summary(metric, band, channel, first, last, site, histogram))
+            if start is not None and start < first:
+                summary = summary.merge(self._raw_summary(metric, band, channel, start, first, site, histogram))
+            if end is not None and last < end:
+                summary = summary.merge(self._raw_summary(metric, band, channel, last, end, site, histogram))
+        return summary
+    
+    def _rollup_summary(self, metric: str, band: str, channel: int, first: Optional[float], last: Optional[float],
+                        site: Optional[str], histogram: bool) -> '_Summary':
+        sql = ("SELECT count, sum, min, max" + (", histogram" if histogram else "") +
+               " FROM metric_rollups WHERE metric = ? AND band = ? AND channel = ?")
+        params = [metric, band, channel]
+        for clause, value in (("bucket >= ?", first), ("bucket < ?", last), ("site = ?", site)):
+            if value is not None:
+                sql += f" AND {clause}"
+                params.append(value)
+        
+        rows = self._query(sql, params)
+        if not rows:
+            return _Summary.empty(metric)
+        counts = _unpack_histogram(b"".join(row[4] for row in rows), METRIC_BINS[metric][2]) if histogram else None
+        return _Summary(sum(row[0] for row in rows), sum(row[1] for row in rows), min(row[2] for row in rows),
+                        max(row[3] for row in rows), counts)
+    
+    def _raw_summary(self, metric: str, band: str, channel: int, start: Optional[float], end: Optional[float],
+                     site: Optional[str], histogram: bool) -> '_Summary':
+        sql, params = self._range_query(metric, f"COUNT({metric}), SUM({metric}), MIN({metric}), MAX({metric})",
+                                        band, channel, start, end, site)
+        count, total, low, high = self._query(sql, params)[0]
+        if not count:
+            return _Summary.empty(metric)
+        
+        counts = None
+        if histogram:
+            # 分桶计数在SQLite中完成，只取回非空的分桶
+            offset, width, size = METRIC_BINS[metric]
+            sql, params = self._range_query(metric, f"CAST(ROUND(({metric} - {offset!r}) / {width!r}) AS INTEGER), "
+                                                    f"COUNT({metric})", band, channel, start, end, site)
+            bins = np.array(self._query(sql + " GROUP BY 1", params), dtype=np.int64).reshape(-1, 2)
+            counts = np.zeros(size, dtype=np.int64)
+            np.add.at(counts, np.clip(bins[:, 0], 0, size - 1), bins[:, 1])
+        return _Summary(count, total, low, high, counts)
+    
+    def channel_history(self, band: str, channel: int, start: Optional[float] = None,
+                        end: Optional[float] = None, site: Optional[str] = None) -> List[Tuple[float, ChannelInfo]]:
+        """返回时间范围内某信道的扫描快照(时间戳, ChannelInfo)，网络列表不入库，恢复为空"""
+        sql, params = self._range_query(
+            'signal_strength', "timestamp, band, channel, frequency, signal_strength, occupancy, interference",
+            band, channel, start, end, site
+        )
+        return [
+            (row[0], ChannelInfo(channel=row[2], frequency=row[3], band=row[1], signal_strength=row[4],
+                                 occupancy=row[5], interference=row[6], networks=[]))
+            for row in self._query(sql + " ORDER BY timestamp", params)
+        ]
+    
+    def recommendations(self, band: Optional[str] = None, start: Optional[float] = None,
+                        end: Optional[float] = None, site: Optional[str] = None) -> List[Tuple[float, ChannelRecommendation]]:
+        """返回时间范围内的推荐记录(时间戳, ChannelRecommendation)，测试数据不随推荐保存"""
+        sql = ("SELECT timestamp, band, channel, quality_score, reason, expected_improvement "
+               "FROM recommendations WHERE 1 = 1")
+        sql, params = _add_filters(sql, [], band=band, start=start, end=end, site=site)
+        return [
+            (row[0], ChannelRecommendation(channel=row[2], band=row[1], quality_score=row[3], reason=row[4],
+                                           expected_improvement=row[5], test_data=[], analysis_details={}))
+            for row in self._query(sql + " ORDER BY timestamp", params)
+        ]
+    
+    def speed_tests(self, start: Optional[float] = None, end: Optional[float] = None,
+                    site: Optional[str] = None) -> List[SpeedTestResult]:
+        sql = ("SELECT timestamp, server, download_speed, upload_speed, latency, jitter "
+               "FROM speed_tests WHERE 1 = 1")
+        sql, params = _add_filters(sql, [], start=start, end=end, site=site)
+        return [
+            SpeedTestResult(download_speed=row[2], upload_speed=row[3], latency=row[4], jitter=row[5],
+                            timestamp=datetime.fromtimestamp(row[0]), server=row[1])
+            for row in self._query(sql + " ORDER BY timestamp", params)
+        ]
+    
+    def _range_query(self, metric: str, columns: str, band: str, channel: int, start: Optional[float],
+                     end: Optional[float], site: Optional[str]) -> Tuple[str, list]:
+        table = _metric_table(metric)
+        # 条件顺序与(band, channel, timestamp)索引一致，范围查询只扫描索引中的对应区间
+        sql = f"SELECT {columns} FROM {table} WHERE band = ? AND channel = ?"
+        return _add_filters(sql, [band, channel], start=start, end=end, site=site)
+    
+    def _query(self, sql: str, params: list) -> list:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+
+@dataclass
+class _Summary:
+    """一段数据的计数、总和、极值与直方图，可逐段合并"""
+    count: int
+    total: float
+    low: Optional[float]
+    high: Optional[float]
+    histogram: Optional[np.ndarray]
+    
+    @classmethod
+    def empty(cls, metric: str) -> '_Summary':
+        return cls(0, 0.0, None, None, np.zeros(METRIC_BINS[metric][2], dtype=np.int64))
+    
+    def merge(self, other: '_Summary') -> '_Summary':
+        if not other.count:
+            return self
+        if not self.count:
+            return other
+        histogram = self.histogram + other.histogram if other.histogram is not None else None
+        return _Summary(self.count + other.count, self.total + other.total, min(self.low, other.low),
+                        max(self.high, other.high), histogram)
+    
+    def order_statistics(self, metric: str, ranks: List[int]) -> List[float]:
+        """按直方图返回第k小(从0开始)的值，首尾取精确的最小、最大值"""
+        offset, width, _ = METRIC_BINS[metric]
+        cumulative = np.cumsum(self.histogram)
+        values = []
+        for rank in ranks:
+            if rank == 0:
+                values.append(self.low)
+            elif rank == self.count - 1:
+                values.append(self.high)
+            else:
+                index = int(np.searchsorted(cumulative, rank, side='right'))
+                values.append(min(max(offset + index * width, self.low), self.high))
+        return values
+
+
+def _histogram(metric: str, values: np.ndarray) -> np.ndarray:
+    offset, width, size = METRIC_BINS[metric]
+    bins = np.clip(np.rint((values - offset) / width), 0, size - 1).astype(np.intp)
+    return np.bincount(bins, minlength=size).astype(np.int64)
+
+
+def _pack_histogram(histogram: np.ndarray) -> bytes:
+    # 直方图大多是稀疏的，只保存非空分桶的(分桶序号, 计数)对
+    index = np.flatnonzero(histogram)
+    return np.column_stack((index, histogram[index])).astype('<i4').tobytes()
+
+
+def _unpack_histogram(data: bytes, size: int) -> np.ndarray:
+    """解码一个或多个首尾相接的直方图，返回各分桶计数之和"""
+    pairs = np.frombuffer(data, dtype='<i4').reshape(-1, 2)
+    return np.bincount(pairs[:, 0], weights=pairs[:, 1], minlength=size).astype(np.int64)
+
+
+def _metric_table(metric: str) -> str:
+    table = METRIC_TABLES.get(metric)
+    if table is None:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {', '.join(METRIC_TABLES)}")
+    return table
+
+
+def _add_filters(sql: str, params: list, band: Optional[str] = None, start: Optional[float] = None,
+                 end: Optional[float] = None, site: Optional[str] = None) -> Tuple[str, list]:
+    for clause, value in (("band = ?", band), ("timestamp >= ?", start), ("timestamp < ?", end), ("site = ?", site)):
+        if value is not None:
+            sql += f" AND {clause}"
+            params.append(value)
+    return sql, params
+
+
+def _parse_percentile(stat: str) -> float:
+    if stat == "median":
+        return 50.0
+    if stat.startswith("p"):
+        try:
+            percentile = float(stat[1:])
+        except ValueError:
+            percentile = -1.0
+        if 0 <= percentile <= 100:
+            return percentile
+    raise ValueError(f"Unknown statistic '{stat}', expected avg/min/max/count/sum, median or pNN")
+
+
+def _default_history_path() -> str:
+    path = config_service.get_history_path()
+    if os.path.isabs(path):
+        return path
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), path)
+
+
+history_store = HistoryStore(
+    path=_default_history_path(),
+    site=config_service.get_history_site() or None,
+    enabled=config_service.get_history_enabled(),
+    max_samples_per_channel=config_service.get_history_max_samples_per_channel()
+)
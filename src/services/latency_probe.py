@@ -0,0 +1,169 @@
+import asyncio
+import socket
+import struct
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.models.data_models import LatencyResult
+from src.services.config_service import config_service
+from src.utils.logger import logger
+
+
+PROTOCOL_TCP = "tcp"
+PROTOCOL_UDP = "udp"
+
+# UDP探测包头：序号 + 发送时刻(纳秒)
+_UDP_HEADER = struct.Struct('!IQ')
+
+
+def percentile(ordered: Sequence[float], p: float) -> float:
+    """对已排序的数据按线性插值计算百分位数，p取0~100"""
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * p / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def rfc3550_jitter(rtts: Sequence[Optional[float]]) -> float:
+    """按RFC 3550的到达间隔抖动算法估算抖动：J += (|D| - J) / 16，rtts需按发送顺序排列，None表示丢失"""
+    jitter = 0.0
+    for previous, current in zip(rtts, rtts[1:]):
+        # 只对序号相邻的两次探测计算差值，丢包两侧的探测并不相邻
+        if previous is None or current is None:
+            continue
+        jitter += (abs(current - previous) - jitter) / 16.0
+    return jitter
+
+
+def summarize_latency(target: str, protocol: str, rtts: Sequence[Optional[float]]) -> LatencyResult:
+    """汇总按发送顺序排列的往返时间(ms)，None表示该次探测丢失"""
+    received = [rtt for rtt in rtts if rtt is not None]
+    ordered = sorted(received)
+    return LatencyResult(
+        target=target,
+        protocol=protocol,
+        sent=len(rtts),
+        received=len(received),
+        min=ordered[0] if ordered else 0.0,
+        avg=sum(ordered) / len(ordered) if ordered else 0.0,
+        p50=percentile(ordered, 50),
+        p95=percentile(ordered, 95),
+        p99=percentile(ordered, 99),
+        jitter=rfc3550_jitter(rtts),
+        samples=received
+    )
+
+
+class _UdpEchoProtocol(asyncio.DatagramProtocol):
+    """UDP回显探测：按序号匹配回包，接收时刻在回调中立即记录"""
+    
+    def __init__(self):
+        self.pending: Dict[int, asyncio.Future] = {}
+    
+    def datagram_received(self, data: bytes, addr):
+        now = time.perf_counter_ns()
+        if len(data) < _UDP_HEADER.size:
+            return
+        sequence, _ = _UDP_HEADER.unpack_from(data)
+        future = self.pending.pop(sequence, None)
+        if future is not None and not future.done():
+            future.set_result(now)
+    
+    def error_received(self, exc: Exception):
+        logger.debug(f"UDP probe error: {exc}")
+
+
+class LatencyProbe:
+    """进程内延迟探测：以TCP建连或UDP回显计时，支持并发或按间隔发送N次探测"""
+    
+    def __init__(self, count: Optional[int] = None, interval: Optional[float] = None,
+                 timeout: Optional[float] = None, payload_size: int = 32):
+        self.count = count or config_service.get_latency_probe_count()
+        self.interval = interval if interval is not None else config_service.get_latency_probe_interval()
+        self.timeout = timeout or config_service.get_latency_probe_timeout()
+        self.payload_size = max(payload_size, _UDP_HEADER.size)
+    
+    def run(self, host: str, port: Optional[int] = None, protocol: Optional[str] = None) -> LatencyResult:
+        return asyncio.run(self.probe(host, port, protocol))
+    
+    async def probe(self, host: str, port: Optional[int] = None, protocol: Optional[str] = None) -> LatencyResult:
+        """按配置的协议和端口探测，参数为空时使用latency配置项"""
+        protocol = protocol or config_service.get_latency_probe_protocol()
+        port = port or config_service.get_latency_probe_port()
+        if protocol == PROTOCOL_UDP:
+            return await self.probe_udp(host, port)
+        return await self.probe_tcp(host, port)
+    
+    async def probe_tcp(self, host: str, port: int) -> LatencyResult:
+        """以TCP三次握手耗时作为往返时间"""
+        address = await self._resolve(host, port, socket.SOCK_STREAM)
+        loop = asyncio.get_running_loop()
+        
+        async def probe(_: int) -> Optional[float]:
+            start_ns = time.perf_counter_ns()
+            try:
+                transport, _ = await asyncio.wait_for(
+                    loop.create_connection(asyncio.Protocol, address[0], address[1]),
+                    self.timeout
+                )
+            except (OSError, asyncio.TimeoutError):
+                return None
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            transport.abort()
+            return elapsed_ns / 1e6
+        
+        rtts = await self._schedule(probe)
+        return self._finish(f"{host}:{port}", PROTOCOL_TCP, rtts)
+    
+    async def probe_udp(self, host: str, port: int) -> LatencyResult:
+        """向UDP回显服务发送带序号的探测包"""
+        address = await self._resolve(host, port, socket.SOCK_DGRAM)
+        loop = asyncio.get_running_loop()
+        transport, protocol = await loop.create_datagram_endpoint(_UdpEchoProtocol, remote_addr=address[:2])
+        padding = bytes(self.payload_size - _UDP_HEADER.size)
+        
+        async def probe(sequence: int) -> Optional[float]:
+            future = loop.create_future()
+            protocol.pending[sequence] = future
+            start_ns = time.perf_counter_ns()
+            transport.sendto(_UDP_HEADER.pack(sequence, start_ns) + padding)
+            try:
+                received_ns = await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                protocol.pending.pop(sequence, None)
+            return (received_ns - start_ns) / 1e6
+        
+        try:
+            rtts = await self._schedule(probe)
+        finally:
+            transport.close()
+        return self._finish(f"{host}:{port}", PROTOCOL_UDP, rtts)
+    
+    async def _schedule(self, probe) -> List[Optional[float]]:
+        """interval为0时同时发出全部探测，否则按固定间隔依次发出(前一个未返回也不等待)"""
+        tasks = []
+        for sequence in range(self.count):
+            if sequence and self.interval > 0:
+                await asyncio.sleep(self.interval)
+            tasks.append(asyncio.ensure_future(probe(sequence)))
+        return list(await asyncio.gather(*tasks))
+    
+    async def _resolve(self, host: str, port: int, sock_type: int) -> Tuple:
+        # 预先解析地址，DNS耗时不计入探测
+        loop = asyncio.get_running_loop()
+        infos = await asyncio.wait_for(loop.getaddrinfo(host, port, type=sock_type), self.timeout)
+        if not infos:
+            raise OSError(f"Cannot resolve {host}")
+        return infos[0][4]
+    
+    def _finish(self, target: str, protocol: str, rtts: List[Optional[float]]) -> LatencyResult:
+        result = summarize_latency(target, protocol, rtts)
+        logger.info(f"Latency probe {protocol} {target}: {result.received}/{result.sent} replies, "
+                    f"avg={result.avg:.2f} ms, p95={result.p95:.2f} ms, jitter={result.jitter:.2f} ms")
+        return result
+
+
+latency_probe = LatencyProbe()
@@ -0,0 +1,127 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional, Tuple
+from src.models.data_models import ChannelInfo
+from src.services.config_service import config_service
+from src.utils.logger import logger
+
+
+class ScanCache:
+    """按频段缓存信道扫描结果，支持TTL过期、LRU淘汰和可选的磁盘持久化"""
+    
+    def __init__(self, ttl: float, max_entries: int, path: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        self._ttl = ttl
+        self._max_entries = max(1, max_entries)
+        self._path = path
+        self._clock = clock
+        self._entries: 'OrderedDict[str, Tuple[float, List[ChannelInfo]]]' = OrderedDict()
+        
+        if self._path:
+            self._load()
+    
+    def get(self, band: str) -> Optional[Tuple[List[ChannelInfo], float]]:
+        """返回(信道列表, 缓存时长秒)，无缓存或已过期时返回None"""
+        entry = self._entries.get(band)
+        if entry is None:
+            return None
+        
+        cached_at, channels = entry
+        age = self._clock() - cached_at
+        if age > self._ttl:
+            del self._entries[band]
+            return None
+        
+        self._entries.move_to_end(band)
+        return channels, age
+    
+    def put(self, band: str, channels: List[ChannelInfo]):
+        self.put_many({band: channels})
+    
+    def put_many(self, results: Dict[str, List[ChannelInfo]]):
+        """一次写入多个频段的扫描结果(同一扫描时间)，只落盘一次"""
+        now = self._clock()
+        for band, channels in results.items():
+            self._entries[band] = (now, list(channels))
+            self._entries.move_to_end(band)
+        
+        while len(self._entries) > self._max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            logger.debug(f"Scan cache evicted {evicted}")
+        
+        if self._path:
+            self._save()
+    
+    def age(self, band: str) -> Optional[float]:
+        entry = self._entries.get(band)
+        if entry is None:
+            return None
+        return self._clock() - entry[0]
+    
+    def invalidate(self, band: Optional[str] = None):
+        if band is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(band, None)
+        
+        if self._path:
+            self._save()
+    
+    def _load(self):
+        if not os.path.exists(self._path):
+            return
+        
+        try:
+            with open(self._path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            now = self._clock()
+            for band, entry in data.items():
+                if now - entry['cached_at'] > self._ttl:
+                    continue
+                channels = [ChannelInfo(**item) for item in entry['channels']]
+                self._entries[band] = (entry['cached_at'], channels)
+            
+            logger.debug(f"Scan cache loaded {len(self._entries)} entries from disk")
+        except Exception as e:
+            logger.warning(f"Failed to load scan cache: {e}")
+            self._entries.clear()
+    
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            data = {
+                band: {
+                    'cached_at': cached_at,
+                    'channels': [asdict(channel) for channel in channels]
+                }
+                for band, (cached_at, channels) in self._entries.items()
+            }
+            
+            tmp_path = self._path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path)
+        except Exception as e:
+            logger.warning(f"Failed to save scan cache: {e}")
+
+
+def _default_cache_path() -> Optional[str]:
+    if not config_service.get_channel_cache_persist():
+        return None
+    
+    return os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        'cache',
+        'scan_cache.json'
+    )
+
+
+scan_cache = ScanCache(
+    ttl=config_service.get_channel_cache_ttl(),
+    max_entries=config_service.get_channel_cache_size(),
+    path=_default_cache_path()
+)
@@ -0,0 +1,324 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+from src.models.data_models import ChannelInfo, NetworkInfo
+
+
+FORMAT_NETSH = "netsh"
+FORMAT_NMCLI = "nmcli"
+FORMAT_IW = "iw"
+
+# nmcli -t 输出的字段顺序，扫描命令与解析器共用
+NMCLI_FIELDS = ("SSID", "BSSID", "CHAN", "FREQ", "SIGNAL", "SECURITY")
+
+# 无信号时使用的底噪值(dBm)
+NO_SIGNAL_DBM = -100
+
+_NETSH_SSID = re.compile(r'^SSID\s+\d+\s*:\s?(.*)$')
+_NETSH_BSSID = re.compile(r'^BSSID\s+\d+\s*:\s*([0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5})')
+_NETSH_FIELD = re.compile(r'^([^:]+?)\s*:\s*(.*)$')
+_NETSH_KEYS = {
+    'Authentication': 'auth', '身份验证': 'auth',
+    'Encryption': 'cipher', '加密': 'cipher',
+    'Signal': 'signal', '信号': 'signal',
+    'Channel': 'channel', '信道': 'channel', '频道': 'channel',
+}
+_PERCENT = re.compile(r'(\d+)\s*%')
+_INT = re.compile(r'-?\d+')
+
+_NMCLI_SPLIT = re.compile(r'(?<!\\):')
+_NMCLI_UNESCAPE = re.compile(r'\\(.)')
+
+_IW_BSS = re.compile(r'^BSS\s+([0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5})')
+_IW_FREQ = re.compile(r'^freq:\s*(\d+(?:\.\d+)?)')
+_IW_SIGNAL = re.compile(r'^signal:\s*(-?\d+(?:\.\d+)?)\s*dBm')
+_IW_SSID = re.compile(r'^SSID:\s?(.*)$')
+_IW_PRIMARY = re.compile(r'^(?:DS Parameter set: channel|\* primary channel:)\s*(\d+)')
+
+
+def percent_to_dbm(percent: int) -> int:
+    """将Windows/NetworkManager的信号百分比换算为dBm"""
+    percent = max(0, min(100, percent))
+    return percent // 2 - 100
+
+
+def channel_to_frequency(channel: int) -> float:
+    """信道号换算为中心频率(GHz)"""
+    if channel == 14:
+        return 2.484
+    if channel <= 13:
+        return round(2.407 + channel * 0.005, 3)
+    return round(5.0 + channel * 0.005, 3)
+
+
+def frequency_to_channel(mhz: float) -> int:
+    """中心频率(MHz)换算为信道号"""
+    mhz = int(round(mhz))
+    if mhz == 2484:
+        return 14
+    if 2412 <= mhz < 2484:
+        return (mhz - 2407) // 5
+    if 5000 <= mhz < 5900:
+        return (mhz - 5000) // 5
+    return 0
+
+
+def band_of_channel(channel: int) -> str:
+    return "2.4GHz" if channel <= 14 else "5GHz"
+
+
+def detect_format(first_line: str) -> str:
+    """根据首个非空行判断扫描输出的格式"""
+    line = first_line.strip()
+    if _IW_BSS.match(line):
+        return FORMAT_IW
+    if '\\:' in line or len(_NMCLI_SPLIT.split(line)) == len(NMCLI_FIELDS):
+        return FORMAT_NMCLI
+    return FORMAT_NETSH
+
+
+def parse_scan_output(lines: Iterable[str], fmt: Optional[str] = None) -> List[NetworkInfo]:
+    """流式解析扫描输出，fmt为空时自动识别格式"""
+    return list(iter_scan_output(lines, fmt))
+
+
+def iter_scan_output(lines: Iterable[str], fmt: Optional[str] = None) -> Iterator[NetworkInfo]:
+    lines = iter(lines)
+    if fmt is None:
+        head = []
+        for line in lines:
+            head.append(line)
+            if line.strip():
+                fmt = detect_format(line)
+                break
+        lines = _chain(head, lines)
+    
+    if fmt == FORMAT_IW:
+        return _parse_iw(lines)
+    if fmt == FORMAT_NMCLI:
+        return _parse_nmcli(lines)
+    return _parse_netsh(lines)
+
+
+def parse_scan_file(path: str, fmt: Optional[str] = None) -> List[NetworkInfo]:
+    """解析录制的扫描输出文件(测试夹具)"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return parse_scan_output(f, fmt)
+
+
+def _chain(head: List[str], rest: Iterator[str]) -> Iterator[str]:
+    yield from head
+    yield from rest
+
+
+def _make_network(ssid: str, bssid: str, signal: int, channel: int, encryption: str) -> NetworkInfo:
+    return NetworkInfo(
+        ssid=ssid,
+        bssid=bssid.lower(),
+        signal_strength=signal,
+        channel=channel,
+        frequency=channel_to_frequency(channel),
+        encryption_type=encryption
+    )
+
+
+def _parse_netsh(lines: Iterator[str]) -> Iterator[NetworkInfo]:
+    ssid = ""
+    auth = ""
+    cipher = ""
+    current: Optional[Dict] = None
+    
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        
+        match = _NETSH_SSID.match(line)
+        if match:
+            if current is not None:
+                yield from _finish_netsh(current)
+                current = None
+            ssid = match.group(1).strip()
+            auth = cipher = ""
+            continue
+        
+        match = _NETSH_BSSID.match(line)
+        if match:
+            if current is not None:
+                yield from _finish_netsh(current)
+            current = {'ssid': ssid, 'bssid': match.group(1), 'auth': auth, 'cipher': cipher}
+            continue
+        
+        match = _NETSH_FIELD.match(line)
+        if not match:
+            continue
+        key = _NETSH_KEYS.get(match.group(1))
+        if key is None:
+            continue
+        value = match.group(2).strip()
+        
+        if current is None:
+            # SSID级字段(身份验证/加密)出现在BSSID之前
+            if key == 'auth':
+                auth = value
+            elif key == 'cipher':
+                cipher = value
+        else:
+            current[key] = value
+    
+    if current is not None:
+        yield from _finish_netsh(current)
+
+
+def _finish_netsh(record: Dict) -> Iterator[NetworkInfo]:
+    channel_match = _INT.search(record.get('channel', ''))
+    if not channel_match:
+        return
+    signal_match = _PERCENT.search(record.get('signal', ''))
+    signal = percent_to_dbm(int(signal_match.group(1))) if signal_match else NO_SIGNAL_DBM
+    encryption = record.get('auth') or record.get('cipher') or "Unknown"
+    yield _make_network(record['ssid'], record['bssid'], signal, int(channel_match.group()), encryption)
+
+
+def _parse_nmcli(lines: Iterator[str]) -> Iterator[NetworkInfo]:
+    field_count = len(NMCLI_FIELDS)
+    for raw in lines:
+        line = raw.rstrip('\r\n')
+        if not line:
+            continue
+        
+        fields = _NMCLI_SPLIT.split(line)
+        if len(fields) != field_count:
+            continue
+        ssid, bssid, chan, freq, signal, security = (_NMCLI_UNESCAPE.sub(r'\1', f) for f in fields)
+        
+        try:
+            channel = int(chan)
+        except ValueError:
+            freq_match = _INT.search(freq)
+            channel = frequency_to_channel(int(freq_match.group())) if freq_match else 0
+        if channel <= 0:
+            continue
+        
+        try:
+            dbm = percent_to_dbm(int(signal))
+        except ValueError:
+            dbm = NO_SIGNAL_DBM
+        
+        yield _make_network(ssid, bssid, dbm, channel, security or "Open")
+
+
+def _parse_iw(lines: Iterator[str]) -> Iterator[NetworkInfo]:
+    current: Optional[Dict] = None
+    
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        
+        match = _IW_BSS.match(line)
+        if match:
+            if current is not None:
+                yield from _finish_iw(current)
+            current = {'bssid': match.group(1), 'ssid': "", 'signal': NO_SIGNAL_DBM, 'freq': 0.0,
+                       'channel': 0, 'rsn': False, 'wpa': False, 'privacy': False}
+            continue
+        
+        if current is None:
+            continue
+        
+        match = _IW_FREQ.match(line)
+        if match:
+            current['freq'] = float(match.group(1))
+            continue
+        match = _IW_SIGNAL.match(line)
+        if match:
+            current['signal'] = int(round(float(match.group(1))))
+            continue
+        match = _IW_SSID.match(line)
+        if match:
+            current['ssid'] = match.group(1).strip()
+            continue
+        match = _IW_PRIMARY.match(line)
+        if match and not current['channel']:
+            current['channel'] = int(match.group(1))
+            continue
+        
+        if line.startswith('RSN:'):
+            current['rsn'] = True
+        elif line.startswith('WPA:'):
+            current['wpa'] = True
+        elif line.startswith('capability:') and 'Privacy' in line:
+            current['privacy'] = True
+    
+    if current is not None:
+        yield from _finish_iw(current)
+
+
+def _finish_iw(record: Dict) -> Iterator[NetworkInfo]:
+    channel = record['channel'] or frequency_to_channel(record['freq'])
+    if channel <= 0:
+        return
+    if record['rsn']:
+        security = "WPA2"
+    elif record['wpa']:
+        security = "WPA"
+    elif record['privacy']:
+        security = "WEP"
+    else:
+        security = "Open"
+    yield _make_network(record['ssid'], record['bssid'], record['signal'], channel, security)
+
+
+def _signal_weight(dbm: int) -> float:
+    """信号越强，占用的空口时间权重越大：-95dBm为0，-50dBm及以上为1"""
+    return max(0.0, min(1.0, (dbm + 95) / 45.0))
+
+
+def _overlap_factor(distance: int, band: str) -> float:
+    """相邻信道的频谱重叠系数(同信道为1)"""
+    if band == "2.4GHz":
+        # 20MHz信道在2.4GHz跨越约4个信道
+        return max(0.0, 1.0 - distance / 5.0)
+    return 0.2 if distance == 4 else 0.0
+
+
+def build_channel_infos(networks: Iterable[NetworkInfo], band: str, channel_list: List[int]) -> List[ChannelInfo]:
+    """将网络列表按信道聚合为ChannelInfo，估算信号强度、占用率与干扰"""
+    by_channel: Dict[int, List[NetworkInfo]] = {}
+    for network in networks:
+        if band_of_channel(network.channel) == band:
+            by_channel.setdefault(network.channel, []).append(network)
+    
+    channels_data = []
+    for channel in channel_list:
+        co_channel = by_channel.get(channel, [])
+        
+        # 同信道网络争用空口时间
+        idle = 1.0
+        for network in co_channel:
+            idle *= 1.0 - 0.3 * _signal_weight(network.signal_strength)
+        occupancy = (1.0 - idle) * 100.0
+        
+        # 邻信道网络造成频谱重叠干扰
+        clean = 1.0
+        for neighbor in range(channel - 4, channel + 5):
+            if neighbor == channel:
+                continue
+            factor = _overlap_factor(abs(neighbor - channel), band)
+            if factor <= 0.0:
+                continue
+            for network in by_channel.get(neighbor, []):
+                clean *= 1.0 - 0.3 * factor * _signal_weight(network.signal_strength)
+        interference = (1.0 - clean) * 100.0
+        
+        channels_data.append(ChannelInfo(
+            channel=channel,
+            frequency=channel_to_frequency(channel),
+            band=band,
+            signal_strength=max((n.signal_strength for n in co_channel), default=NO_SIGNAL_DBM),
+            occupancy=occupancy,
+            interference=interference,
+            networks=[n.ssid or n.bssid for n in co_channel]
+        ))
+    
+    return channels_data
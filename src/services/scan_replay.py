@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.models.data_models import ChannelInfo
+from src.services.config_service import config_service
+from src.services.scan_parser import parse_scan_file
+from src.services.session_store import SessionReader, is_session_file
+from src.services.wifi_scanner import build_band_channel_infos
+from src.utils.logger import logger
+
+
+# 回放速度为0表示不等待，尽快输出
+SPEED_UNLIMITED = 0.0
+
+Snapshot = Tuple[float, Dict[str, List[ChannelInfo]]]
+
+
+class ReplayExhausted(RuntimeError):
+    """录制数据已全部回放且未开启循环"""
+
+
+class ScanReplay:
+    """按录制时的时间间隔回放扫描快照，可直接作为ChannelScanManager的scanner"""
+    
+    def __init__(self, snapshots: Callable[[], Iterable[Snapshot]], description: str, speed: float = 1.0,
+                 loop: bool = False, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if speed < 0:
+            raise ValueError("Replay speed must not be negative")
+        self.description = description
+        self.speed = speed
+        self.loop = loop
+        self.scans = 0
+        self._snapshots = snapshots
+        self._clock = clock
+        self._sleep = sleep
+        self._iterator: Optional[Iterator[Snapshot]] = None
+        # 回放起点：(墙钟时间, 录制时间)
+        self._origin: Optional[Tuple[float, float]] = None
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_session(cls, path: str, **kwargs) -> 'ScanReplay':
+        """回放SessionWriter录制的会话文件"""
+        def snapshots() -> Iterator[Snapshot]:
+            with SessionReader(path) as reader:
+                for timestamp, result in reader.iter_snapshots():
+                    yield timestamp, result.bands
+        
+        return cls(snapshots, description=f"session {path}", **kwargs)
+    
+    @classmethod
+    def from_fixtures(cls, paths: List[str], interval: Optional[float] = None, **kwargs) -> 'ScanReplay':
+        """回放netsh/nmcli/iw扫描输出文件，每个文件视为一次扫描，相邻扫描间隔interval秒"""
+        if not paths:
+            raise ValueError("No scan output files to replay")
+        interval = interval if interval is not None else config_service.get_scan_interval()
+        
+        def snapshots() -> Iterator[Snapshot]:
+            # 每轮回放重新解析，测得的吞吐量包含解析与信道聚合的开销
+            for i, path in enumerate(paths):
+                yield i * interval, build_band_channel_infos(parse_scan_file(path))
+        
+        return cls(snapshots, description=f"{len(paths)} scan output files", **kwargs)
+    
+    @classmethod
+    def from_path(cls, path: str, **kwargs) -> 'ScanReplay':
+        """按路径自动识别：会话文件、单个扫描输出文件，或按文件名排序的扫描输出文件目录"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Replay source not found: {path}")
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, name) for name in os.listdir(path)
+                           if os.path.isfile(os.path.join(path, name)))
+            return cls.from_fixtures(files, **kwargs)
+        if is_session_file(path):
+            return cls.from_session(path, **kwargs)
+        return cls.from_fixtures([path], **kwargs)
+    
+    def __call__(self) -> Dict[str, List[ChannelInfo]]:
+        return self.next_scan()
+    
+    def next_scan(self) -> Dict[str, List[ChannelInfo]]:
+        """返回下一个快照的各频段信道数据，必要时等待到按回放速度换算的时刻"""
+        with self._lock:
+            timestamp, bands = self._next_snapshot()
+            if self._origin is None:
+                self._origin = (self._clock(), timestamp)
+            elif self.speed != SPEED_UNLIMITED:
+                wall_start, recorded_start = self._origin
+                delay = wall_start + (timestamp - recorded_start) / self.speed - self._clock()
+                if delay > 0:
+                    self._sleep(delay)
+            self.scans += 1
+            return bands
+    
+    def reset(self):
+        """回到录制数据的开头，下一个快照立即输出"""
+        with self._lock:
+            self._iterator = None
+            self._origin = None
+    
+    def _next_snapshot(self) -> Snapshot:
+        if self._iterator is None:
+            self._iterator = iter(self._snapshots())
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            pass
+        
+        if not self.loop:
+            raise ReplayExhausted(f"Replay of {self.description} finished after {self.scans} scans")
+        logger.debug(f"Replay of {self.description} restarting after {self.scans} scans")
+        self._iterator = iter(self._snapshots())
+        self._origin = None
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise ReplayExhausted(f"{self.description} contains no scans") from None
+
+
+def create_configured_replay() -> Optional[ScanReplay]:
+    """replay.source非空时按配置创建回放数据源"""
+    source = config_service.get_replay_source()
+    if not source:
+        return None
+    if not os.path.isabs(source):
+        source = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), source)
+    logger.info(f"Replaying scans from {source}")
+    return ScanReplay.from_path(source, speed=config_service.get_replay_speed(),
+                                loop=config_service.get_replay_loop())
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+from src.models.data_models import ServerProbeResult
+from src.services.config_service import config_service
+from src.services.connection_pool import ConnectionPool, split_url
+from src.services.latency_probe import LatencyProbe
+from src.utils.logger import logger
+
+
+class ServerSelector:
+    """测速服务器选择：并发探测全部服务器的RTT，剔除明显偏慢的，再以小流量下载探测吞吐量并排序"""
+    
+    def __init__(self, probe_timeout: Optional[float] = None, rtt_probes: Optional[int] = None,
+                 probe_bytes: Optional[int] = None, probe_duration: Optional[float] = None,
+                 rtt_prune_factor: Optional[float] = None, top_k: Optional[int] = None):
+        self.probe_timeout = probe_timeout or config_service.get_server_probe_timeout()
+        self.rtt_probes = rtt_probes or config_service.get_server_rtt_probes()
+        self.probe_bytes = probe_bytes or config_service.get_server_probe_bytes()
+        self.probe_duration = probe_duration or config_service.get_server_probe_duration()
+        self.rtt_prune_factor = rtt_prune_factor or config_service.get_server_rtt_prune_factor()
+        self.top_k = top_k or config_service.get_server_top_k()
+    
+    def run(self, urls: Optional[List[str]] = None, k: Optional[int] = None) -> List[ServerProbeResult]:
+        return asyncio.run(self.select(urls, k))
+    
+    async def select(self, urls: Optional[List[str]] = None, k: Optional[int] = None,
+                     pool: Optional[ConnectionPool] = None) -> List[ServerProbeResult]:
+        """返回排名最靠前的k个可用服务器"""
+        ranked = await self.probe_all(urls, pool)
+        return [result for result in ranked if result.usable][:k or self.top_k]
+    
+    async def probe_all(self, urls: Optional[List[str]] = None,
+                        pool: Optional[ConnectionPool] = None) -> List[ServerProbeResult]:
+        """探测全部服务器并排序：可用的按吞吐量降序，其余(被剔除/不可达)排在后面"""
+        urls = list(urls if urls is not None else config_service.get_test_servers())
+        if not urls:
+            return []
+        
+        start = time.monotonic()
+        results = list(await asyncio.gather(*(self._probe_rtt(url) for url in urls)))
+        
+        # 按最快服务器的RTT剔除明显更远的服务器，不再对其做吞吐量探测
+        reachable = [result for result in results if result.rtt is not None]
+        if reachable:
+            best_rtt = min(result.rtt for result in reachable)
+            for result in reachable:
+                if result.rtt > best_rtt * self.rtt_prune_factor:
+                    result.pruned = True
+        
+        owned = pool is None
+        pool = pool or ConnectionPool(timeout=self.probe_timeout)
+        try:
+            await asyncio.gather(*(self._probe_throughput(result, pool)
+                                   for result in reachable if not result.pruned))
+        finally:
+            if owned:
+                pool.close()
+        
+        results.sort(key=_rank_key)
+        logger.info(f"Probed {len(urls)} servers in {time.monotonic() - start:.2f}s: " +
+                    ", ".join(_describe(result) for result in results))
+        return results
+    
+    async def _probe_rtt(self, url: str) -> ServerProbeResult:
+        (_, host, port), _, _ = split_url(url)
+        result = ServerProbeResult(url=url)
+        probe = LatencyProbe(count=self.rtt_probes, interval=0, timeout=self.probe_timeout)
+        try:
+            latency = await asyncio.wait_for(probe.probe_tcp(host, port), self.probe_timeout * 2)
+        except (OSError, asyncio.TimeoutError) as e:
+            result.error = str(e) or type(e).__name__
+            return result
+        
+        if latency.received == 0:
+            result.error = "unreachable"
+        else:
+            result.rtt = latency.min
+        return result
+    
+    async def _probe_throughput(self, result: ServerProbeResult, pool: ConnectionPool):
+        """只下载前probe_bytes字节(Range请求)；服务器忽略Range时读够字节数或到时限即停止"""
+        loop = asyncio.get_running_loop()
+        enough = loop.create_future()
+        head = loop.create_future()
+        received = 0
+        last_ns = 0
+
+        def on_body_bytes(count: int):
+            nonlocal received, last_ns
+            last_ns = time.perf_counter_ns()
+            received += count
+            if received >= self.probe_bytes and not enough.done():
+                enough.set_result(None)
+
+        def on_head(status: int, headers: Dict[str, str], ttfb_ns: int):
+            if not head.done():
+                head.set_result(None)
+
+        # 计时包含首字节等待，小流量探测下RTT较低的服务器略占优势
+        start_ns = time.perf_counter_ns()
+        request = asyncio.ensure_future(pool.request(
+            "GET", result.url,
+            headers={'Range': f"bytes=0-{self.probe_bytes - 1}"},
+            on_body_bytes=on_body_bytes,
+            on_head=on_head,
+            timeout=self.probe_timeout
+        ))
+        try:
+            # 共享的连接池按自身的超时建立连接，建连到响应头到达另按probe_timeout限时
+            await asyncio.wait({request, head}, timeout=self.probe_timeout, return_when=asyncio.FIRST_COMPLETED)
+            if request.done() or head.done():
+                remaining = self.probe_duration - (time.perf_counter_ns() - start_ns) / 1e9
+                await asyncio.wait({request, enough}, timeout=max(remaining, 0),
+                                   return_when=asyncio.FIRST_COMPLETED)
+            else:
+                result.error = f"no response within {self.probe_timeout:g}s"
+            if request.done() and request.exception() is not None:
+                result.error = str(request.exception()) or type(request.exception()).__name__
+            elif request.done() and request.result().status >= 400:
+                result.error = f"HTTP {request.result().status}"
+        finally:
+            if not request.done():
+                request.cancel()
+                await asyncio.gather(request, return_exceptions=True)
+            head.cancel()
+            enough.cancel()
+        
+        if result.error is None and received:
+            result.probe_bytes = received
+            result.throughput = received * 8 / ((last_ns - start_ns) / 1e9) / 1_000_000
+        elif result.error is None:
+            result.error = "no data"
+
+
+def _describe(result: ServerProbeResult) -> str:
+    if result.usable:
+        return f"{result.url} rtt={result.rtt:.1f}ms probe={result.throughput:.1f}Mbps"
+    if result.pruned:
+        return f"{result.url} rtt={result.rtt:.1f}ms pruned"
+    return f"{result.url} failed ({result.error})"
+
+
+def _rank_key(result: ServerProbeResult):
+    if result.usable:
+        return (0, -result.throughput, result.rtt)
+    if result.pruned:
+        return (1, 0.0, result.rtt)
+    return (2, 0.0, 0.0)
+
+
+server_selector = ServerSelector()
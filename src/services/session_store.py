@@ -0,0 +1,385 @@
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from src.models.data_models import ChannelInfo, ChannelScanResult, ChannelTestDataStore
+from src.services.config_service import config_service
+
+
+# 会话文件布局：文件头魔数 | 按8字节对齐的列数据块 | JSON索引 | 索引长度(<Q) | 文件尾魔数
+# 列数据块为小端序的NumPy数组；未压缩的块可直接从内存映射中读取，压缩的块在访问时才解压
+MAGIC = b"WTSESS\x00\x01"
+INDEX_MAGIC = b"WTSIDX\x00\x01"
+FORMAT_VERSION = 1
+
+COMPRESSION_NONE = "none"
+COMPRESSION_ZLIB = "zlib"
+
+# 扫描快照：每个快照一行，其信道逐行存放在信道表中；band_mask按频段编号记录快照包含的频段(含没有信道的频段)
+SNAPSHOT_COLUMNS = {
+    'timestamp': '<f8',
+    'duration': '<f4',
+    'source': '<u1',
+    'channel_count': '<i4',
+    'band_mask': '<u8',
+}
+MAX_BANDS = 64
+CHANNEL_COLUMNS = {
+    'band': '<u1',
+    'channel': '<i2',
+    'frequency': '<f8',
+    'signal_strength': '<i2',
+    'occupancy': '<f8',
+    'interference': '<f8',
+    'network_count': '<i4',
+}
+# 网络名称按UTF-8拼接存放，另存每个名称的字节长度
+NETWORK_COLUMNS = {
+    'name_length': '<u2',
+    'name_bytes': '<u1',
+}
+SAMPLE_COLUMNS = {
+    'rssi': '<i2',
+    'snr': '<f4',
+    'throughput': '<f4',
+    'packet_loss': '<f4',
+    'timestamp_ns': '<i8',
+}
+
+# 扫描数据在内存中累积的信道行数，达到后写出一个块
+SCAN_BLOCK_ROWS = 65536
+
+_ALIGNMENT = 8
+_TRAILER = struct.Struct('<Q')
+
+
+def is_session_file(path: str) -> bool:
+    """根据文件头魔数判断是否为会话文件"""
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class SessionWriter:
+    """按列写入扫描快照与信道测试样本的会话文件，close时写出索引"""
+    
+    def __init__(self, path: str, compression: Optional[str] = None, block_rows: Optional[int] = None,
+                 metadata: Optional[dict] = None):
+        self.path = path
+        self.compression = compression or config_service.get_session_compression()
+        if self.compression not in (COMPRESSION_NONE, COMPRESSION_ZLIB):
+            raise ValueError(f"Unknown session compression '{self.compression}'")
+        self.block_rows = block_rows or config_service.get_session_block_rows()
+        
+        self._index = {
+            'version': FORMAT_VERSION,
+            'compression': self.compression,
+            'created': time.time(),
+            'metadata': metadata or {},
+            'bands': [],
+            'sources': [],
+            'scan_blocks': [],
+            'sample_sets': [],
+        }
+        self._pending_snapshots: List[tuple] = []
+        self._pending_channels: List[tuple] = []
+        self._pending_networks: List[bytes] = []
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+    
+    def write_scan(self, result: ChannelScanResult, timestamp: Optional[float] = None):
+        """记录一次扫描的各频段信道快照"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        band_mask = 0
+        for band in result.bands:
+            band_mask |= 1 << self._code('bands', band)
+        channel_count = 0
+        for channels in result.bands.values():
+            for info in channels:
+                names = [str(name).encode('utf-8') for name in info.networks]
+                self._pending_channels.append((
+                    self._code('bands', info.band), info.channel, info.frequency, info.signal_strength,
+                    info.occupancy, info.interference, len(names)
+                ))
+                self._pending_networks.extend(names)
+                channel_count += 1
+        
+        self._pending_snapshots.append((timestamp, result.duration, self._code('sources', result.source), channel_count,
+                                        band_mask))
+        # 块只在快照边界处切分，读取单个快照只需解码一个块
+        if len(self._pending_channels) >= SCAN_BLOCK_ROWS:
+            self._flush_scans()
+    
+    def write_samples(self, samples: ChannelTestDataStore):
+        """记录一个信道的测试样本，超过block_rows的部分拆分为多个块"""
+        blocks = []
+        for start in range(0, len(samples), self.block_rows):
+            part = samples[start:start + self.block_rows]
+            blocks.append({
+                'rows': len(part),
+                'columns': {name: self._write_array(getattr(part, name), dtype)
+                            for name, dtype in SAMPLE_COLUMNS.items()}
+            })
+        self._index['sample_sets'].append({
+            'band': samples.band,
+            'channel': samples.channel,
+            'bandwidth': samples.bandwidth,
+            'rows': len(samples),
+            'blocks': blocks,
+        })
+    
+    def write_channel_tests(self, channel_test_results: Dict[int, dict]):
+        """记录一次推荐分析中各信道的测试样本"""
+        for channel_data in channel_test_results.values():
+            self.write_samples(channel_data['test_data'])
+    
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._flush_scans()
+            index = json.dumps(self._index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            self._file.write(index)
+            self._file.write(_TRAILER.pack(len(index)))
+            self._file.write(INDEX_MAGIC)
+        finally:
+            self._file.close()
+    
+    def _code(self, table: str, value: str) -> int:
+        values = self._index[table]
+        if value not in values:
+            if table == 'bands' and len(values) >= MAX_BANDS:
+                raise ValueError(f"Session files support at most {MAX_BANDS} bands")
+            values.append(value)
+        return values.index(value)
+    
+    def _flush_scans(self):
+        if not self._pending_snapshots:
+            return
+        
+        snapshots = list(zip(*self._pending_snapshots))
+        channels = list(zip(*self._pending_channels)) or [()] * len(CHANNEL_COLUMNS)
+        columns = {}
+        for (name, dtype), values in zip(SNAPSHOT_COLUMNS.items(), snapshots):
+            columns[name] = self._write_array(np.asarray(values), dtype)
+        for (name, dtype), values in zip(CHANNEL_COLUMNS.items(), channels):
+            columns[name] = self._write_array(np.asarray(values), dtype)
+        columns['name_length'] = self._write_array(
+            np.fromiter(map(len, self._pending_networks), dtype=np.int64, count=len(self._pending_networks)),
+            NETWORK_COLUMNS['name_length']
+        )
+        columns['name_bytes'] = self._write_array(
+            np.frombuffer(b''.join(self._pending_networks), dtype=np.uint8), NETWORK_COLUMNS['name_bytes']
+        )
+        
+        self._index['scan_blocks'].append({
+            'snapshots': len(self._pending_snapshots),
+            'rows': len(self._pending_channels),
+            'columns': columns,
+        })
+        self._pending_snapshots.clear()
+        self._pending_channels.clear()
+        self._pending_networks.clear()
+    
+    def _write_array(self, values: np.ndarray, dtype: str) -> list:
+        """写出一列数据，返回索引中的[偏移, 字节数, 元素个数]"""
+        array = np.ascontiguousarray(values, dtype=dtype)
+        data = zlib.compress(array, 1) if self.compression == COMPRESSION_ZLIB else memoryview(array).cast('B')
+        
+        # 对齐后未压缩的列可以零拷贝地映射为NumPy数组
+        padding = -self._file.tell() % _ALIGNMENT
+        if padding:
+            self._file.write(b'\x00' * padding)
+        offset = self._file.tell()
+        self._file.write(data)
+        return [offset, len(data), len(array)]
+
+
+class SessionReader:
+    """以内存映射方式读取会话文件：打开时只解析索引，列数据在访问对应快照或样本时才读取和解压"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index = self._read_index()
+        except (ValueError, OSError):
+            self._file.close()
+            raise
+        
+        self.compression = self._index['compression']
+        self.metadata = self._index['metadata']
+        self.created = self._index['created']
+        self._bands = self._index['bands']
+        self._sources = self._index['sources']
+        self._scan_blocks = self._index['scan_blocks']
+        self._sample_sets = self._index['sample_sets']
+        # 每个扫描块第一个快照的全局序号，用于按序号定位块
+        self._block_starts = np.cumsum([0] + [block['snapshots'] for block in self._scan_blocks])
+        self._cached_block: Tuple[int, Optional[dict]] = (-1, None)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __len__(self) -> int:
+        return self.snapshot_count
+    
+    @property
+    def snapshot_count(self) -> int:
+        return int(self._block_starts[-1])
+    
+    @property
+    def sample_set_count(self) -> int:
+        return len(self._sample_sets)
+    
+    @property
+    def sample_count(self) -> int:
+        return sum(sample_set['rows'] for sample_set in self._sample_sets)
+    
+    def close(self):
+        self._cached_block = (-1, None)
+        try:
+            self._mmap.close()
+        except BufferError:
+            # 仍有零拷贝数组引用映射时由垃圾回收关闭
+            pass
+        self._file.close()
+    
+    def time_range(self) -> Optional[Tuple[float, float]]:
+        """扫描快照的(最早, 最晚)时间戳，没有快照时返回None"""
+        if not self.snapshot_count:
+            return None
+        first = self._column(self._scan_blocks[0], 'timestamp', SNAPSHOT_COLUMNS)
+        last = self._column(self._scan_blocks[-1], 'timestamp', SNAPSHOT_COLUMNS)
+        return float(first[0]), float(last[-1])
+    
+    def snapshot(self, index: int) -> Tuple[float, ChannelScanResult]:
+        """按序号读取一个扫描快照，返回(时间戳, ChannelScanResult)"""
+        if index < 0:
+            index += self.snapshot_count
+        if not 0 <= index < self.snapshot_count:
+            raise IndexError("Snapshot index out of range")
+        block_index = int(np.searchsorted(self._block_starts, index, side='right')) - 1
+        snapshots = self._decode_scan_block(block_index)
+        return snapshots[index - int(self._block_starts[block_index])]
+    
+    def iter_snapshots(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[float, ChannelScanResult]]:
+        """按时间顺序逐块解码扫描快照，同一时刻只保留一个块的数据"""
+        stop = self.snapshot_count if stop is None else min(stop, self.snapshot_count)
+        for block_index in range(len(self._scan_blocks)):
+            block_start = int(self._block_starts[block_index])
+            block_stop = int(self._block_starts[block_index + 1])
+            if block_stop <= start:
+                continue
+            if block_start >= stop:
+                break
+            snapshots = self._decode_scan_block(block_index)
+            yield from snapshots[max(start - block_start, 0):stop - block_start]
+    
+    def samples(self, index: int) -> ChannelTestDataStore:
+        """读取一组信道测试样本；未压缩且只有一个块时各列为内存映射上的只读视图"""
+        sample_set = self._sample_sets[index]
+        columns = {}
+        for name in SAMPLE_COLUMNS:
+            parts = [self._column(block, name, SAMPLE_COLUMNS) for block in sample_set['blocks']]
+            if len(parts) == 1:
+                columns[name] = parts[0]
+            elif parts:
+                columns[name] = np.concatenate(parts)
+            else:
+                columns[name] = np.empty(0, dtype=SAMPLE_COLUMNS[name])
+        return ChannelTestDataStore(sample_set['channel'], sample_set['band'], sample_set['bandwidth'], **columns)
+    
+    def iter_samples(self, band: Optional[str] = None,
+                     channel: Optional[int] = None) -> Iterator[ChannelTestDataStore]:
+        for index, sample_set in enumerate(self._sample_sets):
+            if band is not None and sample_set['band'] != band:
+                continue
+            if channel is not None and sample_set['channel'] != channel:
+                continue
+            yield self.samples(index)
+    
+    def _read_index(self) -> dict:
+        size = len(self._mmap)
+        trailer_size = _TRAILER.size + len(INDEX_MAGIC)
+        if size < len(MAGIC) + trailer_size or self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a session file")
+        if self._mmap[size - len(INDEX_MAGIC):] != INDEX_MAGIC:
+            raise ValueError(f"{self.path} is incomplete (writer was not closed)")
+        
+        index_size, = _TRAILER.unpack_from(self._mmap, size - trailer_size)
+        index_start = size - trailer_size - index_size
+        index = json.loads(self._mmap[index_start:size - trailer_size].decode('utf-8'))
+        if index.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported session format version {index.get('version')}")
+        return index
+    
+    def _column(self, block: dict, name: str, schema: Dict[str, str]) -> np.ndarray:
+        offset, size, count = block['columns'][name]
+        if self.compression == COMPRESSION_ZLIB:
+            return np.frombuffer(zlib.decompress(self._mmap[offset:offset + size]), dtype=schema[name], count=count)
+        return np.frombuffer(self._mmap, dtype=schema[name], count=count, offset=offset)
+    
+    def _decode_scan_block(self, block_index: int) -> List[Tuple[float, ChannelScanResult]]:
+        cached_index, cached = self._cached_block
+        if cached_index == block_index:
+            return cached
+        
+        block = self._scan_blocks[block_index]
+        snapshots = {name: self._column(block, name, SNAPSHOT_COLUMNS).tolist() for name in SNAPSHOT_COLUMNS}
+        channels = {name: self._column(block, name, CHANNEL_COLUMNS).tolist() for name in CHANNEL_COLUMNS}
+        name_lengths = self._column(block, 'name_length', NETWORK_COLUMNS)
+        name_bytes = self._column(block, 'name_bytes', NETWORK_COLUMNS).tobytes()
+        name_ends = np.cumsum(name_lengths).tolist()
+        names = [name_bytes[end - length:end].decode('utf-8')
+                 for end, length in zip(name_ends, name_lengths.tolist())]
+        
+        decoded = []
+        row = 0
+        network = 0
+        for timestamp, duration, source, channel_count, band_mask in zip(
+                snapshots['timestamp'], snapshots['duration'], snapshots['source'], snapshots['channel_count'],
+                snapshots['band_mask']):
+            # 先按编号放入快照记录的全部频段，没有信道的频段也保留为空列表
+            bands: Dict[str, List[ChannelInfo]] = {band: [] for code, band in enumerate(self._bands)
+                                                   if band_mask >> code & 1}
+            for i in range(row, row + channel_count):
+                network_count = channels['network_count'][i]
+                band = self._bands[channels['band'][i]]
+                bands.setdefault(band, []).append(ChannelInfo(
+                    channel=channels['channel'][i],
+                    frequency=channels['frequency'][i],
+                    band=band,
+                    signal_strength=channels['signal_strength'][i],
+                    occupancy=channels['occupancy'][i],
+                    interference=channels['interference'][i],
+                    networks=names[network:network + network_count]
+                ))
+                network += network_count
+            row += channel_count
+            decoded.append((timestamp, ChannelScanResult(bands=bands, source=self._sources[source], duration=duration)))
+        
+        self._cached_block = (block_index, decoded)
+        return decoded
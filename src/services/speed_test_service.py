@@ -0,0 +1,288 @@
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Deque, Iterator, List, Optional, Tuple
+from src.models.data_models import LatencyResult, ThroughputResult
+from src.services.config_service import config_service
+from src.services.connection_pool import ConnectionPool
+from src.services.latency_probe import summarize_latency
+from src.utils.logger import logger
+
+
+DIRECTION_DOWNLOAD = "download"
+DIRECTION_UPLOAD = "upload"
+
+# 上传时每个分块的大小
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+class SpeedTestError(RuntimeError):
+    pass
+
+
+def iter_upload_chunks(total_size: int, payload: memoryview) -> Iterator[memoryview]:
+    """按payload大小切分total_size字节的上传内容，每块都是同一预分配缓冲区的零拷贝切片"""
+    chunk_size = len(payload)
+    remaining = total_size
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield payload[:size]
+        remaining -= size
+
+
+class SlidingWindowMeter:
+    """滑动窗口吞吐量计：定期采样累计字节数，以窗口内的字节增量估算当前速率"""
+    
+    def __init__(self, window: float, clock: Callable[[], float] = time.monotonic):
+        self._window = window
+        self._clock = clock
+        self._samples: Deque[Tuple[float, int]] = deque()
+        self.total_bytes = 0
+        self._baseline_bytes = 0
+        self._baseline_time = clock()
+    
+    def add(self, count: int):
+        self.total_bytes += count
+    
+    def reset(self):
+        """丢弃之前的采样(如预热阶段)，从当前时刻重新计量"""
+        self._samples.clear()
+        self._baseline_bytes = self.total_bytes
+        self._baseline_time = self._clock()
+        self._samples.append((self._baseline_time, self.total_bytes))
+    
+    @property
+    def measured_bytes(self) -> int:
+        return self.total_bytes - self._baseline_bytes
+    
+    @property
+    def elapsed(self) -> float:
+        return self._clock() - self._baseline_time
+    
+    def sample(self) -> Optional[float]:
+        """记录一个采样点并返回窗口内的速率(Mbps)，采样不足时返回None"""
+        now = self._clock()
+        samples = self._samples
+        samples.append((now, self.total_bytes))
+        
+        # 保留恰好覆盖窗口起点的最早采样
+        while len(samples) > 2 and samples[1][0] <= now - self._window:
+            samples.popleft()
+        
+        start_time, start_bytes = samples[0]
+        span = now - start_time
+        if span < self._window * 0.5:
+            return None
+        return (self.total_bytes - start_bytes) * 8 / span / 1_000_000
+    
+    def average(self) -> float:
+        """计量开始以来的平均速率(Mbps)"""
+        elapsed = self.elapsed
+        if elapsed <= 0:
+            return 0.0
+        return self.measured_bytes * 8 / elapsed / 1_000_000
+
+
+class ConvergenceDetector:
+    """收敛判断：最近N个窗口估计值的相对极差不超过容差即认为稳定"""
+    
+    def __init__(self, samples: int, tolerance: float):
+        self._estimates: Deque[float] = deque(maxlen=max(2, samples))
+        self._tolerance = tolerance
+    
+    def add(self, estimate: float):
+        self._estimates.append(estimate)
+    
+    def converged(self) -> bool:
+        estimates = self._estimates
+        if len(estimates) < estimates.maxlen:
+            return False
+        mean = sum(estimates) / len(estimates)
+        if mean <= 0:
+            return False
+        return (max(estimates) - min(estimates)) / mean <= self._tolerance
+    
+    def estimate(self) -> float:
+        ordered = sorted(self._estimates)
+        return ordered[len(ordered) // 2] if ordered else 0.0
+
+
+class SpeedTestService:
+    """基于asyncio的多连接测速服务：每个服务器并发多条流，预热后按滑动窗口计量，结果收敛即提前结束"""
+    
+    def __init__(self, streams: Optional[int] = None, warmup: Optional[float] = None,
+                 window: Optional[float] = None, sample_interval: Optional[float] = None,
+                 max_duration: Optional[float] = None, tolerance: Optional[float] = None,
+                 convergence_samples: Optional[int] = None, timeout: Optional[float] = None,
+                 upload_size: Optional[int] = None, preconnect: Optional[bool] = None):
+        self.streams = streams or config_service.get_speed_test_streams()
+        self.warmup = warmup if warmup is not None else config_service.get_speed_test_warmup()
+        self.window = window or config_service.get_speed_test_window()
+        self.sample_interval = sample_interval or config_service.get_speed_test_sample_interval()
+        self.max_duration = max_duration or config_service.get_speed_test_max_duration()
+        self.tolerance = tolerance or config_service.get_speed_test_convergence_tolerance()
+        self.convergence_samples = convergence_samples or config_service.get_speed_test_convergence_samples()
+        self.timeout = timeout or config_service.get_network_timeout()
+        self.upload_size = upload_size or config_service.get_speed_test_upload_size()
+        self.preconnect = preconnect if preconnect is not None else config_service.get_speed_test_preconnect()
+    
+    def run_download(self, url: str) -> ThroughputResult:
+        return asyncio.run(self.measure_download(url))
+    
+    def run_upload(self, url: str) -> ThroughputResult:
+        return asyncio.run(self.measure_upload(url))
+    
+    async def measure_latency(self, url: str, count: int = 5, pool: Optional[ConnectionPool] = None) -> LatencyResult:
+        """在已建立的长连接上发送HEAD请求测量往返时间，不含握手"""
+        async with _borrow_pool(pool, self.timeout) as pool:
+            await pool.preconnect(url)
+            rtts = []
+            for _ in range(count):
+                response = await pool.request("HEAD", url)
+                rtts.append(response.ttfb_ns / 1e6)
+            return summarize_latency(url, "http", rtts)
+    
+    async def measure_download(self, url: str, pool: Optional[ConnectionPool] = None) -> ThroughputResult:
+        return await self._measure(url, DIRECTION_DOWNLOAD, self._download_stream, pool)
+    
+    async def measure_upload(self, url: str, pool: Optional[ConnectionPool] = None) -> ThroughputResult:
+        return await self._measure(url, DIRECTION_UPLOAD, self._upload_stream, pool)
+    
+    async def _measure(self, url: str, direction: str,
+                       stream: Callable[[ConnectionPool, str, SlidingWindowMeter, asyncio.Event, List[int]], Awaitable[None]],
+                       pool: Optional[ConnectionPool]) -> ThroughputResult:
+        async with _borrow_pool(pool, self.timeout) as pool:
+            stats_before = pool.stats.snapshot()
+            if self.preconnect:
+                # 握手在预热之前完成，不计入吞吐量
+                await pool.preconnect(url, self.streams)
+            
+            meter = SlidingWindowMeter(self.window)
+            stop = asyncio.Event()
+            ttfb_samples: List[int] = []
+            tasks = [asyncio.ensure_future(stream(pool, url, meter, stop, ttfb_samples)) for _ in range(self.streams)]
+            
+            try:
+                result = await self._monitor(url, direction, meter, tasks, ttfb_samples)
+            finally:
+                stop.set()
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            
+            result.connection_stats = pool.stats - stats_before
+            logger.info(f"Speed test {direction} {url} connections: {result.connection_stats.connections_opened} opened "
+                        f"({result.connection_stats.handshake_time * 1000:.1f} ms handshake), "
+                        f"{result.connection_stats.connections_reused} reused")
+            return result
+    
+    async def _monitor(self, url: str, direction: str, meter: SlidingWindowMeter,
+                       tasks: List[asyncio.Future], ttfb_samples: List[int]) -> ThroughputResult:
+        # 预热阶段：等待TCP慢启动结束，期间的字节不计入结果
+        warmup_end = time.monotonic() + self.warmup
+        while time.monotonic() < warmup_end and not all(task.done() for task in tasks):
+            await asyncio.sleep(self.sample_interval)
+        meter.reset()
+        
+        detector = ConvergenceDetector(self.convergence_samples, self.tolerance)
+        samples: List[float] = []
+        sample_times: List[float] = []
+        converged = False
+        
+        while meter.elapsed < self.max_duration:
+            await asyncio.sleep(self.sample_interval)
+            rate = meter.sample()
+            if rate is not None:
+                samples.append(rate)
+                sample_times.append(meter.elapsed)
+                detector.add(rate)
+                if detector.converged():
+                    converged = True
+                    break
+            if all(task.done() for task in tasks):
+                break
+        
+        if meter.measured_bytes == 0:
+            errors = [task.exception() for task in tasks if task.done() and not task.cancelled() and task.exception()]
+            if errors:
+                raise SpeedTestError(f"All streams failed for {url}: {errors[0]}") from errors[0]
+            raise SpeedTestError(f"No data transferred for {url}")
+        
+        result = ThroughputResult(
+            server=url,
+            direction=direction,
+            streams=len(tasks),
+            bytes_transferred=meter.measured_bytes,
+            duration=meter.elapsed,
+            throughput=detector.estimate() if converged else meter.average(),
+            converged=converged,
+            samples=samples,
+            sample_times=sample_times,
+            ttfb=_median(ttfb_samples) / 1e6 if ttfb_samples else None
+        )
+        ttfb_text = f", ttfb={result.ttfb:.1f} ms" if result.ttfb is not None else ""
+        logger.info(f"Speed test {direction} {url}: {result.throughput:.2f} Mbps "
+                    f"({result.streams} streams, converged={converged}{ttfb_text})")
+        return result
+    
+    async def _download_stream(self, pool: ConnectionPool, url: str, meter: SlidingWindowMeter,
+                               stop: asyncio.Event, ttfb_samples: List[int]):
+        """单条下载流：在长连接上反复请求测试文件直到测速结束，响应体读入连接的复用缓冲区后丢弃"""
+        def on_head(status: int, headers: dict, ttfb_ns: int):
+            # 首字节时间在响应头到达时记录，测试文件大于测量窗口、请求来不及完成时也有样本
+            ttfb_samples.append(ttfb_ns)
+            if status != 200:
+                raise SpeedTestError(f"HTTP {status} from {url}")
+        
+        while not stop.is_set():
+            await pool.request("GET", url, on_body_bytes=meter.add, on_head=on_head)
+    
+    async def _upload_stream(self, pool: ConnectionPool, url: str, meter: SlidingWindowMeter,
+                             stop: asyncio.Event, ttfb_samples: List[int]):
+        """单条上传流：在长连接上以分块传输反复提交upload_size字节的请求体，只统计已写入套接字的字节"""
+        # 随机内容避免链路压缩导致速率虚高
+        payload = memoryview(os.urandom(UPLOAD_CHUNK_SIZE))
+        
+        while not stop.is_set():
+            response = await pool.request(
+                "POST", url,
+                headers={'Content-Type': 'application/octet-stream'},
+                body=_until_stopped(iter_upload_chunks(self.upload_size, payload), stop),
+                on_sent_bytes=meter.add
+            )
+            if response.status >= 400:
+                raise SpeedTestError(f"HTTP {response.status} from {url}")
+
+
+def _until_stopped(chunks: Iterator[memoryview], stop: asyncio.Event) -> Iterator[memoryview]:
+    for chunk in chunks:
+        if stop.is_set():
+            return
+        yield chunk
+
+
+@asynccontextmanager
+async def _borrow_pool(pool: Optional[ConnectionPool], timeout: float):
+    """使用调用方传入的连接池；未传入时创建临时连接池并在结束时关闭"""
+    if pool is not None:
+        yield pool
+        return
+    
+    pool = ConnectionPool(timeout=timeout)
+    try:
+        yield pool
+    finally:
+        pool.close()
+
+
+def _median(values: List[int]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return float(ordered[middle])
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+speed_test_service = SpeedTestService()
@@ -0,0 +1,191 @@
+import heapq
+import itertools
+import threading
+from enum import IntEnum
+from typing import Any, Callable, List, Optional
+from src.services.config_service import config_service
+from src.utils.logger import logger
+
+
+class TaskPriority(IntEnum):
+    """任务优先级，数值越小越先执行"""
+    SCAN = 0
+    RECOMMENDATION = 10
+    BACKGROUND = 20
+
+
+class TaskQueueFullError(RuntimeError):
+    pass
+
+
+class TaskHandle:
+    """已提交任务的句柄，用于查询状态、取消任务和获取结果"""
+    
+    PENDING = "pending"
+    RUNNING = "running"
+    FINISHED = "finished"
+    CANCELLED = "cancelled"
+    
+    def __init__(self, name: str, priority: int, fn: Callable, args: tuple, kwargs: dict):
+        self.name = name
+        self.priority = priority
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._state = self.PENDING
+        self._result = None
+        self._exception: Optional[BaseException] = None
+        self._cancel_event = threading.Event()
+        self._done_event = threading.Event()
+        self._callbacks: List[Callable[['TaskHandle'], None]] = []
+        self._lock = threading.Lock()
+    
+    def cancel(self) -> bool:
+        """取消任务：排队中的任务直接移除；运行中的任务仅设置取消标志，由任务自行检查"""
+        with self._lock:
+            self._cancel_event.set()
+            if self._state != self.PENDING:
+                return False
+            self._state = self.CANCELLED
+        self._finish()
+        return True
+    
+    def is_cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+    
+    def cancelled(self) -> bool:
+        return self._state == self.CANCELLED
+    
+    def running(self) -> bool:
+        return self._state == self.RUNNING
+    
+    def done(self) -> bool:
+        return self._state in (self.FINISHED, self.CANCELLED)
+    
+    def result(self, timeout: Optional[float] = None) -> Any:
+        if not self._done_event.wait(timeout):
+            raise TimeoutError(f"Task {self.name} did not finish within {timeout}s")
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+    
+    def add_done_callback(self, callback: Callable[['TaskHandle'], None]):
+        with self._lock:
+            if not self.done():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+    
+    def _run(self):
+        with self._lock:
+            if self._state != self.PENDING:
+                return
+            self._state = self.RUNNING
+        
+        try:
+            self._result = self._fn(*self._args, **self._kwargs)
+        except BaseException as e:
+            self._exception = e
+            logger.error(f"Task {self.name} failed: {e}", exc_info=True)
+        
+        with self._lock:
+            self._state = self.FINISHED
+        self._finish()
+    
+    def _finish(self):
+        self._done_event.set()
+        with self._lock:
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"Error in task done callback: {e}")
+
+
+class TaskExecutor:
+    """共享的后台任务执行器：固定数量的工作线程、按优先级调度的有界队列"""
+    
+    def __init__(self, max_workers: int, max_queue_size: int):
+        self._max_workers = max(1, max_workers)
+        self._max_queue_size = max(1, max_queue_size)
+        self._queue: list = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._idle_workers = 0
+        self._shutdown = False
+    
+    def submit(self, fn: Callable, *args, priority: int = TaskPriority.BACKGROUND,
+               name: Optional[str] = None, **kwargs) -> TaskHandle:
+        handle = TaskHandle(name or getattr(fn, '__qualname__', 'task'), priority, fn, args, kwargs)
+        
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Task executor has been shut down")
+            
+            self._discard_cancelled()
+            if len(self._queue) >= self._max_queue_size:
+                raise TaskQueueFullError(f"Task queue is full ({self._max_queue_size} pending tasks)")
+            
+            heapq.heappush(self._queue, (int(priority), next(self._counter), handle))
+            if len(self._queue) > self._idle_workers and len(self._threads) < self._max_workers:
+                self._start_worker()
+            self._condition.notify()
+        
+        logger.debug(f"Task {handle.name} submitted with priority {int(priority)}")
+        return handle
+    
+    def pending_count(self) -> int:
+        with self._condition:
+            self._discard_cancelled()
+            return len(self._queue)
+    
+    def shutdown(self, wait: bool = False, cancel_pending: bool = True):
+        with self._condition:
+            self._shutdown = True
+            pending = [entry[2] for entry in self._queue] if cancel_pending else []
+            if cancel_pending:
+                self._queue.clear()
+            self._condition.notify_all()
+        
+        for handle in pending:
+            handle.cancel()
+        
+        if wait:
+            for thread in list(self._threads):
+                thread.join()
+    
+    def _discard_cancelled(self):
+        if any(entry[2].cancelled() for entry in self._queue):
+            self._queue = [entry for entry in self._queue if not entry[2].cancelled()]
+            heapq.heapify(self._queue)
+    
+    def _start_worker(self):
+        thread = threading.Thread(
+            target=self._worker_loop,
+            name=f"TaskExecutor-{len(self._threads) + 1}",
+            daemon=True
+        )
+        self._threads.append(thread)
+        thread.start()
+    
+    def _worker_loop(self):
+        while True:
+            with self._condition:
+                self._idle_workers += 1
+                while not self._queue and not self._shutdown:
+                    self._condition.wait()
+                self._idle_workers -= 1
+                
+                if not self._queue:
+                    return
+                _, _, handle = heapq.heappop(self._queue)
+            
+            handle._run()
+
+
+task_executor = TaskExecutor(
+    max_workers=config_service.get_executor_max_workers(),
+    max_queue_size=config_service.get_executor_queue_size()
+)
@@ -0,0 +1,103 @@
+import random
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.services.config_service import config_service
+from src.services.scan_parser import (FORMAT_IW, FORMAT_NETSH, FORMAT_NMCLI, NMCLI_FIELDS,
+                                      band_of_channel, build_channel_infos, channel_to_frequency,
+                                      parse_scan_output)
+from src.models.data_models import ChannelInfo, NetworkInfo
+from src.utils.logger import logger
+
+
+_IW_INTERFACE = re.compile(r'^\s*Interface\s+(\S+)', re.MULTILINE)
+
+
+def _run(command: List[str]) -> str:
+    result = subprocess.run(
+        command,
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+        errors='replace',
+        timeout=config_service.get_network_timeout()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{command[0]} exited with code {result.returncode}: {result.stderr.strip()}")
+    return result.stdout
+
+
+def _find_iw_interface() -> str:
+    match = _IW_INTERFACE.search(_run(['iw', 'dev']))
+    if not match:
+        raise RuntimeError("No wireless interface found")
+    return match.group(1)
+
+
+def run_scan_command() -> Tuple[str, str]:
+    """执行当前平台的WiFi扫描命令，返回(原始输出, 输出格式)"""
+    if sys.platform == 'win32':
+        return _run(['netsh', 'wlan', 'show', 'networks', 'mode=bssid']), FORMAT_NETSH
+    
+    if shutil.which('nmcli'):
+        command = ['nmcli', '-t', '-f', ','.join(NMCLI_FIELDS), 'device', 'wifi', 'list']
+        return _run(command), FORMAT_NMCLI
+    
+    if shutil.which('iw'):
+        return _run(['iw', 'dev', _find_iw_interface(), 'scan']), FORMAT_IW
+    
+    raise RuntimeError("No supported WiFi scan tool (netsh/nmcli/iw) available")
+
+
+def scan_networks() -> List[NetworkInfo]:
+    """扫描周边网络并解析为NetworkInfo列表"""
+    output, fmt = run_scan_command()
+    networks = parse_scan_output(output.splitlines(), fmt)
+    logger.debug(f"Parsed {len(networks)} BSSIDs from {fmt} output")
+    return networks
+
+
+def build_band_channel_infos(networks: Iterable[NetworkInfo],
+                             bands: Optional[List[str]] = None) -> Dict[str, List[ChannelInfo]]:
+    """将一次扫描的网络按频段拆分，并行聚合为各频段的ChannelInfo列表"""
+    bands = bands or config_service.get_bands()
+    partitions: Dict[str, List[NetworkInfo]] = {band: [] for band in bands}
+    for network in networks:
+        partition = partitions.get(band_of_channel(network.channel))
+        if partition is not None:
+            partition.append(network)
+    
+    with ThreadPoolExecutor(max_workers=len(bands)) as pool:
+        futures = {
+            band: pool.submit(build_channel_infos, partitions[band], band,
+                              config_service.get_channels_for_band(band))
+            for band in bands
+        }
+        return {band: future.result() for band, future in futures.items()}
+
+
+def scan_all_bands() -> Dict[str, List[ChannelInfo]]:
+    """执行一次扫描，同时得到2.4GHz和5GHz的信道信息"""
+    networks = scan_networks()
+    if not networks:
+        raise RuntimeError("No networks found in scan output")
+    return build_band_channel_infos(networks)
+
+
+def simulate_band_channels(band: str) -> List[ChannelInfo]:
+    """无法扫描时为指定频段生成随机的模拟信道数据"""
+    return [
+        ChannelInfo(
+            channel=channel,
+            frequency=channel_to_frequency(channel),
+            band=band,
+            signal_strength=random.randint(-90, -30),
+            occupancy=random.uniform(0, 100),
+            interference=random.uniform(0, 50),
+            networks=[]
+        )
+        for channel in config_service.get_channels_for_band(band)
+    ]
@@ -1,126 +1,90 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QComboBox, QGroupBox, QGridLayout,
-                             QTableWidget, QTableWidgetItem, QHeaderView, QSplitter,
-                             QCheckBox)  # 添加QCheckBox
-from PyQt5.QtCore import Qt, pyqtSignal, QThread, QTimer
+                             QTableView, QHeaderView, QSplitter,
+                             QCheckBox, QTabWidget)  # 添加QCheckBox
+from PyQt5.QtCore import Qt, pyqtSignal, QObject, QTimer
 from PyQt5.QtGui import QFont
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
+import matplotlib
 from src.utils.logger import logger
 from src.utils.exception_handler import exception_handler, handle_exceptions
 from src.services.config_service import config_service
-from src.models.data_models import ChannelInfo
-import random
+from src.services.scan_cache import scan_cache
+from src.services.task_executor import task_executor, TaskPriority, TaskQueueFullError
+from src.managers.channel_scan_manager import channel_scan_manager
+from src.models.history_buffer import ChannelHistoryBuffer
+from src.ui.table_models import ChannelTableModel
+import numpy as np
+import time
+from functools import lru_cache
 
 
-plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei']
-plt.rcParams['axes.unicode_minus'] = False
+@lru_cache(maxsize=None)
+def _setup_chart_fonts():
+    """首次创建图表时再设置中文字体，避免导入模块时修改rcParams"""
+    matplotlib.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei']
+    matplotlib.rcParams['axes.unicode_minus'] = False
 
 
-class ChannelAnalysisWorker(QThread):
-    analysis_completed = pyqtSignal(list, str)
-    error_occurred = pyqtSignal(str)
+class ChannelAnalysisWorker(QObject):
+    """ChannelScanManager的Qt适配层：在任务线程中扫描，以信号回报各频段的信道数据"""
     
-    def __init__(self, band):
-        super().__init__()
-        self.band = band
+    bands_completed = pyqtSignal(dict)
+    error_occurred = pyqtSignal(str)
     
     def run(self):
         try:
-            channels = self._scan_channels()
-            self.analysis_completed.emit(channels, self.band)
+            results = self._scan_all_bands()
+            self.bands_completed.emit(results)
         except Exception as e:
             logger.error(f"Channel analysis failed: {e}", exc_info=True)
             self.error_occurred.emit(str(e))
     
-    def _scan_channels(self) -> list:
-        try:
-            import subprocess
-            import re
-            
-            result = subprocess.run(
-                ['netsh', 'wlan', 'show', 'networks', 'mode=bssid'],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                timeout=config_service.get_network_timeout()
-            )
-            
-            channels_data = []
-            
-            if self.band == "2.4GHz":
-                channel_list = config_service.get_channels_2_4ghz()
-            else:
-                channel_list = config_service.get_channels_5ghz()
-            
-            for channel in channel_list:
-                channel_info = ChannelInfo(
-                    channel=channel,
-                    frequency=self._get_frequency(channel, self.band),
-                    band=self.band,
-                    signal_strength=random.randint(-90, -30),
-                    occupancy=random.uniform(0, 100),
-                    interference=random.uniform(0, 50),
-                    networks=[]
-                )
-                channels_data.append(channel_info)
-            
-            return channels_data
-        except Exception as e:
-            logger.warning(f"Channel scan failed, using simulated data: {e}")
-            return self._generate_simulated_data()
-    
-    def _get_frequency(self, channel: int, band: str) -> float:
-        if band == "2.4GHz":
-            return 2.412 + (channel - 1) * 0.005
-        else:
-            if channel <= 48:
-                return 5.18 + (channel - 36) * 0.02
-            elif channel <= 144:
-                return 5.26 + (channel - 52) * 0.02
-            else:
-                return 5.745 + (channel - 149) * 0.02
-    
-    def _generate_simulated_data(self) -> list:
-        if self.band == "2.4GHz":
-            channel_list = config_service.get_channels_2_4ghz()
-        else:
-            channel_list = config_service.get_channels_5ghz()
-        
-        channels_data = []
-        for channel in channel_list:
-            channel_info = ChannelInfo(
-                channel=channel,
-                frequency=self._get_frequency(channel, self.band),
-                band=self.band,
-                signal_strength=random.randint(-90, -30),
-                occupancy=random.uniform(0, 100),
-                interference=random.uniform(0, 50),
-                networks=[]
-            )
-            channels_data.append(channel_info)
-        
-        return channels_data
+    def _scan_all_bands(self) -> dict:
+        """一次扫描同时生成所有频段的信道数据"""
+        return channel_scan_manager.scan().bands
 
 
 class ChannelChartWidget(FigureCanvas):
     def __init__(self, parent=None, width=5, height=4, dpi=100):
+        _setup_chart_fonts()
         self.fig = Figure(figsize=(width, height), dpi=dpi)
         self.axes = self.fig.add_subplot(111)
         super().__init__(self.fig)
         self.setParent(parent)
         self._channels = []
+        self._channel_key = None
+        self._occupancy_bars = []
+        self._interference_bars = []
+        self._background = None
+        self.mpl_connect('draw_event', self._on_draw)
     
     def update_chart(self, channels: list):
         self._channels = channels
-        self.axes.clear()
         
         if not channels:
-            self.draw()
+            self.clear_chart()
             return
         
+        # 信道集合变化时才重建坐标轴和布局，否则只更新柱高并局部重绘
+        channel_key = tuple(ch.channel for ch in channels)
+        if channel_key != self._channel_key or self._background is None:
+            self._rebuild_chart(channels, channel_key)
+            return
+        
+        for bar, channel in zip(self._occupancy_bars, channels):
+            bar.set_height(channel.occupancy)
+        for bar, channel in zip(self._interference_bars, channels):
+            bar.set_height(channel.interference)
+        
+        self.restore_region(self._background)
+        self._draw_bars()
+        self.blit(self.axes.bbox)
+    
+    def _rebuild_chart(self, channels: list, channel_key: tuple):
+        self.axes.clear()
+        
         channel_nums = [ch.channel for ch in channels]
         occupancies = [ch.occupancy for ch in channels]
         interferences = [ch.interference for ch in channels]
@@ -128,10 +92,13 @@ class ChannelChartWidget(FigureCanvas):
         x = range(len(channel_nums))
         width = 0.35
         
+        # 柱状图设为动画对象，由blit单独绘制，不进入缓存的背景
         bars1 = self.axes.bar([i - width/2 for i in x], occupancies, width, 
-                             label='占用率 (%)', color='#3498db', alpha=0.7)
+                             label='占用率 (%)', color='#3498db', alpha=0.7, animated=True)
         bars2 = self.axes.bar([i + width/2 for i in x], interferences, width, 
-                             label='干扰 (%)', color='#e74c3c', alpha=0.7)
+                             label='干扰 (%)', color='#e74c3c', alpha=0.7, animated=True)
+        self._occupancy_bars = list(bars1)
+        self._interference_bars = list(bars2)
         
         self.axes.set_xlabel('信道')
         self.axes.set_ylabel('百分比 (%)')
@@ -143,21 +110,155 @@ class ChannelChartWidget(FigureCanvas):
         self.axes.set_ylim(0, 100)
         
         self.fig.tight_layout()
+        self._channel_key = channel_key
         self.draw()
     
+    def _on_draw(self, event):
+        """完整重绘(含窗口缩放)后重新缓存背景，并补绘动画柱"""
+        if not self._occupancy_bars:
+            self._background = None
+            return
+        
+        self._background = self.copy_from_bbox(self.axes.bbox)
+        self._draw_bars()
+    
+    def _draw_bars(self):
+        for bar in self._occupancy_bars:
+            self.axes.draw_artist(bar)
+        for bar in self._interference_bars:
+            self.axes.draw_artist(bar)
+    
     def clear_chart(self):
         self.axes.clear()
+        self._channel_key = None
+        self._occupancy_bars = []
+        self._interference_bars = []
         self.draw()
 
 
+class ChannelWaterfallWidget(FigureCanvas):
+    """信道占用/干扰随时间变化的瀑布图，数据来自固定容量的环形缓冲区"""
+    
+    METRIC_NAMES = {
+        'occupancy': '占用率',
+        'interference': '干扰',
+    }
+    
+    def __init__(self, parent=None, width=5, height=4, dpi=100, history_size=300):
+        _setup_chart_fonts()
+        self.fig = Figure(figsize=(width, height), dpi=dpi)
+        self.axes = self.fig.add_subplot(111)
+        super().__init__(self.fig)
+        self.setParent(parent)
+        self._history_size = history_size
+        self._buffers = {}
+        self._band = None
+        self._metric = 'occupancy'
+        self._display = None
+        self._image = None
+        self._colorbar = None
+        self._background = None
+        self.mpl_connect('draw_event', self._on_draw)
+    
+    def append_scan(self, results: dict):
+        """记录一次双频扫描结果，并刷新当前频段的瀑布图"""
+        timestamp_ns = time.time_ns()
+        for band, channels in results.items():
+            channel_key = tuple(ch.channel for ch in channels)
+            buffer = self._buffers.get(band)
+            if buffer is None or buffer.channels != channel_key:
+                buffer = ChannelHistoryBuffer(channel_key, self._history_size)
+                self._buffers[band] = buffer
+                if band == self._band:
+                    self._image = None
+            buffer.append(channels, timestamp_ns)
+        
+        self._refresh()
+    
+    def set_band(self, band: str):
+        if band != self._band:
+            self._band = band
+            self._image = None
+        self._refresh()
+    
+    def set_metric(self, metric: str):
+        if metric != self._metric:
+            self._metric = metric
+            self._image = None
+        self._refresh()
+    
+    def _refresh(self):
+        buffer = self._buffers.get(self._band)
+        if buffer is None:
+            return
+        
+        if self._image is None:
+            self._rebuild(buffer)
+            return
+        
+        # 图像数据原地更新，仅重绘图像区域
+        buffer.ordered(self._metric, self._display)
+        self._image.set_data(self._display)
+        if self._background is None:
+            self.draw_idle()
+            return
+        
+        self.restore_region(self._background)
+        self.axes.draw_artist(self._image)
+        self.blit(self.axes.bbox)
+    
+    def _rebuild(self, buffer: ChannelHistoryBuffer):
+        if self._colorbar is not None:
+            self._colorbar.remove()
+            self._colorbar = None
+        self.axes.clear()
+        
+        self._display = np.full((buffer.capacity, len(buffer.channels)), np.nan, dtype=np.float32)
+        buffer.ordered(self._metric, self._display)
+        
+        self._image = self.axes.imshow(
+            self._display,
+            aspect='auto',
+            interpolation='nearest',
+            cmap='inferno',
+            vmin=0,
+            vmax=100,
+            animated=True
+        )
+        self._colorbar = self.fig.colorbar(self._image, ax=self.axes)
+        metric_name = self.METRIC_NAMES[self._metric]
+        self._colorbar.set_label(f'{metric_name} (%)')
+        
+        self.axes.set_xticks(range(len(buffer.channels)))
+        self.axes.set_xticklabels(buffer.channels, rotation=45, ha='right')
+        self.axes.set_xlabel('信道')
+        self.axes.set_ylabel('扫描次数 (最新在上)')
+        self.axes.set_title(f'{self._band} 信道{metric_name}瀑布图')
+        
+        self.fig.tight_layout()
+        self.draw()
+    
+    def _on_draw(self, event):
+        if self._image is None:
+            self._background = None
+            return
+        
+        self._background = self.copy_from_bbox(self.axes.bbox)
+        self.axes.draw_artist(self._image)
+
+
 class ChannelAnalysisPanel(QWidget):
     analysis_completed = pyqtSignal(str)
     
     def __init__(self):
         super().__init__()
         self._worker = None
+        self._task = None
         self._current_band = "2.4GHz"
         self._channels = []
+        self._band_channels = {}
+        self._scanned_at = None
+        self._from_cache = False
         self._setup_ui()
         self._setup_timer()
         logger.info("Channel analysis panel initialized")
@@ -212,10 +313,21 @@ class ChannelAnalysisPanel(QWidget):
         self.auto_refresh_check.setToolTip("启用实时信道检测")
         self.auto_refresh_check.stateChanged.connect(self._on_auto_refresh_toggled)
         
+        # 缓存状态提示与强制刷新
+        self.cache_label = QLabel("")
+        self.cache_label.setFont(QFont("Arial", 9))
+        self.cache_label.setStyleSheet("color: #7f8c8d;")
+        
+        self.force_refresh_button = QPushButton("强制刷新")
+        self.force_refresh_button.setToolTip("忽略缓存，重新扫描当前频段")
+        self.force_refresh_button.clicked.connect(self._force_refresh)
+        
         control_layout.addWidget(band_label)
         control_layout.addWidget(self.band_combo)
         control_layout.addWidget(self.scan_button)
+        control_layout.addWidget(self.force_refresh_button)
         control_layout.addStretch()
+        control_layout.addWidget(self.cache_label)
         control_layout.addWidget(self.auto_refresh_check)
         
         parent_layout.addWidget(control_group)
@@ -224,23 +336,55 @@ class ChannelAnalysisPanel(QWidget):
         chart_group = QGroupBox("信道占用图表")
         chart_layout = QVBoxLayout(chart_group)
         
+        self.chart_tabs = QTabWidget()
+        
         self.chart_widget = ChannelChartWidget(self, width=10, height=5, dpi=100)
-        chart_layout.addWidget(self.chart_widget)
+        self.chart_tabs.addTab(self.chart_widget, "当前快照")
+        
+        # 瀑布图：信道 × 时间的历史热力图
+        waterfall_page = QWidget()
+        waterfall_layout = QVBoxLayout(waterfall_page)
+        waterfall_layout.setContentsMargins(0, 0, 0, 0)
+        
+        metric_layout = QHBoxLayout()
+        metric_label = QLabel("指标:")
+        metric_label.setFont(QFont("Arial", 10))
+        self.waterfall_metric_combo = QComboBox()
+        self.waterfall_metric_combo.addItem("占用率", "occupancy")
+        self.waterfall_metric_combo.addItem("干扰", "interference")
+        self.waterfall_metric_combo.currentIndexChanged.connect(self._on_waterfall_metric_changed)
+        metric_layout.addWidget(metric_label)
+        metric_layout.addWidget(self.waterfall_metric_combo)
+        metric_layout.addStretch()
+        
+        self.waterfall_widget = ChannelWaterfallWidget(
+            self, width=10, height=5, dpi=100,
+            history_size=config_service.get_waterfall_history_size()
+        )
+        waterfall_layout.addLayout(metric_layout)
+        waterfall_layout.addWidget(self.waterfall_widget)
+        self.chart_tabs.addTab(waterfall_page, "瀑布图")
+        
+        chart_layout.addWidget(self.chart_tabs)
         
         return chart_group
     
+    def _on_waterfall_metric_changed(self, index: int):
+        self.waterfall_widget.set_metric(self.waterfall_metric_combo.itemData(index))
+    
     def _create_table_section(self) -> QWidget:
         table_group = QGroupBox("信道详情")
         table_layout = QVBoxLayout(table_group)
         
-        self.channel_table = QTableWidget()
-        self.channel_table.setColumnCount(6)
-        self.channel_table.setHorizontalHeaderLabels([
-            "信道", "频率(GHz)", "信号强度(dBm)", "占用率(%)", "干扰(%)", "质量评分"
-        ])
+        self.channel_table = QTableView()
+        self.channel_model = ChannelTableModel(self.channel_table)
+        self.channel_table.setModel(self.channel_model)
         self.channel_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.channel_table.verticalHeader().setVisible(False)
         self.channel_table.setAlternatingRowColors(True)
-        self.channel_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.channel_table.setSelectionBehavior(QTableView.SelectRows)
+        self.channel_table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        self.channel_table.setSortingEnabled(True)
         
         table_layout.addWidget(self.channel_table)
         
@@ -250,34 +394,69 @@ class ChannelAnalysisPanel(QWidget):
         self._refresh_timer = QTimer()
         self._refresh_timer.timeout.connect(self._auto_refresh)
         self._auto_refresh_enabled = False
+        
+        self._cache_label_timer = QTimer()
+        self._cache_label_timer.timeout.connect(self._update_cache_label)
+        self._cache_label_timer.start(config_service.get_refresh_interval())
     
     @handle_exceptions(show_dialog=True)
     def _start_scan(self, *args):
-        if self._worker and self._worker.isRunning():
+        self._submit_scan()
+    
+    def _submit_scan(self):
+        """提交扫描任务；任务队列已满时抛出TaskQueueFullError"""
+        if self.is_scanning():
             return
         
+        worker = ChannelAnalysisWorker()
+        worker.bands_completed.connect(self._on_analysis_completed)
+        worker.error_occurred.connect(self._on_error)
+        self._task = task_executor.submit(worker.run, priority=TaskPriority.SCAN, name="channel-scan")
+        self._worker = worker
+        
         self.scan_button.setEnabled(False)
         self.scan_button.setText("扫描中...")
         
-        self._worker = ChannelAnalysisWorker(self._current_band)
-        self._worker.analysis_completed.connect(self._on_analysis_completed)
-        self._worker.error_occurred.connect(self._on_error)
-        self._worker.start()
-        
         logger.info(f"Channel scan started for {self._current_band}")
     
     def _on_band_changed(self, band: str):
         self._current_band = band
+        if not self._load_from_cache(band):
+            self._start_scan()
+    
+    def _load_from_cache(self, band: str) -> bool:
+        cached = scan_cache.get(band)
+        if cached is None:
+            return False
+        
+        channels, age = cached
+        self._show_channels(channels, band, time.time() - age, from_cache=True)
+        logger.info(f"Loaded {band} channels from cache ({age:.0f}s old)")
+        return True
+    
+    def _force_refresh(self):
+        scan_cache.invalidate(self._current_band)
         self._start_scan()
     
-    def _on_analysis_completed(self, channels: list, band: str):
+    def _show_channels(self, channels: list, band: str, scanned_at: float, from_cache: bool):
         self._channels = channels
+        self._scanned_at = scanned_at
+        self._from_cache = from_cache
         self._update_chart(channels)
         self._update_table(channels)
-        self._reset_ui()
+        self._update_cache_label()
+        self.waterfall_widget.set_band(band)
         
         self.analysis_completed.emit(band)
-        logger.info(f"Channel analysis completed for {band}: {len(channels)} channels")
+    
+    def _update_cache_label(self):
+        if self._scanned_at is None:
+            self.cache_label.setText("")
+            return
+        
+        age = int(time.time() - self._scanned_at)
+        source = "缓存" if self._from_cache else "实时扫描"
+        self.cache_label.setText(f"数据来源: {source}（{age} 秒前）")
     
     def _on_error(self, error_message: str):
         self._reset_ui()
@@ -287,26 +466,8 @@ class ChannelAnalysisPanel(QWidget):
         self.chart_widget.update_chart(channels)
     
     def _update_table(self, channels: list):
-        self.channel_table.setRowCount(len(channels))
-        
-        for row, channel in enumerate(channels):
-            self.channel_table.setItem(row, 0, QTableWidgetItem(str(channel.channel)))
-            self.channel_table.setItem(row, 1, QTableWidgetItem(f"{channel.frequency:.3f}"))
-            self.channel_table.setItem(row, 2, QTableWidgetItem(str(channel.signal_strength)))
-            self.channel_table.setItem(row, 3, QTableWidgetItem(f"{channel.occupancy:.1f}"))
-            self.channel_table.setItem(row, 4, QTableWidgetItem(f"{channel.interference:.1f}"))
-            
-            quality_score = channel.get_quality_score()
-            quality_item = QTableWidgetItem(f"{quality_score:.1f}")
-            
-            if quality_score >= 80:
-                quality_item.setBackground(Qt.green)
-            elif quality_score >= 60:
-                quality_item.setBackground(Qt.yellow)
-            else:
-                quality_item.setBackground(Qt.red)
-            
-            self.channel_table.setItem(row, 5, quality_item)
+        # 模型只对数值变化的行发出dataChanged
+        self.channel_model.set_channels(channels)
     
     def _reset_ui(self):
         self.scan_button.setEnabled(True)
@@ -328,24 +489,49 @@ class ChannelAnalysisPanel(QWidget):
             return
         
         # 只有当没有其他扫描任务正在运行时才执行自动刷新
-        if not (self._worker and self._worker.isRunning()):
+        if not self.is_scanning():
             logger.debug(f"Auto refreshing channel analysis for {self._current_band}")
-            self._start_scan()
+            try:
+                self._submit_scan()
+            except TaskQueueFullError as e:
+                # 定时刷新不弹出对话框，跳过本次刷新，下一个周期再试
+                logger.warning(f"Auto refresh skipped: {e}")
     
     scan_completed = pyqtSignal()
     
     def refresh(self):
         self._start_scan()
     
-    def get_channels(self) -> list:
-        return self._channels
+    def is_scanning(self) -> bool:
+        return self._task is not None and not self._task.done()
     
-    def _on_analysis_completed(self, channels: list, band: str):
-        self._channels = channels
-        self._update_chart(channels)
-        self._update_table(channels)
+    def select_band(self, band: str):
+        """切换频段，有未过期的缓存时直接显示缓存数据"""
+        if self.band_combo.currentText() != band:
+            self.band_combo.setCurrentText(band)
+        elif not self._channels:
+            self._on_band_changed(band)
+    
+    def get_channels(self, band: str = None) -> list:
+        """获取信道数据，指定频段时返回该频段最近一次双频扫描的结果"""
+        if band is None or band == self._current_band:
+            return self._channels
+        
+        cached = scan_cache.get(band)
+        if cached is not None:
+            return cached[0]
+        return self._band_channels.get(band, [])
+    
+    def _on_analysis_completed(self, results: dict):
+        scan_cache.put_many(results)
+        self._band_channels.update(results)
+        self.waterfall_widget.append_scan(results)
         self._reset_ui()
         
-        self.analysis_completed.emit(band)
-        self.scan_completed.emit()  # 发送扫描完成信号
-        logger.info(f"Channel analysis completed for {band}: {len(channels)} channels")
\ No newline at end of file
+        band = self._current_band
+        channels = results.get(band, [])
+        self._show_channels(channels, band, time.time(), from_cache=False)
+        # 只有实际扫描才发送扫描完成信号，缓存数据不当作新的扫描结果
+        self.scan_completed.emit()
+        logger.info(f"Channel analysis completed for {', '.join(results)}: "
+                    f"{len(channels)} channels in {band}")
\ No newline at end of file
@@ -1,18 +1,22 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QTabWidget, QStatusBar, QMenuBar, QAction, 
-                             QMessageBox, QSplitter, QSizePolicy)
-from PyQt5.QtCore import Qt, pyqtSignal
+                             QMessageBox, QSplitter, QSizePolicy, QLabel)
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QIcon
-from src.ui.channel_analysis_panel import ChannelAnalysisPanel
-from src.ui.recommend_panel import RecommendPanel
 from src.utils.logger import logger
 from src.utils.exception_handler import exception_handler
 from src.services.config_service import config_service
+from src.services.task_executor import task_executor
+import time
 
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
+        # 面板依赖matplotlib等较重的模块，各标签页首次显示时才导入和创建
+        self.channel_analysis_panel = None
+        self.recommend_panel = None
+        self._panels_wired = False
         self._setup_ui()
         self._connect_signals()
         logger.info("Main window initialized")
@@ -66,17 +70,73 @@ class MainWindow(QMainWindow):
         self.tab_widget.setTabPosition(QTabWidget.North)
         self.tab_widget.setMovable(False)
         
-        self.channel_analysis_panel = ChannelAnalysisPanel()
-        self.recommend_panel = RecommendPanel()
-        
-        self.recommend_panel.set_analysis_panel(self.channel_analysis_panel)
-        
-        self.tab_widget.addTab(self.channel_analysis_panel, "信道分析")
-        self.tab_widget.addTab(self.recommend_panel, "信道推荐")
+        # 每个标签页先放占位控件，首次切换到该页时才由工厂函数创建面板
+        self._tab_factories = [
+            ("信道分析", self._create_channel_analysis_panel),
+            ("信道推荐", self._create_recommend_panel),
+        ]
+        for title, _ in self._tab_factories:
+            self.tab_widget.addTab(self._create_placeholder(), title)
         
         layout.addWidget(self.tab_widget)
+    
+    def _create_placeholder(self) -> QWidget:
+        placeholder = QLabel("正在加载...")
+        placeholder.setAlignment(Qt.AlignCenter)
+        placeholder.setStyleSheet("color: #7f8c8d;")
+        placeholder.setProperty("placeholder", True)
+        return placeholder
+    
+    def _ensure_tab(self, index: int) -> QWidget:
+        """返回指定标签页的面板，仍是占位控件时先创建面板并替换"""
+        widget = self.tab_widget.widget(index)
+        if widget is None or not widget.property("placeholder"):
+            return widget
+        
+        title, factory = self._tab_factories[index]
+        start = time.perf_counter()
+        panel = factory()
+        
+        # 替换过程中屏蔽currentChanged，避免移除占位页时触发其他标签页的创建
+        self.tab_widget.blockSignals(True)
+        try:
+            self.tab_widget.removeTab(index)
+            self.tab_widget.insertTab(index, panel, title)
+            self.tab_widget.setCurrentIndex(index)
+        finally:
+            self.tab_widget.blockSignals(False)
+        widget.deleteLater()
+        
+        self._wire_panels()
+        logger.info(f"Tab '{title}' created in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return panel
+    
+    def _create_channel_analysis_panel(self) -> QWidget:
+        from src.ui.channel_analysis_panel import ChannelAnalysisPanel
         
+        self.channel_analysis_panel = ChannelAnalysisPanel()
         self.channel_analysis_panel.analysis_completed.connect(self._on_analysis_completed)
+        return self.channel_analysis_panel
+    
+    def _create_recommend_panel(self) -> QWidget:
+        from src.ui.recommend_panel import RecommendPanel
+        
+        self.recommend_panel = RecommendPanel()
+        return self.recommend_panel
+    
+    def _wire_panels(self):
+        """两个面板都创建后再连接推荐面板与信道分析面板(含scan_completed信号)"""
+        if self.channel_analysis_panel is None or self.recommend_panel is None or self._panels_wired:
+            return
+        
+        self.recommend_panel.set_analysis_panel(self.channel_analysis_panel)
+        self._panels_wired = True
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.tab_widget.currentWidget().property("placeholder"):
+            # 窗口框架绘制后再创建当前标签页
+            QTimer.singleShot(0, lambda: self._ensure_tab(self.tab_widget.currentIndex()))
     
     def _create_status_bar(self):
         self.status_bar = QStatusBar()
@@ -87,9 +147,9 @@ class MainWindow(QMainWindow):
         self.tab_widget.currentChanged.connect(self._on_tab_changed)
     
     def _on_tab_changed(self, index):
-        tab_names = ["信道分析", "信道推荐"]
-        if 0 <= index < len(tab_names):
-            self.status_bar.showMessage(f"当前标签: {tab_names[index]}")
+        if 0 <= index < len(self._tab_factories):
+            self._ensure_tab(index)
+            self.status_bar.showMessage(f"当前标签: {self._tab_factories[index][0]}")
     
     def _on_analysis_completed(self, band):
         self.status_bar.showMessage(f"信道分析完成: {band}")
@@ -98,8 +158,10 @@ class MainWindow(QMainWindow):
         current_tab = self.tab_widget.currentIndex()
         
         if current_tab == 0:
+            self._ensure_tab(current_tab)
             self.channel_analysis_panel.refresh()
         elif current_tab == 1:
+            self._ensure_tab(current_tab)
             self.recommend_panel.refresh()
         
         self.status_bar.showMessage("已刷新")
@@ -133,6 +195,7 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
+            task_executor.shutdown()
             logger.info("Application closed by user")
             event.accept()
         else:
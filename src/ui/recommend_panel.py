@@ -1,227 +1,65 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QGroupBox, QGridLayout, QScrollArea,
-                             QFrame, QProgressBar, QTableWidget, QTableWidgetItem,
+                             QFrame, QProgressBar, QTableView,
                              QHeaderView, QSplitter)
-from PyQt5.QtCore import Qt, pyqtSignal, QThread, QTimer
+from PyQt5.QtCore import Qt, pyqtSignal, QObject, QTimer
 from PyQt5.QtGui import QFont, QPixmap
 from src.utils.logger import logger
 from src.utils.exception_handler import exception_handler, handle_exceptions
 from src.services.config_service import config_service
-from src.models.data_models import ChannelRecommendation, ChannelInfo, ChannelTestData
-from src.ui.channel_analysis_panel import ChannelAnalysisPanel
-import random
-from datetime import datetime
-import statistics
+from src.services.task_executor import task_executor, TaskPriority
+from src.managers.recommendation_manager import AnalysisCancelled, RecommendationManager
+from src.models.data_models import ChannelRecommendation, ChannelInfo
+from src.ui.table_models import TestDataTableModel
+import threading
+from typing import TYPE_CHECKING, Optional
 
+if TYPE_CHECKING:
+    from src.ui.channel_analysis_panel import ChannelAnalysisPanel
 
-class RecommendWorker(QThread):
+
+class RecommendWorker(QObject):
+    """RecommendationManager的Qt适配层：在任务线程中运行推荐流程，以信号回报结果和进度"""
+    
     recommendation_completed = pyqtSignal(object)
+    analysis_cancelled = pyqtSignal(object)
     error_occurred = pyqtSignal(str)
-    progress_updated = pyqtSignal(int)
+    progress_updated = pyqtSignal(int, float, float)
     
-    def __init__(self, channels: list):
+    def __init__(self, channels: list, checkpoint: dict = None):
         super().__init__()
         self.channels = channels
+        self.band = channels[0].band if channels else None
+        # 本次续测使用的检查点，全新分析时为None
+        self.checkpoint = checkpoint
+        self._manager = RecommendationManager()
+        self._cancel_event = threading.Event()
+    
+    def cancel(self):
+        """请求停止分析，在下一个信道开始前生效"""
+        self._cancel_event.set()
     
     def run(self):
         try:
-            recommendation = self._analyze_and_recommend()
+            recommendation = self._manager.recommend(
+                self.channels,
+                config_service.get_test_count(),
+                checkpoint=self.checkpoint,
+                cancel_event=self._cancel_event,
+                progress_callback=self.progress_updated.emit
+            )
             self.recommendation_completed.emit(recommendation)
+        except AnalysisCancelled as e:
+            completed = len(e.checkpoint['channel_test_results'])
+            logger.info(f"Recommendation cancelled after {completed}/{len(self.channels)} channels")
+            self.analysis_cancelled.emit(e.checkpoint)
         except Exception as e:
             logger.error(f"Recommendation failed: {e}", exc_info=True)
             self.error_occurred.emit(str(e))
-    
-    def _analyze_and_recommend(self) -> ChannelRecommendation:
-        if not self.channels:
-            raise ValueError("No channel data available")
-        
-        # 获取配置的测试次数
-        test_count = config_service.get_test_count()
-        
-        # 对每个信道执行指定次数的测试
-        channel_test_results = {}
-        total_tests = len(self.channels) * test_count
-        current_test = 0
-        
-        for channel_info in self.channels:
-            test_data_list = []
-            for i in range(test_count):
-                # 模拟测试数据采集
-                test_data = self._perform_channel_test(channel_info)
-                test_data_list.append(test_data)
-                
-                # 更新进度
-                current_test += 1
-                progress = int((current_test / total_tests) * 100)
-                self.progress_updated.emit(progress)
-            
-            channel_test_results[channel_info.channel] = {
-                'channel_info': channel_info,
-                'test_data': test_data_list,
-                'analysis': self._analyze_test_data(test_data_list)
-            }
-        
-        # 使用加权算法评估各信道
-        best_channel_data = self._evaluate_channels(channel_test_results)
-        best_channel_info = best_channel_data['channel_info']
-        test_data = best_channel_data['test_data']
-        analysis = best_channel_data['analysis']
-        
-        quality_score = self._calculate_weighted_score(analysis)
-        
-        reason, improvement = self._generate_recommendation_details(analysis, quality_score)
-        
-        return ChannelRecommendation(
-            channel=best_channel_info.channel,
-            band=best_channel_info.band,
-            quality_score=quality_score,
-            reason=reason,
-            expected_improvement=improvement,
-            test_data=test_data,
-            analysis_details=analysis
-        )
-    
-    def _perform_channel_test(self, channel_info: ChannelInfo) -> ChannelTestData:
-        """执行单个信道测试"""
-        # 基于信道信息生成合理的测试数据
-        base_rssi = channel_info.signal_strength
-        base_occupancy = channel_info.occupancy
-        base_interference = channel_info.interference
-        
-        # 添加随机波动
-        rssi = base_rssi + random.randint(-5, 5)
-        snr = (rssi + 100) * random.uniform(0.8, 1.2)
-        
-        if channel_info.band == "2.4GHz":
-            bandwidth = 20.0
-            max_throughput = 72.2
-        else:
-            bandwidth = 80.0
-            max_throughput = 433.3
-        
-        # 基于占用率和干扰计算吞吐量
-        throughput_factor = 1.0 - (base_occupancy + base_interference) / 200.0
-        throughput = max_throughput * throughput_factor * random.uniform(0.7, 1.0)
-        
-        # 基于干扰计算丢包率
-        packet_loss = (base_interference / 100.0) * random.uniform(0.5, 1.5)
-        packet_loss = min(packet_loss, 10.0)
-        
-        return ChannelTestData(
-            channel=channel_info.channel,
-            band=channel_info.band,
-            rssi=rssi,
-            snr=snr,
-            bandwidth=bandwidth,
-            throughput=throughput,
-            packet_loss=packet_loss,
-            timestamp=datetime.now()
-        )
-    
-    def _analyze_test_data(self, test_data_list: list) -> dict:
-        """分析测试数据"""
-        rssi_values = [td.rssi for td in test_data_list]
-        snr_values = [td.snr for td in test_data_list]
-        throughput_values = [td.throughput for td in test_data_list]
-        packet_loss_values = [td.packet_loss for td in test_data_list]
-        
-        return {
-            'avg_rssi': statistics.mean(rssi_values),
-            'std_rssi': statistics.stdev(rssi_values) if len(rssi_values) > 1 else 0,
-            'avg_snr': statistics.mean(snr_values),
-            'std_snr': statistics.stdev(snr_values) if len(snr_values) > 1 else 0,
-            'avg_throughput': statistics.mean(throughput_values),
-            'std_throughput': statistics.stdev(throughput_values) if len(throughput_values) > 1 else 0,
-            'avg_packet_loss': statistics.mean(packet_loss_values),
-            'std_packet_loss': statistics.stdev(packet_loss_values) if len(packet_loss_values) > 1 else 0,
-            'max_throughput': max(throughput_values),
-            'min_packet_loss': min(packet_loss_values),
-            'consistency_score': self._calculate_consistency_score(rssi_values, throughput_values, packet_loss_values)
-        }
-    
-    def _calculate_consistency_score(self, rssi_values, throughput_values, packet_loss_values) -> float:
-        """计算一致性评分"""
-        rssi_std = statistics.stdev(rssi_values) if len(rssi_values) > 1 else 0
-        throughput_std = statistics.stdev(throughput_values) if len(throughput_values) > 1 else 0
-        packet_loss_std = statistics.stdev(packet_loss_values) if len(packet_loss_values) > 1 else 0
-        
-        # 标准差越小，一致性越高
-        consistency = 100.0
-        consistency -= min(rssi_std * 2, 30)
-        consistency -= min(throughput_std * 0.1, 30)
-        consistency -= min(packet_loss_std * 5, 30)
-        
-        return max(0.0, consistency)
-    
-    def _evaluate_channels(self, channel_test_results: dict) -> dict:
-        """评估所有信道并选择最优的"""
-        best_score = -1
-        best_channel_data = None
-        
-        for channel_data in channel_test_results.values():
-            score = self._calculate_weighted_score(channel_data['analysis'])
-            if score > best_score:
-                best_score = score
-                best_channel_data = channel_data
-        
-        return best_channel_data
-    
-    def _calculate_weighted_score(self, analysis: dict) -> float:
-        """计算加权评分"""
-        # 权重定义
-        weights = {
-            'rssi': 0.25,      # 信号强度
-            'snr': 0.2,         # 信噪比
-            'throughput': 0.3,  # 传输速率
-            'packet_loss': 0.15, # 丢包率
-            'consistency': 0.1  # 一致性
-        }
-        
-        # 计算各项得分
-        rssi_score = min((analysis.get('avg_rssi', -100) + 100) * 1.0, 100)
-        snr_score = min(analysis.get('avg_snr', 0), 100)
-        throughput_score = min(analysis.get('avg_throughput', 0) / 500 * 100, 100)  # 假设最大500Mbps
-        packet_loss_score = max(100 - analysis.get('avg_packet_loss', 10) * 10, 0)
-        consistency_score = analysis.get('consistency_score', 0)
-        
-        # 计算加权总分
-        total_score = (
-            rssi_score * weights['rssi'] +
-            snr_score * weights['snr'] +
-            throughput_score * weights['throughput'] +
-            packet_loss_score * weights['packet_loss'] +
-            consistency_score * weights['consistency']
-        )
-        
-        return max(0.0, min(100.0, total_score))
-    
-    def _generate_recommendation_details(self, analysis: dict, quality_score: float) -> tuple:
-        """生成推荐理由和预期改善"""
-        if quality_score >= 80:
-            reason = f"该信道信号强度良好（平均RSSI: {analysis.get('avg_rssi', -100):.1f}dBm），"
-            reason += f"信噪比高（平均SNR: {analysis.get('avg_snr', 0):.1f}dB），"
-            reason += f"传输速率快（平均: {analysis.get('avg_throughput', 0):.1f}Mbps），"
-            reason += f"丢包率低（平均: {analysis.get('avg_packet_loss', 10):.1f}%），"
-            reason += f"网络稳定性好（一致性评分: {analysis.get('consistency_score', 0):.1f}）"
-            improvement = "预期网络质量提升 25-35%"
-        elif quality_score >= 60:
-            reason = f"该信道信号强度适中（平均RSSI: {analysis.get('avg_rssi', -100):.1f}dBm），"
-            reason += f"信噪比合理（平均SNR: {analysis.get('avg_snr', 0):.1f}dB），"
-            reason += f"传输速率良好（平均: {analysis.get('avg_throughput', 0):.1f}Mbps），"
-            reason += f"丢包率可接受（平均: {analysis.get('avg_packet_loss', 10):.1f}%）"
-            improvement = "预期网络质量提升 15-25%"
-        else:
-            reason = f"当前环境所有信道都较为拥挤，"
-            reason += f"该信道相对表现较好（信号强度: {analysis.get('avg_rssi', -100):.1f}dBm，"
-            reason += f"传输速率: {analysis.get('avg_throughput', 0):.1f}Mbps，"
-            reason += f"丢包率: {analysis.get('avg_packet_loss', 10):.1f}%）"
-            improvement = "预期网络质量提升 5-15%"
-        
-        return reason, improvement
 
 
 class TestDataTable(QWidget):
-    def __init__(self, test_data: list):
+    def __init__(self, test_data):
         super().__init__()
         self.test_data = test_data
         self._setup_ui()
@@ -236,14 +74,11 @@ class TestDataTable(QWidget):
         title_label.setStyleSheet("color: #2c3e50;")
         layout.addWidget(title_label)
         
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels([
-            "测试序号", "RSSI (dBm)", "SNR (dB)", 
-            "带宽 (MHz)", "速率 (Mbps)", "丢包率 (%)"
-        ])
+        self.table = QTableView()
+        self.model = TestDataTableModel(self.test_data, self.table)
+        self.table.setModel(self.model)
         # 设置列宽策略，优先适应内容
-        for i in range(self.table.columnCount()):
+        for i in range(self.model.columnCount()):
             if i == 0:  # 测试序号
                 self.table.setColumnWidth(i, 80)
             elif i in [1, 2]:  # RSSI, SNR
@@ -256,35 +91,20 @@ class TestDataTable(QWidget):
                 self.table.setColumnWidth(i, 100)
         # 剩余空间平均分配
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
         self.table.setMinimumHeight(300)  # 设置最小高度
-        
-        self._populate_table()
+        # 模型按需读取单元格，全部测试数据均可浏览；默认按测试序号升序
+        self.table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
         layout.addWidget(self.table)
-    
-    def _populate_table(self):
-        # 限制显示的测试数据行数，最多显示50行，避免UI渲染崩溃
-        max_rows = 50
-        display_data = self.test_data[:max_rows]
-        
-        self.table.setRowCount(len(display_data))
-        
-        for row, test in enumerate(display_data):
-            self.table.setItem(row, 0, QTableWidgetItem(str(row + 1)))
-            self.table.setItem(row, 1, QTableWidgetItem(f"{test.rssi:.1f}"))
-            self.table.setItem(row, 2, QTableWidgetItem(f"{test.snr:.1f}"))
-            self.table.setItem(row, 3, QTableWidgetItem(f"{test.bandwidth:.1f}"))
-            self.table.setItem(row, 4, QTableWidgetItem(f"{test.throughput:.1f}"))
-            self.table.setItem(row, 5, QTableWidgetItem(f"{test.packet_loss:.1f}"))
-        
-        # 如果测试数据超过50行，添加提示信息
-        if len(self.test_data) > max_rows:
-            info_label = QLabel(f"📝 显示前 {max_rows} 条测试数据，共 {len(self.test_data)} 条")
-            info_label.setFont(QFont("Arial", 10))
-            info_label.setAlignment(Qt.AlignCenter)
-            info_label.setStyleSheet("color: #7f8c8d;")
-            self.layout().addWidget(info_label)
+        
+        info_label = QLabel(f"📝 共 {self.model.rowCount()} 条测试数据，点击表头可排序")
+        info_label.setFont(QFont("Arial", 10))
+        info_label.setAlignment(Qt.AlignCenter)
+        info_label.setStyleSheet("color: #7f8c8d;")
+        layout.addWidget(info_label)
 
 
 class AnalysisDetailsPanel(QWidget):
@@ -504,13 +324,15 @@ class RecommendPanel(QWidget):
     def __init__(self):
         super().__init__()
         self._worker = None
+        self._task = None
+        self._checkpoint = None
         self._current_recommendation = None
         self._analysis_panel = None
         self._progress_bar = None
         self._setup_ui()
         logger.info("Recommend panel initialized")
     
-    def set_analysis_panel(self, panel: ChannelAnalysisPanel):
+    def set_analysis_panel(self, panel: 'ChannelAnalysisPanel'):
         self._analysis_panel = panel
         # 连接扫描完成信号
         panel.scan_completed.connect(self._on_channel_scan_completed)
@@ -715,7 +537,58 @@ class RecommendPanel(QWidget):
         """)
         self.apply_button.clicked.connect(lambda: self._apply_recommendation())
         
+        self.stop_button = QPushButton("停止")
+        self.stop_button.setMinimumHeight(50)
+        self.stop_button.setFont(QFont("Arial", 12))
+        self.stop_button.setEnabled(False)
+        self.stop_button.setStyleSheet("""
+            QPushButton {
+                background-color: #e74c3c;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                padding: 10px;
+            }
+            QPushButton:hover {
+                background-color: #c0392b;
+            }
+            QPushButton:pressed {
+                background-color: #a93226;
+            }
+            QPushButton:disabled {
+                background-color: #bdc3c7;
+            }
+        """)
+        self.stop_button.clicked.connect(self._stop_analysis)
+        
+        self.resume_button = QPushButton("继续")
+        self.resume_button.setMinimumHeight(50)
+        self.resume_button.setFont(QFont("Arial", 12))
+        self.resume_button.setEnabled(False)
+        self.resume_button.setToolTip("从上次停止时已完成的信道继续分析")
+        self.resume_button.setStyleSheet("""
+            QPushButton {
+                background-color: #f39c12;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                padding: 10px;
+            }
+            QPushButton:hover {
+                background-color: #d68910;
+            }
+            QPushButton:pressed {
+                background-color: #b9770e;
+            }
+            QPushButton:disabled {
+                background-color: #bdc3c7;
+            }
+        """)
+        self.resume_button.clicked.connect(self._resume_analysis)
+        
         buttons_layout.addWidget(self.analyze_button)
+        buttons_layout.addWidget(self.stop_button)
+        buttons_layout.addWidget(self.resume_button)
         buttons_layout.addWidget(self.apply_button)
         
         # 添加到主控制布局
@@ -826,14 +699,14 @@ class RecommendPanel(QWidget):
     
     @handle_exceptions(show_dialog=True)
     def _start_analysis(self, *args):
-        if self._worker and self._worker.isRunning():
+        if self._is_running():
             return
         
         if not self._analysis_panel:
             exception_handler.show_warning("错误", "请先进行信道分析")
             return
         
-        channels = self._analysis_panel.get_channels()
+        channels = self._analysis_panel.get_channels(self._selected_band())
         if not channels:
             # 显示模态提示框，说明扫描的必要性
             reply = exception_handler.show_question(
@@ -853,18 +726,14 @@ class RecommendPanel(QWidget):
             self._execute_channel_scan()
             return
         
+        self._launch_worker(channels)
+        
         self.analyze_button.setEnabled(False)
         self.analyze_button.setText("分析中...")
         self.apply_button.setEnabled(False)
         self._progress_bar.setValue(0)
         self._progress_label.setText("开始执行信道测试...")
         
-        self._worker = RecommendWorker(channels)
-        self._worker.recommendation_completed.connect(self._on_recommendation_completed)
-        self._worker.error_occurred.connect(self._on_error)
-        self._worker.progress_updated.connect(self._on_progress_updated)
-        self._worker.start()
-        
         test_count = config_service.get_test_count()
         logger.info(f"Recommendation analysis started with {test_count} test sets per channel")
     
@@ -895,7 +764,7 @@ class RecommendPanel(QWidget):
         
         # 检查扫描是否是由推荐面板触发的
         if self.analyze_button.text() == "扫描中...":
-            channels = self._analysis_panel.get_channels()
+            channels = self._analysis_panel.get_channels(self._selected_band())
             if not channels:
                 # 扫描失败，显示错误信息
                 exception_handler.show_warning(
@@ -906,26 +775,127 @@ class RecommendPanel(QWidget):
                 return
             
             # 扫描成功，自动执行分析
+            try:
+                self._launch_worker(channels)
+            except Exception as e:
+                logger.error(f"Failed to start analysis: {e}", exc_info=True)
+                exception_handler.show_warning("推荐失败", str(e))
+                self._reset_ui()
+                return
+            
             self.analyze_button.setText("分析中...")
             self._progress_bar.setValue(0)
             self._progress_label.setText("开始执行信道测试...")
             
-            self._worker = RecommendWorker(channels)
-            self._worker.recommendation_completed.connect(self._on_recommendation_completed)
-            self._worker.error_occurred.connect(self._on_error)
-            self._worker.progress_updated.connect(self._on_progress_updated)
-            self._worker.start()
-            
             logger.info("Auto analysis started after channel scan completion")
     
-
+    def _launch_worker(self, channels: list, checkpoint: dict = None):
+        """创建推荐任务并提交到共享任务执行器"""
+        worker = RecommendWorker(channels, checkpoint)
+        worker.recommendation_completed.connect(self._on_recommendation_completed)
+        worker.analysis_cancelled.connect(self._on_analysis_cancelled)
+        worker.error_occurred.connect(self._on_error)
+        worker.progress_updated.connect(self._on_progress_updated)
+        self._task = task_executor.submit(worker.run, priority=TaskPriority.RECOMMENDATION,
+                                          name="channel-recommendation")
+        self._worker = worker
+        self.stop_button.setEnabled(True)
+        self.resume_button.setEnabled(False)
+    
+    def _stop_analysis(self):
+        """停止正在进行的推荐分析，已完成的信道结果保留为检查点"""
+        if not self._is_running():
+            return
+        
+        self.stop_button.setEnabled(False)
+        self._progress_label.setText("正在停止...")
+        
+        # 仍在排队的任务直接移除，保留的是该任务续测时使用的检查点；运行中的任务在下一个信道前停止
+        if self._task.cancel():
+            checkpoint = self._worker.checkpoint
+            self._finish_task()
+            self._show_stopped(checkpoint)
+        else:
+            self._worker.cancel()
+        
+        logger.info("Recommendation stop requested")
+    
+    @handle_exceptions(show_dialog=True)
+    def _resume_analysis(self, *args):
+        if self._is_running() or not self._analysis_panel or not self._checkpoint:
+            return
+        
+        channels = self._analysis_panel.get_channels(self._selected_band())
+        if not RecommendationManager.is_resumable(self._checkpoint, channels, config_service.get_test_count()):
+            exception_handler.show_warning("无法继续", "信道数据或测试次数已变化，请重新开始分析。")
+            self._checkpoint = None
+            self.resume_button.setEnabled(False)
+            return
+        
+        self._launch_worker(channels, self._checkpoint)
+        
+        self.analyze_button.setEnabled(False)
+        self.analyze_button.setText("分析中...")
+        self.apply_button.setEnabled(False)
+        self._progress_label.setText("从检查点继续信道测试...")
+        
+        logger.info(f"Recommendation resumed with {len(self._checkpoint['channel_test_results'])} channels completed")
+    
+    def _on_analysis_cancelled(self, checkpoint: dict):
+        if self._take_worker() is None:
+            return
+        # 切换频段后收到的取消结果仍作为原频段的检查点保留
+        self._show_stopped(checkpoint)
+    
+    def _show_stopped(self, checkpoint: Optional[dict]):
+        self._checkpoint = checkpoint if checkpoint and checkpoint['channel_test_results'] else None
+        self._reset_ui()
+        
+        if self._checkpoint:
+            completed = len(self._checkpoint['channel_test_results'])
+            total = len(self._checkpoint['channels'])
+            self._progress_label.setText(f"分析已停止，已完成 {completed}/{total} 个信道，可点击\"继续\"恢复")
+        else:
+            self._progress_label.setText("分析已停止")
+    
+    def _is_running(self) -> bool:
+        # 不使用task.done()：任务在工作线程结束时，完成信号可能仍在排队，此时再次启动会产生第二个任务
+        return self._task is not None
+    
+    def _finish_task(self):
+        """在完成、取消或出错的槽函数中清除运行状态"""
+        self._task = None
+        self._worker = None
+    
+    def _take_worker(self) -> Optional[RecommendWorker]:
+        """返回发出信号的当前任务并清除运行状态；来自已结束或被替换的任务的排队信号返回None"""
+        worker = self.sender()
+        if worker is None or worker is not self._worker:
+            return None
+        self._finish_task()
+        return worker
     
-    def _on_progress_updated(self, progress: int):
+    def _on_progress_updated(self, progress: int, rate: float, eta: float):
         """处理进度更新"""
+        if self.sender() is not self._worker:
+            return
         self._progress_bar.setValue(progress)
-        self._progress_label.setText(f"测试进度: {progress}%")
+        self._progress_label.setText(
+            f"测试进度: {progress}%  |  速率: {rate:,.0f} 次/秒  |  预计剩余: {eta:.1f} 秒"
+        )
     
     def _on_recommendation_completed(self, recommendation: ChannelRecommendation):
+        worker = self._take_worker()
+        if worker is None:
+            return
+        if worker.band != self._selected_band():
+            # 切换频段时任务已测完最后一个信道，没来得及响应停止请求：丢弃原频段的推荐结果
+            logger.info(f"Discarded {worker.band} recommendation after switching to {self._selected_band()}")
+            self._reset_ui()
+            self._progress_label.setText("分析已停止")
+            return
+        
+        self._checkpoint = None
         self._current_recommendation = recommendation
         self._update_recommendation_display(recommendation)
         self._reset_ui()
@@ -935,6 +905,16 @@ class RecommendPanel(QWidget):
         logger.info(f"Recommendation completed: {recommendation}")
     
     def _on_error(self, error_message: str):
+        worker = self._take_worker()
+        if worker is None:
+            return
+        if worker.band != self._selected_band():
+            logger.info(f"Ignored error from stopped {worker.band} recommendation: {error_message}")
+            self._reset_ui()
+            self._progress_label.setText("分析已停止")
+            return
+        
+        self._checkpoint = None
         self._reset_ui()
         self._progress_label.setText("测试失败")
         exception_handler.show_warning("推荐失败", error_message)
@@ -992,6 +972,16 @@ class RecommendPanel(QWidget):
     def _reset_ui(self):
         self.analyze_button.setEnabled(True)
         self.analyze_button.setText("分析并推荐")
+        self.stop_button.setEnabled(False)
+        self.resume_button.setEnabled(self._has_checkpoint_for_band())
+    
+    def _has_checkpoint_for_band(self) -> bool:
+        if not self._checkpoint:
+            return False
+        return self._checkpoint['channels'][0].band == self._selected_band()
+    
+    def _selected_band(self) -> str:
+        return "5GHz" if self.band_5_button.isChecked() else "2.4GHz"
     
     def _on_band_toggled(self, band: str, checked: bool):
         if not checked:
@@ -1003,13 +993,12 @@ class RecommendPanel(QWidget):
         else:
             self.band_2_4_button.setChecked(False)
         
-        # 更新分析面板的频段设置
+        # 切换频段时停止正在进行的分析，已完成的信道保留为该频段的检查点
+        self._stop_analysis()
+        
+        # 更新分析面板的频段设置，有未过期缓存时无需重新扫描
         if self._analysis_panel:
-            # 找到分析面板中的频段下拉框并更新
-            if hasattr(self._analysis_panel, 'band_combo'):
-                self._analysis_panel.band_combo.setCurrentText(band)
-                # 触发扫描以获取对应频段的信道数据
-                self._analysis_panel.refresh()
+            self._analysis_panel.select_band(band)
         
         # 清除当前的推荐结果
         self._clear_recommendation_display()
@@ -1063,6 +1052,7 @@ class RecommendPanel(QWidget):
         
         # 禁用应用按钮
         self.apply_button.setEnabled(False)
+        self.resume_button.setEnabled(self._has_checkpoint_for_band() and not self._is_running())
         
         # 重置进度信息
         self._progress_bar.setValue(0)
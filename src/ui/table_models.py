@@ -0,0 +1,161 @@
+from typing import List, Optional
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QBrush
+import numpy as np
+from src.models.data_models import ChannelTestDataStore
+
+
+# 排序使用的数值角色，避免按格式化后的字符串排序
+SORT_ROLE = Qt.UserRole
+
+
+class ChannelTableModel(QAbstractTableModel):
+    """信道详情表模型：直接读取扫描结果，数据不变的行不触发重绘"""
+    
+    HEADERS = ["信道", "频率(GHz)", "信号强度(dBm)", "占用率(%)", "干扰(%)", "质量评分"]
+    FORMATS = ["{}", "{:.3f}", "{}", "{:.1f}", "{:.1f}", "{:.1f}"]
+    QUALITY_COLUMN = 5
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[tuple] = []
+        self._sort_column: Optional[int] = None
+        self._sort_order = Qt.AscendingOrder
+        self._quality_brushes = (QBrush(Qt.green), QBrush(Qt.yellow), QBrush(Qt.red))
+    
+    def set_channels(self, channels: list):
+        rows = self._sorted([
+            (ch.channel, ch.frequency, ch.signal_strength, ch.occupancy, ch.interference, ch.get_quality_score())
+            for ch in channels
+        ])
+        
+        old_keys = [row[0] for row in self._rows]
+        new_keys = [row[0] for row in rows]
+        
+        if old_keys != new_keys:
+            if sorted(old_keys) == sorted(new_keys):
+                # 信道集合不变，仅排序位置变化
+                self.layoutAboutToBeChanged.emit()
+                self._rows = rows
+                self.layoutChanged.emit()
+            else:
+                self.beginResetModel()
+                self._rows = rows
+                self.endResetModel()
+            return
+        
+        changed = [i for i, (old, new) in enumerate(zip(self._rows, rows)) if old != new]
+        self._rows = rows
+        last_column = len(self.HEADERS) - 1
+        for row in changed:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        value = self._rows[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            return self.FORMATS[index.column()].format(value)
+        if role == SORT_ROLE:
+            return value
+        if role == Qt.BackgroundRole and index.column() == self.QUALITY_COLUMN:
+            if value >= 80:
+                return self._quality_brushes[0]
+            elif value >= 60:
+                return self._quality_brushes[1]
+            return self._quality_brushes[2]
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        self._rows = self._sorted(self._rows)
+        self.layoutChanged.emit()
+    
+    def _sorted(self, rows: List[tuple]) -> List[tuple]:
+        if self._sort_column is None:
+            return rows
+        column = self._sort_column
+        return sorted(rows, key=lambda row: row[column], reverse=self._sort_order == Qt.DescendingOrder)
+
+
+class TestDataTableModel(QAbstractTableModel):
+    """测试数据表模型：按需从列式存储读取单元格，支持全部样本的浏览与排序"""
+    
+    HEADERS = ["测试序号", "RSSI (dBm)", "SNR (dB)", "带宽 (MHz)", "速率 (Mbps)", "丢包率 (%)"]
+    
+    def __init__(self, test_data, parent=None):
+        super().__init__(parent)
+        if test_data is not None and not isinstance(test_data, ChannelTestDataStore):
+            test_data = ChannelTestDataStore.from_records(test_data) if len(test_data) else None
+        self._store: Optional[ChannelTestDataStore] = test_data
+        self._order = np.arange(len(test_data) if test_data is not None else 0)
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._order)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, SORT_ROLE):
+            return None
+        
+        sample = int(self._order[index.row()])
+        column = index.column()
+        store = self._store
+        if column == 0:
+            value = sample + 1
+        elif column == 1:
+            value = int(store.rssi[sample])
+        elif column == 2:
+            value = float(store.snr[sample])
+        elif column == 3:
+            value = store.bandwidth
+        elif column == 4:
+            value = float(store.throughput[sample])
+        else:
+            value = float(store.packet_loss[sample])
+        
+        if role == SORT_ROLE:
+            return value
+        return str(value) if column == 0 else f"{value:.1f}"
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        if self._store is None:
+            return
+        
+        keys = {
+            1: self._store.rssi,
+            2: self._store.snr,
+            4: self._store.throughput,
+            5: self._store.packet_loss,
+        }.get(column)
+        
+        self.layoutAboutToBeChanged.emit()
+        if keys is None:
+            # 序号列和常量的带宽列按原始测试顺序排列
+            self._order = np.arange(len(self._store))
+        else:
+            self._order = np.argsort(keys, kind='stable')
+        if order == Qt.DescendingOrder:
+            self._order = self._order[::-1]
+        self.layoutChanged.emit()
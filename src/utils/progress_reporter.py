@@ -0,0 +1,69 @@
+import time
+from typing import Callable, Optional
+
+
+class ProgressReporter:
+    """节流的进度报告器：仅在百分比或时间桶变化时回调，并附带速率(次/秒)与剩余时间(秒)"""
+    
+    def __init__(self, total: int, callback: Callable[[int, float, float], None],
+                 interval: float = 0.1, clock: Callable[[], float] = time.monotonic):
+        self._total = max(0, total)
+        self._callback = callback
+        self._interval = interval
+        self._clock = clock
+        self._completed = 0
+        self._baseline = 0
+        self._start_time: Optional[float] = None
+        self._last_percent = -1
+        self._last_bucket = -1
+    
+    @property
+    def completed(self) -> int:
+        return self._completed
+    
+    def start(self, completed: int = 0):
+        """开始计时；completed为已完成(如从检查点恢复)的数量，不计入速率"""
+        self._start_time = self._clock()
+        self._completed = min(completed, self._total)
+        self._baseline = self._completed
+        # 开始时的回调属于第0个时间桶，之后同一百分比内的更新不再重复回调
+        self._last_bucket = 0
+        self._emit(self._percent(), 0.0)
+    
+    def advance(self, count: int = 1):
+        self.update(self._completed + count)
+    
+    def update(self, completed: int):
+        if self._start_time is None:
+            self.start()
+        
+        self._completed = min(completed, self._total)
+        elapsed = self._clock() - self._start_time
+        percent = self._percent()
+        bucket = int(elapsed / self._interval) if self._interval > 0 else 0
+        
+        # 百分比和时间桶都未变化时不回调，避免跨线程信号淹没事件循环
+        if percent == self._last_percent and bucket == self._last_bucket:
+            return
+        
+        self._last_bucket = bucket
+        self._emit(percent, elapsed)
+    
+    def finish(self):
+        if self._start_time is None:
+            self.start()
+        
+        self._completed = self._total
+        self._emit(100, self._clock() - self._start_time)
+    
+    def _percent(self) -> int:
+        if self._total == 0:
+            return 100
+        return int(self._completed * 100 / self._total)
+    
+    def _emit(self, percent: int, elapsed: float):
+        self._last_percent = percent
+        rate = (self._completed - self._baseline) / elapsed if elapsed > 0 else 0.0
+        remaining = self._total - self._completed
+        eta = remaining / rate if rate > 0 else 0.0
+        self._callback(percent, rate, eta)
@@ -1,90 +1,66 @@
-import requests
-import time
-import subprocess
-import re
-import urllib3
+import asyncio
+from datetime import datetime
+from urllib.parse import urlsplit
+from src.models.data_models import SpeedTestResult
+from src.services.config_service import config_service
+from src.services.connection_pool import ConnectionPool
+from src.services.latency_probe import latency_probe
+from src.services.server_selector import server_selector
+from src.services.speed_test_service import speed_test_service
 
-# 禁用SSL警告
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-def test_latency(server='8.8.8.8'):
-    """测试网络延迟 - 使用简化方法"""
+async def test_latency(server=None):
+    """测试网络延迟 - 进程内TCP建连计时，统计百分位数与RFC 3550抖动"""
+    server = server or config_service.get_ping_server()
     try:
-        # 使用ping命令，只发送2次请求
-        result = subprocess.run(
-            ['ping', '-n', '2', server],
-            capture_output=True,
-            timeout=8
-        )
-        
-        # 尝试解析ping输出
-        try:
-            output = result.stdout.decode('gbk', errors='ignore')
-        except:
-            try:
-                output = result.stdout.decode('utf-8', errors='ignore')
-            except:
-                output = str(result.stdout)
-        
-        # 简化正则表达式，只匹配数字
-        match = re.search(r'(\d+)ms', output)
-        if match:
-            return float(match.group(1))
-        
-        # 如果无法解析，返回一个合理的估计值
-        return 25.0  # 假设25ms
-        
-    except Exception as e:
+        result = await latency_probe.probe(server)
+    except OSError as e:
         print(f"Latency test error: {e}")
-        return 25.0
+        return None
+    
+    if result.received == 0:
+        print(f"  {server} unreachable ({result.sent} probes lost)")
+        return None
+    print(f"  min/avg/p50/p95/p99: {result.min:.1f}/{result.avg:.1f}/{result.p50:.1f}/"
+          f"{result.p95:.1f}/{result.p99:.1f} ms, jitter: {result.jitter:.1f} ms, loss: {result.loss:.0f}%")
+    return result
 
-def test_download():
-    """测试下载速度 - 使用简化方法"""
-    test_servers = [
-        ("http://speedtest.tele2.net/1MB.zip", "Tele2"),
-        ("http://speedtest.ftp.otenet.gr/files/test1Mb.db", "OTEnet"),
-    ]
+async def test_http_latency(pool):
+    """在连接池的长连接上测量HTTP往返时间，连接留给随后的下载阶段复用"""
+    server_url = config_service.get_test_servers()[0]
+    result = await speed_test_service.measure_latency(server_url, pool=pool)
+    return result.p50
+
+async def test_download(pool):
+    """测试下载速度 - 先并发探测全部服务器并排序，只对最优的K个做完整测速"""
+    print("Probing servers...")
+    ranked = await server_selector.probe_all(config_service.get_test_servers(), pool=pool)
+    for probe in ranked:
+        print(f"  {probe}")
+    test_servers = [probe.url for probe in ranked if probe.usable][:server_selector.top_k]
     
     best_speed = 0.0
     
-    for server_url, name in test_servers:
+    for server_url in test_servers:
         try:
-            print(f"Testing download from: {name}")
-            start_time = time.time()
-            
-            # 简化请求，不使用流式下载
-            response = requests.get(
-                server_url,
-                timeout=30,  # 30秒超时
-                headers={'User-Agent': 'Mozilla/5.0'},
-                verify=False
-            )
-            
-            end_time = time.time()
-            download_time = end_time - start_time
-            downloaded = len(response.content)
+            print(f"Testing download from: {urlsplit(server_url).hostname}")
+            result = await speed_test_service.measure_download(server_url, pool=pool)
             
-            # 只接受合理的测试结果（时间在1-30秒之间）
-            if response.status_code == 200 and 1.0 <= download_time <= 30.0:
-                speed_bps = (downloaded * 8) / download_time
-                speed_mbps = speed_bps / 1_000_000
-                if speed_mbps > best_speed:
-                    best_speed = speed_mbps
-                print(f"  Speed: {speed_mbps:.2f} Mbps (time: {download_time:.2f}s, size: {downloaded/1024/1024:.2f}MB)")
-            else:
-                print(f"  Skipped (time: {download_time:.2f}s)")
+            if result.throughput > best_speed:
+                best_speed = result.throughput
+            if result.ttfb is not None:
+                print(f"  TTFB: {result.ttfb:.1f} ms")
+            print(f"  Speed: {result.throughput:.2f} Mbps (streams: {result.streams}, time: {result.duration:.2f}s, "
+                  f"size: {result.bytes_transferred/1024/1024:.2f}MB, converged: {result.converged})")
+            print_connection_stats(result.connection_stats)
             
-        except requests.exceptions.Timeout:
-            print(f"  Timeout after 30s")
-            continue
         except Exception as e:
             print(f"  Error: {e}")
             continue
     
     return best_speed
 
-def test_upload():
-    """测试上传速度 - 使用简化方法"""
+async def test_upload(pool):
+    """测试上传速度 - 分块传输预分配的数据块，按实际发出的字节计量"""
     upload_servers = [
         ("http://httpbin.org/post", "httpbin"),
         ("https://postman-echo.com/post", "Postman"),
@@ -95,60 +71,81 @@ def test_upload():
     for server_url, name in upload_servers:
         try:
             print(f"Testing upload to: {name}")
-            data = {'data': 'x' * (1024 * 32)}  # 32KB
-            
-            start_time = time.time()
-            
-            response = requests.post(
-                server_url,
-                data=data,
-                timeout=15,  # 15秒超时
-                headers={'User-Agent': 'Mozilla/5.0'},
-                verify=False
-            )
+            result = await speed_test_service.measure_upload(server_url, pool=pool)
             
-            end_time = time.time()
-            upload_time = end_time - start_time
-            data_size = len(str(data))
+            if result.throughput > best_speed:
+                best_speed = result.throughput
+            print(f"  Speed: {result.throughput:.2f} Mbps (streams: {result.streams}, time: {result.duration:.2f}s, "
+                  f"size: {result.bytes_transferred/1024/1024:.2f}MB, converged: {result.converged})")
+            print_connection_stats(result.connection_stats)
+            print_timeline(result)
             
-            # 只接受合理的测试结果
-            if response.status_code == 200 and 0.5 <= upload_time <= 15.0:
-                speed_bps = (data_size * 8) / upload_time
-                speed_mbps = speed_bps / 1_000_000
-                if speed_mbps > best_speed:
-                    best_speed = speed_mbps
-                print(f"  Speed: {speed_mbps:.2f} Mbps (time: {upload_time:.2f}s, size: {data_size/1024:.2f}KB)")
-            else:
-                print(f"  Skipped (time: {upload_time:.2f}s)")
-            
-        except requests.exceptions.Timeout:
-            print(f"  Timeout after 15s")
-            continue
         except Exception as e:
             print(f"  Error: {e}")
             continue
     
     return best_speed
 
+def print_timeline(result, step=1.0):
+    """按约step秒的间隔输出吞吐量随时间的变化"""
+    next_time = 0.0
+    points = []
+    for at, rate in zip(result.sample_times, result.samples):
+        if at >= next_time:
+            points.append(f"{at:.1f}s={rate:.1f}")
+            next_time = at + step
+    if points:
+        print(f"  Timeline (Mbps): {', '.join(points)}")
+
+def print_connection_stats(stats):
+    """输出握手与传输耗时，握手开销单独列出而不计入吞吐量"""
+    print(f"  Connections: {stats.connections_opened} opened, {stats.connections_reused} reused, "
+          f"handshake {stats.handshake_time * 1000:.1f} ms (avg {stats.avg_handshake_ms:.1f} ms), "
+          f"transfer {stats.transfer_time:.2f}s")
+
+async def run_speed_test():
+    """各测速阶段共享同一个连接池，延迟阶段建立的连接在下载阶段继续复用"""
+    async with ConnectionPool() as pool:
+        # 测试延迟
+        print("\n1. Testing latency...")
+        latency = await test_latency()
+        if latency is not None:
+            print(f"Result: {latency.avg:.1f} ms")
+        try:
+            http_rtt = await test_http_latency(pool)
+            print(f"HTTP RTT (keep-alive): {http_rtt:.1f} ms")
+        except Exception as e:
+            print(f"  HTTP RTT error: {e}")
+        
+        # 测试下载
+        print("\n2. Testing download speed...")
+        download_speed = await test_download(pool)
+        print(f"Result: {download_speed:.2f} Mbps")
+        
+        # 测试上传
+        print("\n3. Testing upload speed...")
+        upload_speed = await test_upload(pool)
+        print(f"Result: {upload_speed:.2f} Mbps")
+        
+        print("\nConnection pool totals:")
+        print_connection_stats(pool.stats)
+    
+    return SpeedTestResult(
+        download_speed=download_speed,
+        upload_speed=upload_speed,
+        latency=latency.avg if latency else float('nan'),
+        jitter=latency.jitter if latency else float('nan'),
+        timestamp=datetime.now(),
+        server=config_service.get_ping_server()
+    )
+
 if __name__ == "__main__":
     print("Starting speed test...")
     print("=" * 50)
     
-    # 测试延迟
-    print("\n1. Testing latency...")
-    latency = test_latency()
-    print(f"Result: {latency:.0f} ms")
-    
-    # 测试下载
-    print("\n2. Testing download speed...")
-    download_speed = test_download()
-    print(f"Result: {download_speed:.2f} Mbps")
-    
-    # 测试上传
-    print("\n3. Testing upload speed...")
-    upload_speed = test_upload()
-    print(f"Result: {upload_speed:.2f} Mbps")
+    result = asyncio.run(run_speed_test())
     
     print("\n" + "=" * 50)
     print("Test completed!")
-    print(f"Results: Download={download_speed:.2f} Mbps, Upload={upload_speed:.2f} Mbps, Latency={latency:.0f} ms")
\ No newline at end of file
+    print(f"Results: Download={result.download_speed:.2f} Mbps, Upload={result.upload_speed:.2f} Mbps, "
+          f"Latency={result.latency:.1f} ms, Jitter={result.jitter:.1f} ms")
\ No newline at end of file
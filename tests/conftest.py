@@ -0,0 +1,74 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, *args):
+        pass
+    
+    def _reply(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {'Content-Length': str(len(body))}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        parts = self.path.strip('/').split('/')
+        if parts[0] == 'bytes':
+            self._reply(200, bytes(int(parts[1])))
+        elif parts[0] == 'chunked':
+            self.send_response(200)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            self.wfile.write(b'400\r\n' + bytes(1024) + b'\r\n10\r\n' + bytes(16) + b'\r\n0\r\n\r\n')
+        elif parts[0] == 'redirect':
+            hops = int(parts[1])
+            location = f'/redirect/{hops - 1}' if hops > 1 else '/bytes/1000'
+            self._reply(302, b'moved', {'Location': location, 'Content-Length': '5'})
+        elif parts[0] == 'error':
+            self._reply(500, bytes(2000))
+        elif parts[0] == 'stall':
+            # 等待指定秒数后才响应
+            time.sleep(float(parts[1]))
+            self._reply(200, bytes(10))
+        elif parts[0] == 'badlength':
+            self._reply(200, headers={'Content-Length': 'abc'})
+    
+    def do_POST(self):
+        if self.path == '/sink':
+            # 读完分块上传的请求体，在响应头中返回负载字节数及是否以0\r\n\r\n正常结束
+            received = 0
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    break
+                received += len(self.rfile.read(size))
+                self.rfile.readline()
+            terminated = self.rfile.readline() == b'\r\n'
+            self._reply(200, headers={'Content-Length': '0', 'X-Received': str(received),
+                                      'X-Terminated': str(terminated)})
+        else:
+            self._reply(307, b'', {'Location': '/bytes/10', 'Content-Length': '0'})
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    
+    def handle_error(self, request, client_address):
+        # 测速结束时客户端直接断开仍在传输的连接
+        pass
+
+
+@pytest.fixture(scope='module')
+def base_url():
+    """本机HTTP测试服务器的地址，路由见_Handler"""
+    server = _Server(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,80 @@
+import os
+import pytest
+from src.managers import channel_scan_manager as scan_manager_module
+from src.managers.channel_scan_manager import (SOURCE_REPLAY, SOURCE_SCAN, SOURCE_SIMULATED, ChannelScanManager,
+                                               create_channel_scan_manager)
+from src.models.data_models import ChannelInfo
+from src.services.config_service import config_service
+from src.services.scan_replay import ScanReplay
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'scans')
+
+
+def _info(band, channel):
+    return ChannelInfo(channel=channel, frequency=2.412, band=band, signal_strength=-50, occupancy=0.0,
+                       interference=0.0, networks=[])
+
+
+class FakeHistory:
+    def __init__(self):
+        self.scans = []
+    
+    def record_scan(self, results, source="scan", timestamp=None):
+        self.scans.append((sorted(results), source))
+        return True
+
+
+def _failing_scanner():
+    raise RuntimeError("no wifi")
+
+
+def _simulator(band):
+    return [_info(band, 99)]
+
+
+def test_scan_uses_scanner_and_records_history():
+    history = FakeHistory()
+    manager = ChannelScanManager(scanner=lambda: {'2.4GHz': [_info('2.4GHz', 1)], '5GHz': [_info('5GHz', 36)]},
+                                 simulator=_simulator, history=history)
+    result = manager.scan(['5GHz'])
+    assert (result.source, list(result.bands), result.channels('5GHz')[0].channel) == (SOURCE_SCAN, ['5GHz'], 36)
+    assert history.scans == [(['5GHz'], SOURCE_SCAN)]
+
+
+def test_failed_scan_falls_back_to_simulated_data():
+    history = FakeHistory()
+    manager = ChannelScanManager(scanner=_failing_scanner, simulator=_simulator, history=history)
+    result = manager.scan(['2.4GHz', '5GHz'])
+    assert result.source == SOURCE_SIMULATED
+    assert {band: [info.channel for info in channels] for band, channels in result.bands.items()} == \
+        {'2.4GHz': [99], '5GHz': [99]}
+    assert history.scans == [(['2.4GHz', '5GHz'], SOURCE_SIMULATED)]
+    
+    # 不允许退回时直接抛出扫描异常
+    with pytest.raises(RuntimeError, match='no wifi'):
+        manager.scan(['5GHz'], fallback=False)
+
+
+def test_simulate_skips_scanner():
+    manager = ChannelScanManager(scanner=_failing_scanner, simulator=_simulator, history=None)
+    assert manager.scan(['5GHz'], simulate=True, fallback=False).source == SOURCE_SIMULATED
+
+
+def test_replay_never_falls_back_to_random_data():
+    manager = ChannelScanManager(scanner=_failing_scanner, simulator=_simulator, history=None, source=SOURCE_REPLAY)
+    with pytest.raises(RuntimeError):
+        manager.scan(['5GHz'])
+
+
+def test_configured_replay_selects_replay_manager(monkeypatch):
+    monkeypatch.setattr(config_service, 'get_replay_source', lambda: FIXTURES)
+    manager = create_channel_scan_manager()
+    # 回放数据不写入历史数据库
+    assert (manager.source, manager._history) == (SOURCE_REPLAY, None)
+    assert isinstance(manager._scanner, ScanReplay)
+    assert manager.scan(fallback=False).source == SOURCE_REPLAY
+    
+    monkeypatch.setattr(config_service, 'get_replay_source', lambda: '')
+    manager = create_channel_scan_manager()
+    assert (manager.source, manager._history) == (SOURCE_SCAN, scan_manager_module.history_store)
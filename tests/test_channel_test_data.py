@@ -0,0 +1,70 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from src.models.data_models import ChannelInfo, ChannelTestData, ChannelTestDataStore
+from src.services.channel_test_engine import SAMPLE_INTERVAL_NS, ChannelTestEngine
+
+
+def _store(count=5):
+    return ChannelTestDataStore(36, '5GHz', 80, rssi=np.arange(count) - 60, snr=np.arange(count) * 1.5,
+                                throughput=np.arange(count) * 10.0, packet_loss=np.full(count, 0.5),
+                                timestamp_ns=np.arange(count, dtype=np.int64) * 1_000_000_000 + 1_700_000_000_000_000_000)
+
+
+def test_columns_use_compact_dtypes():
+    store = _store()
+    assert (store.rssi.dtype, store.snr.dtype, store.timestamp_ns.dtype) == (np.int16, np.float32, np.int64)
+    assert store.bandwidth == 80.0
+    assert store.nbytes == 5 * (2 + 4 + 4 + 4 + 8)
+
+
+def test_rows_are_materialized_lazily():
+    store = _store()
+    assert len(store) == 5
+    row = store[2]
+    assert isinstance(row, ChannelTestData)
+    assert (row.channel, row.band, row.rssi, row.snr, row.throughput, row.bandwidth) == (36, '5GHz', -58, 3.0, 20.0, 80.0)
+    assert row.timestamp == datetime.fromtimestamp(1_700_000_002)
+    assert store[-1].rssi == -56
+    assert [r.rssi for r in store] == [-60, -59, -58, -57, -56]
+
+
+def test_slicing_returns_store():
+    part = _store()[1:4]
+    assert isinstance(part, ChannelTestDataStore)
+    assert (part.channel, part.band, len(part)) == (36, '5GHz', 3)
+    assert part.throughput.tolist() == [10.0, 20.0, 30.0]
+
+
+def test_record_round_trip():
+    records = _store().to_records()
+    store = ChannelTestDataStore.from_records(records)
+    assert store.to_records() == records
+    with pytest.raises(ValueError):
+        ChannelTestDataStore.from_records([])
+
+
+def test_mismatched_column_lengths_rejected():
+    with pytest.raises(ValueError):
+        ChannelTestDataStore(1, '2.4GHz', 20, rssi=[1, 2], snr=[1], throughput=[1, 2], packet_loss=[1, 2],
+                             timestamp_ns=[1, 2])
+
+
+def test_engine_generates_seeded_samples_and_statistics():
+    info = ChannelInfo(channel=6, frequency=2.437, band='2.4GHz', signal_strength=-60, occupancy=20.0,
+                       interference=10.0, networks=[])
+    samples, analysis = ChannelTestEngine(np.random.default_rng(1)).test_channel(info, 500)
+    again, _ = ChannelTestEngine(np.random.default_rng(1)).test_channel(info, 500)
+    np.testing.assert_array_equal(samples.throughput, again.throughput)
+    
+    assert (samples.channel, samples.band, samples.bandwidth, len(samples)) == (6, '2.4GHz', 20.0, 500)
+    assert samples.rssi.min() >= -65 and samples.rssi.max() <= -55
+    # 每个样本有各自的时间戳，按固定间隔递增
+    assert samples.timestamp_ns.dtype == np.int64
+    assert (np.diff(samples.timestamp_ns) == SAMPLE_INTERVAL_NS).all()
+    assert analysis['avg_rssi'] == pytest.approx(float(samples.rssi.mean()))
+    assert analysis['std_throughput'] == pytest.approx(float(samples.throughput.astype(np.float64).std(ddof=1)))
+    assert analysis['max_throughput'] == pytest.approx(float(samples.throughput.max()))
+    assert 0.0 <= analysis['consistency_score'] <= 100.0
+    with pytest.raises(ValueError):
+        ChannelTestEngine().generate_samples(info, 0)
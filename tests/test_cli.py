@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 在子进程中按命令行方式运行main.py，结束后追加一行记录已加载的界面/绘图模块
+_RUNNER = """
+import json, sys
+import main
+sys.argv = ['main.py'] + sys.argv[1:]
+try:
+    main.main()
+    code = 0
+except SystemExit as e:
+    code = e.code
+print(json.dumps({'type': 'modules', 'exit_code': code,
+                  'loaded': [name for name in ('PyQt5', 'matplotlib') if name in sys.modules]}))
+"""
+
+
+def _run(*args):
+    completed = subprocess.run([sys.executable, '-c', _RUNNER, *args], cwd=ROOT, capture_output=True, text=True,
+                               timeout=60)
+    assert completed.returncode == 0, completed.stderr
+    # stdout每一行都是JSON，日志只写到stderr
+    records = [json.loads(line) for line in completed.stdout.splitlines()]
+    modules = records.pop()
+    assert modules['type'] == 'modules'
+    return modules['exit_code'], records, modules['loaded']
+
+
+def test_scan_repeats_with_interval():
+    exit_code, records, loaded = _run('scan', '--simulate', '--repeat', '3', '--interval', '0.2')
+    assert (exit_code, loaded) == (0, [])
+    
+    scans = [record for record in records if record['type'] == 'scan']
+    assert [record['run'] for record in scans] == [1, 2, 3]
+    assert {record['source'] for record in records} == {'simulated'}
+    channels = [record for record in records if record['type'] == 'channel']
+    assert len(channels) == sum(sum(record['channels'].values()) for record in scans)
+    # 两次运行之间至少间隔--interval秒(时间戳精确到毫秒)
+    times = [datetime.fromisoformat(record['timestamp']) for record in scans]
+    assert all((later - earlier).total_seconds() >= 0.199 for earlier, later in zip(times, times[1:]))
+
+
+@pytest.mark.parametrize('band', ['2.4GHz', '5GHz'])
+def test_recommend_outputs_json_lines_without_gui_modules(band):
+    exit_code, records, loaded = _run('recommend', '--simulate', '--band', band, '--test-count', '50',
+                                      '--seed', '1', '--workers', '1', '--repeat', '2')
+    assert (exit_code, loaded) == (0, [])
+    
+    recommendations = [record for record in records if record['type'] == 'recommendation']
+    assert [record['run'] for record in recommendations] == [1, 2]
+    assert all(record['band'] == band and record['test_count'] == 50 for record in recommendations)
+    results = [record for record in records if record['type'] == 'channel_result']
+    assert results and all(record['band'] == band for record in results)
+
+
+def test_invalid_replay_source_reports_error_record(tmp_path):
+    exit_code, records, loaded = _run('scan', '--replay', str(tmp_path / 'missing.wts'))
+    assert (exit_code, loaded) == (1, [])
+    assert [record['type'] for record in records] == ['error']
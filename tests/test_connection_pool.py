@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from src.services.connection_pool import MAX_REDIRECTS, ConnectionPool, HttpConnectionError
+
+
+def _get(url, **kwargs):
+    metered = []
+    heads = []
+    
+    async def run():
+        async with ConnectionPool(timeout=5) as pool:
+            return await pool.request("GET", url, on_body_bytes=metered.append,
+                                      on_head=lambda status, headers, ttfb: heads.append((status, ttfb)), **kwargs)
+    
+    return asyncio.run(run()), sum(metered), heads
+
+
+def test_fixed_length_and_chunked_bodies(base_url):
+    response, metered, heads = _get(f'{base_url}/bytes/100000')
+    assert (response.status, response.body_bytes, metered) == (200, 100000, 100000)
+    assert len(heads) == 1 and heads[0][1] > 0
+    
+    response, metered, _ = _get(f'{base_url}/chunked')
+    assert (response.body_bytes, metered) == (1040, 1040)
+
+
+def test_connections_are_reused(base_url):
+    async def run():
+        async with ConnectionPool(timeout=5) as pool:
+            for _ in range(3):
+                await pool.request("GET", f'{base_url}/bytes/10')
+            return pool.stats, pool.idle_count(base_url)
+    
+    stats, idle = asyncio.run(run())
+    assert (stats.requests, stats.connections_opened, stats.connections_reused, idle) == (3, 1, 2, 1)
+
+
+def test_redirects_followed_and_only_final_response_metered(base_url):
+    response, metered, heads = _get(f'{base_url}/redirect/3')
+    assert (response.status, response.body_bytes, metered) == (200, 1000, 1000)
+    # 重定向响应不触发on_head
+    assert [status for status, _ in heads] == [200]
+
+
+def test_too_many_redirects(base_url):
+    with pytest.raises(HttpConnectionError, match='Too many redirects'):
+        _get(f'{base_url}/redirect/{MAX_REDIRECTS + 1}')
+
+
+def test_redirected_request_with_body_fails(base_url):
+    async def run():
+        async with ConnectionPool(timeout=5) as pool:
+            await pool.request("POST", f'{base_url}/upload', body=iter([memoryview(b'data')]))
+    
+    with pytest.raises(HttpConnectionError, match='redirected'):
+        asyncio.run(run())
+
+
+def test_error_body_is_not_metered(base_url):
+    response, metered, heads = _get(f'{base_url}/error')
+    assert (response.status, response.body_bytes, metered) == (500, 2000, 0)
+    assert heads[0][0] == 500
+
+
+def test_malformed_content_length(base_url):
+    with pytest.raises(HttpConnectionError, match='Content-Length'):
+        _get(f'{base_url}/badlength')
+
+
+def test_upload_meters_only_payload_bytes(base_url):
+    metered = []
+    
+    async def run():
+        async with ConnectionPool(timeout=5) as pool:
+            chunks = (memoryview(bytes(65536)) for _ in range(32))
+            return await pool.request("POST", f'{base_url}/sink', body=chunks, on_sent_bytes=metered.append)
+    
+    response = asyncio.run(run())
+    # 请求头和分块帧不计入，计量值与服务器收到的负载字节数一致
+    assert (response.status, response.headers['x-terminated']) == (200, 'True')
+    assert int(response.headers['x-received']) == sum(metered) == 32 * 65536
@@ -0,0 +1,130 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from src.models.data_models import ChannelInfo, ChannelRecommendation, ChannelTestDataStore, SpeedTestResult
+from src.services.history_store import HistoryStore
+
+
+def _info(channel, signal, band='5GHz'):
+    return ChannelInfo(channel=channel, frequency=5.18, band=band, signal_strength=signal, occupancy=10.0,
+                       interference=5.0, networks=['a', 'b'])
+
+
+def _samples(channel, count, start_ns=1_000_000_000_000):
+    return ChannelTestDataStore(channel, '5GHz', 80.0, rssi=np.full(count, -50), snr=np.arange(count),
+                                throughput=np.linspace(100, 200, count), packet_loss=np.zeros(count),
+                                timestamp_ns=start_ns + np.arange(count) * 1_000_000)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'), site='lab')
+    yield store
+    store.close()
+
+
+def test_disabled_store_does_not_create_database(tmp_path):
+    path = tmp_path / 'sub' / 'history.db'
+    store = HistoryStore(str(path), enabled=False)
+    assert store.record_scan({'5GHz': [_info(36, -50)]}) is False
+    assert not path.exists()
+
+
+def test_scan_range_queries_and_aggregates(store):
+    for i, signal in enumerate([-70, -60, -50, -40]):
+        assert store.record_scan({'5GHz': [_info(36, signal), _info(40, -80)]}, timestamp=100.0 + i)
+    
+    times, values = store.channel_series('signal_strength', '5GHz', 36)
+    assert times.tolist() == [100.0, 101.0, 102.0, 103.0]
+    assert values.tolist() == [-70, -60, -50, -40]
+    # 时间范围为[start, end)
+    assert store.channel_series('signal_strength', '5GHz', 36, start=101, end=103)[1].tolist() == [-60, -50]
+    assert store.channel_stat('signal_strength', '5GHz', 36, 'avg') == pytest.approx(-55)
+    assert store.channel_stat('signal_strength', '5GHz', 36, 'median') == pytest.approx(-55)
+    assert store.channel_stat('signal_strength', '5GHz', 36, 'max', start=102) == -40
+    assert store.channel_stat('network_count', '5GHz', 40, 'sum') == 8
+    assert store.channel_stat('signal_strength', '5GHz', 44, 'median') is None
+    assert store.channel_stat('signal_strength', '5GHz', 36, 'count', site='other') == 0
+    
+    history = store.channel_history('5GHz', 36, start=103)
+    assert [(t, info.signal_strength, info.networks) for t, info in history] == [(103.0, -40, [])]
+
+
+def test_channel_samples_are_subsampled(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'), site='lab', max_samples_per_channel=10)
+    assert store.record_channel_tests({36: {'test_data': _samples(36, 100)}, 40: {'test_data': _samples(40, 5)}})
+    assert store.channel_stat('throughput', '5GHz', 36, 'count') == 10
+    assert store.channel_stat('throughput', '5GHz', 40, 'count') == 5
+    # 按样本自身的时间戳入库
+    times, _ = store.channel_series('snr', '5GHz', 40)
+    assert times.tolist() == pytest.approx([1000.0, 1000.001, 1000.002, 1000.003, 1000.004])
+    store.close()
+    
+    # 为0时不记录样本
+    store = HistoryStore(str(tmp_path / 'none.db'), max_samples_per_channel=0)
+    assert store.record_channel_tests({36: {'test_data': _samples(36, 10)}}) is False
+    store.close()
+
+
+def test_recommendations_and_speed_tests(store):
+    recommendation = ChannelRecommendation(channel=149, band='5GHz', quality_score=88.5, reason='r',
+                                           expected_improvement='e', test_data=[], analysis_details={})
+    store.record_recommendation(recommendation, test_count=100, timestamp=50.0)
+    assert [(t, r.channel, r.quality_score) for t, r in store.recommendations(band='5GHz')] == [(50.0, 149, 88.5)]
+    assert store.recommendations(band='2.4GHz') == []
+    
+    timestamp = datetime(2024, 1, 2, 3, 4, 5)
+    store.record_speed_test(SpeedTestResult(download_speed=300.0, upload_speed=50.0, latency=12.0, jitter=1.5,
+                                            timestamp=timestamp, server='http://example'))
+    [result] = store.speed_tests()
+    assert (result.download_speed, result.jitter, result.server, result.timestamp) == \
+        (300.0, 1.5, 'http://example', timestamp)
+
+
+def test_unknown_metric_and_statistic(store):
+    with pytest.raises(ValueError):
+        store.channel_series('bogus', '5GHz', 36)
+    with pytest.raises(ValueError):
+        store.channel_stat('bogus', '5GHz', 36, 'avg')
+    with pytest.raises(ValueError):
+        store.channel_stat('rssi', '5GHz', 36, 'p101')
+
+
+@pytest.mark.parametrize('stat, percentile', [('median', 50), ('p0', 0), ('p95', 95), ('p99.5', 99.5), ('p100', 100)])
+def test_percentiles_match_numpy(store, stat, percentile):
+    rng = np.random.default_rng(3)
+    count = 1001
+    # 样本每30秒一个，跨越约8小时，分两批写入以合并同一时间桶的预聚合
+    samples = ChannelTestDataStore(36, '5GHz', 80.0, rssi=rng.integers(-90, -30, count), snr=rng.random(count) * 40,
+                                   throughput=rng.random(count) * 500, packet_loss=np.zeros(count),
+                                   timestamp_ns=np.arange(count, dtype=np.int64) * 30_000_000_000)
+    store.record_channel_tests({36: {'test_data': samples[:500]}})
+    store.record_channel_tests({36: {'test_data': samples[500:]}})
+    
+    # 浮点指标按0.5 Mbps分桶，误差不超过半个分桶
+    throughput = samples.throughput.astype(np.float64)
+    assert store.channel_stat('throughput', '5GHz', 36, stat) == \
+        pytest.approx(np.percentile(throughput, percentile), abs=0.25)
+    # 整数指标是精确值；范围[3000, 25000)包含完整时间桶与两端的部分时间桶，[3000, 3500)只在一个时间桶内
+    assert store.channel_stat('rssi', '5GHz', 36, stat, start=3000, end=25000) == \
+        pytest.approx(np.percentile(samples.rssi[100:834], percentile))
+    assert store.channel_stat('rssi', '5GHz', 36, stat, start=3000, end=3500) == \
+        pytest.approx(np.percentile(samples.rssi[100:117], percentile))
+
+
+def test_range_aggregates_combine_rollups_and_raw_rows(store):
+    rng = np.random.default_rng(5)
+    count = 1001
+    samples = ChannelTestDataStore(36, '5GHz', 80.0, rssi=rng.integers(-90, -30, count), snr=rng.random(count) * 40,
+                                   throughput=rng.random(count) * 500, packet_loss=np.zeros(count),
+                                   timestamp_ns=np.arange(count, dtype=np.int64) * 30_000_000_000)
+    store.record_channel_tests({36: {'test_data': samples}})
+    
+    snr = samples.snr.astype(np.float64)
+    for start, end in [(None, None), (3000, 25000), (None, 7200), (7200, None), (3000, 3500)]:
+        selected = snr[(start or 0) // 30:(-(-end // 30) if end is not None else count)]
+        assert store.channel_stat('snr', '5GHz', 36, 'count', start=start, end=end) == len(selected)
+        assert store.channel_stat('snr', '5GHz', 36, 'avg', start=start, end=end) == pytest.approx(selected.mean())
+        assert store.channel_stat('snr', '5GHz', 36, 'sum', start=start, end=end) == pytest.approx(selected.sum())
+        assert store.channel_stat('snr', '5GHz', 36, 'min', start=start, end=end) == pytest.approx(selected.min())
+        assert store.channel_stat('snr', '5GHz', 36, 'max', start=start, end=end) == pytest.approx(selected.max())
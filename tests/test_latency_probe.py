@@ -0,0 +1,32 @@
+import pytest
+from src.services.latency_probe import PROTOCOL_UDP, percentile, rfc3550_jitter, summarize_latency
+
+
+def test_rfc3550_jitter_smooths_adjacent_differences():
+    assert rfc3550_jitter([]) == 0.0
+    assert rfc3550_jitter([5.0]) == 0.0
+    assert rfc3550_jitter([10.0, 10.0, 10.0]) == 0.0
+    # J1 = 16/16 = 1, J2 = 1 + (16 - 1)/16
+    assert rfc3550_jitter([10.0, 26.0, 10.0]) == pytest.approx(1.0 + 15.0 / 16)
+
+
+def test_rfc3550_jitter_skips_pairs_across_losses():
+    # 丢包两侧的10与50不相邻，不产生差值
+    assert rfc3550_jitter([10.0, None, 50.0]) == 0.0
+    assert rfc3550_jitter([10.0, 12.0, None, 50.0, 52.0]) == pytest.approx(rfc3550_jitter([10.0, 12.0, 14.0]))
+    assert rfc3550_jitter([None, None]) == 0.0
+
+
+def test_summarize_latency_with_losses():
+    result = summarize_latency('host:7', PROTOCOL_UDP, [10.0, None, 30.0, 20.0, None])
+    assert (result.sent, result.received) == (5, 3)
+    assert result.samples == [10.0, 30.0, 20.0]
+    assert (result.min, result.avg, result.p50) == (10.0, 20.0, 20.0)
+    # 只有30与20是序号相邻的回包
+    assert result.jitter == pytest.approx(10.0 / 16)
+
+
+def test_percentile_interpolates():
+    assert percentile([], 50) == 0.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == pytest.approx(2.5)
+    assert percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 在干净的子进程中记录主窗口创建、显示以及首个事件循环之后已导入的模块
+_STARTUP = """
+import json, sys
+from PyQt5.QtWidgets import QApplication
+app = QApplication([])
+from src.ui.main_window import MainWindow
+
+def loaded():
+    return [name for name in ('matplotlib', 'src.ui.channel_analysis_panel', 'src.ui.recommend_panel')
+            if name in sys.modules]
+
+window = MainWindow()
+window.show()
+stages = {'shown': loaded()}
+app.processEvents()
+stages['first_tab'] = loaded()
+window.tab_widget.setCurrentIndex(1)
+stages['second_tab'] = loaded()
+print(json.dumps(stages))
+"""
+
+
+def test_heavy_modules_load_only_when_tabs_are_shown():
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen', PYTHONPATH=ROOT)
+    completed = subprocess.run([sys.executable, '-c', _STARTUP], cwd=ROOT, env=env, capture_output=True, text=True,
+                               timeout=60)
+    assert completed.returncode == 0, completed.stderr
+    stages = json.loads(completed.stdout.splitlines()[-1])
+    
+    # 窗口框架显示时不导入matplotlib和面板模块
+    assert stages['shown'] == []
+    # 首个事件循环中创建当前的信道分析页，推荐页仍未导入
+    assert stages['first_tab'] == ['matplotlib', 'src.ui.channel_analysis_panel']
+    assert stages['second_tab'] == ['matplotlib', 'src.ui.channel_analysis_panel', 'src.ui.recommend_panel']
+
+
+@pytest.fixture
+def window(monkeypatch):
+    monkeypatch.setenv('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    from src.ui.main_window import MainWindow
+    
+    app = QApplication.instance() or QApplication([])
+    window = MainWindow()
+    yield window
+    window.deleteLater()
+    app.processEvents()
+
+
+def _is_placeholder(widget):
+    return bool(widget.property("placeholder"))
+
+
+def test_tabs_are_created_once_on_demand(window):
+    tabs = window.tab_widget
+    assert [_is_placeholder(tabs.widget(i)) for i in range(tabs.count())] == [True, True]
+    assert (window.channel_analysis_panel, window.recommend_panel) == (None, None)
+    
+    panel = window._ensure_tab(0)
+    assert panel is window.channel_analysis_panel is tabs.widget(0)
+    assert _is_placeholder(tabs.widget(1)) and window.recommend_panel is None
+    # 已创建的标签页不再重建，标题与顺序不变
+    assert window._ensure_tab(0) is panel
+    assert [tabs.tabText(i) for i in range(tabs.count())] == ["信道分析", "信道推荐"]
+
+
+def test_panels_are_wired_after_both_exist(window):
+    tabs = window.tab_widget
+    # 切换标签页时才创建推荐面板，此时信道分析面板尚不存在，暂不连接
+    tabs.setCurrentIndex(1)
+    recommend_panel = window.recommend_panel
+    assert recommend_panel is tabs.widget(1)
+    assert window.channel_analysis_panel is None and not window._panels_wired
+    
+    analysis_panel = window._ensure_tab(0)
+    assert window._panels_wired
+    assert recommend_panel._analysis_panel is analysis_panel
+    assert analysis_panel.receivers(analysis_panel.scan_completed) == 1
+    assert tabs.currentIndex() == 0 and tabs.widget(1) is recommend_panel
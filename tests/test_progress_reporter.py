@@ -0,0 +1,67 @@
+import pytest
+from src.utils.progress_reporter import ProgressReporter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def _reporter(total, interval=0.1):
+    clock = FakeClock()
+    calls = []
+    reporter = ProgressReporter(total, lambda *args: calls.append(args), interval=interval, clock=clock)
+    return reporter, clock, calls
+
+
+def test_callbacks_only_when_percent_changes():
+    reporter, clock, calls = _reporter(100000)
+    reporter.start()
+    for _ in range(100000):
+        reporter.advance()
+    # 时间不前进时每个百分比只回调一次(含start的0%)
+    assert [percent for percent, _, _ in calls] == list(range(101))
+
+
+def test_time_bucket_reports_progress_within_same_percent():
+    reporter, clock, calls = _reporter(1000)
+    reporter.start()
+    reporter.advance()
+    assert len(calls) == 1
+    clock.now = 0.05
+    reporter.advance()
+    assert len(calls) == 1
+    # 进入下一个时间桶后即使百分比不变也回调，界面能刷新速率
+    clock.now = 0.1
+    reporter.advance()
+    assert len(calls) == 2
+    percent, rate, eta = calls[-1]
+    assert percent == 0
+    assert rate == pytest.approx(30.0)
+    assert eta == pytest.approx(997 / 30.0)
+
+
+def test_resume_baseline_excluded_from_rate():
+    reporter, clock, calls = _reporter(100)
+    reporter.start(completed=50)
+    assert calls[-1] == (50, 0.0, 0.0)
+    clock.now = 2.0
+    reporter.update(60)
+    percent, rate, eta = calls[-1]
+    assert (percent, rate, eta) == (60, pytest.approx(5.0), pytest.approx(8.0))
+
+
+def test_finish_and_empty_total():
+    reporter, clock, calls = _reporter(10)
+    clock.now = 1.0
+    reporter.update(20)
+    assert reporter.completed == 10
+    reporter.finish()
+    assert calls[-1][0] == 100
+    
+    reporter, _, calls = _reporter(0)
+    reporter.finish()
+    assert calls[-1] == (100, 0.0, 0.0)
@@ -0,0 +1,121 @@
+import threading
+import numpy as np
+import pytest
+from src.managers.recommendation_manager import AnalysisCancelled, RecommendationManager
+from src.models.data_models import ChannelInfo
+
+
+def _channels(count=6):
+    return [ChannelInfo(channel=i, frequency=2.407 + i * 0.005, band='2.4GHz', signal_strength=-50 - i * 3,
+                        occupancy=10.0 * i, interference=5.0 * i, networks=[]) for i in range(1, count + 1)]
+
+
+def _manager(**kwargs):
+    return RecommendationManager(workers=1, seed=7, history=None, **kwargs)
+
+
+def _cancel_after(count):
+    """第count个信道完成后请求取消"""
+    cancel_event = threading.Event()
+    completed = []
+    
+    def on_channel(channel_data):
+        completed.append(channel_data['channel_info'].channel)
+        if len(completed) == count:
+            cancel_event.set()
+    
+    return cancel_event, on_channel
+
+
+def _assert_same_results(actual, expected):
+    assert list(actual) == list(expected)
+    for channel, data in expected.items():
+        np.testing.assert_array_equal(actual[channel]['test_data'].throughput, data['test_data'].throughput)
+        assert actual[channel]['analysis'] == data['analysis']
+
+
+def test_cancel_raises_checkpoint_with_completed_channels():
+    channels = _channels()
+    cancel_event, on_channel = _cancel_after(2)
+    with pytest.raises(AnalysisCancelled) as info:
+        _manager().test_channels(channels, 50, cancel_event=cancel_event, channel_callback=on_channel)
+    
+    checkpoint = info.value.checkpoint
+    assert checkpoint['test_count'] == 50
+    assert checkpoint['channels'] == channels
+    assert list(checkpoint['channel_test_results']) == [1, 2]
+
+
+def test_resume_from_checkpoint_matches_uninterrupted_run():
+    channels = _channels()
+    expected = _manager().test_channels(channels, 50)
+    
+    cancel_event, on_channel = _cancel_after(3)
+    with pytest.raises(AnalysisCancelled) as info:
+        _manager().test_channels(channels, 50, cancel_event=cancel_event, channel_callback=on_channel)
+    
+    tested = []
+    results = _manager().test_channels(channels, 50, checkpoint=info.value.checkpoint,
+                                       channel_callback=lambda data: tested.append(data['channel_info'].channel))
+    # 只测试检查点之后的信道，结果与一次完成的分析相同
+    assert tested == [4, 5, 6]
+    _assert_same_results(results, expected)
+
+
+def test_is_resumable():
+    channels = _channels()
+    checkpoint = RecommendationManager.make_checkpoint(channels, 50, {})
+    assert RecommendationManager.is_resumable(checkpoint, channels, 50)
+    assert not RecommendationManager.is_resumable(checkpoint, channels, 100)
+    assert not RecommendationManager.is_resumable(checkpoint, _channels(5), 50)
+    assert not RecommendationManager.is_resumable(None, channels, 50)
+
+
+def test_stale_checkpoint_is_ignored():
+    channels = _channels()
+    cancel_event, on_channel = _cancel_after(2)
+    with pytest.raises(AnalysisCancelled) as info:
+        _manager().test_channels(channels, 50, cancel_event=cancel_event, channel_callback=on_channel)
+    
+    # 测试次数变化后检查点失效，重新测试全部信道
+    tested = []
+    _manager().test_channels(channels, 60, checkpoint=info.value.checkpoint,
+                             channel_callback=lambda data: tested.append(data['channel_info'].channel))
+    assert tested == [1, 2, 3, 4, 5, 6]
+
+
+def test_recommend_picks_tested_channel():
+    channels = _channels()
+    recommendation = _manager().recommend(channels, 50)
+    assert recommendation.band == '2.4GHz'
+    assert recommendation.channel in {info.channel for info in channels}
+    with pytest.raises(ValueError):
+        _manager().recommend([], 50)
+
+
+def test_process_pool_matches_serial_run():
+    channels = _channels()
+    serial = _manager().test_channels(channels, 2000)
+    manager = RecommendationManager(workers=2, seed=7, parallel_min_samples=1, history=None)
+    assert manager._use_processes(len(channels), 2000)
+    
+    _assert_same_results(manager.test_channels(channels, 2000), serial)
+
+
+def test_process_pool_cancel_leaves_consistent_checkpoint():
+    channels = _channels(8)
+    serial = _manager().test_channels(channels, 200000)
+    manager = RecommendationManager(workers=2, seed=7, parallel_min_samples=1, history=None)
+    cancel_event, on_channel = _cancel_after(1)
+    with pytest.raises(AnalysisCancelled) as info:
+        manager.test_channels(channels, 200000, cancel_event=cancel_event, channel_callback=on_channel)
+    
+    checkpoint = info.value.checkpoint
+    completed = checkpoint['channel_test_results']
+    # 取消时已在运行的信道完成后保留，排队中的信道被丢弃
+    assert 1 <= len(completed) < len(channels)
+    for channel, data in completed.items():
+        assert len(data['test_data']) == 200000
+        np.testing.assert_array_equal(data['test_data'].throughput, serial[channel]['test_data'].throughput)
+    
+    _assert_same_results(manager.test_channels(channels, 200000, checkpoint=checkpoint), serial)
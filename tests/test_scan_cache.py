@@ -0,0 +1,78 @@
+import pytest
+from src.models.data_models import ChannelInfo
+from src.services.scan_cache import ScanCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+def _channels(band, signal=-60):
+    return [ChannelInfo(channel=1, frequency=2.412, band=band, signal_strength=signal, occupancy=20.0,
+                        interference=10.0, networks=['Office'])]
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ScanCache(ttl=300, max_entries=4, clock=clock)
+    cache.put('2.4GHz', _channels('2.4GHz'))
+    
+    clock.now += 120
+    channels, age = cache.get('2.4GHz')
+    assert age == pytest.approx(120)
+    assert channels[0].band == '2.4GHz'
+    
+    clock.now += 181
+    assert cache.get('2.4GHz') is None
+    assert cache.age('2.4GHz') is None
+
+
+def test_least_recently_used_band_is_evicted(clock):
+    cache = ScanCache(ttl=300, max_entries=2, clock=clock)
+    cache.put_many({'2.4GHz': _channels('2.4GHz'), '5GHz': _channels('5GHz')})
+    # 读取2.4GHz后5GHz成为最久未使用的条目
+    assert cache.get('2.4GHz') is not None
+    cache.put('6GHz', _channels('6GHz'))
+    
+    assert cache.get('5GHz') is None
+    assert cache.get('2.4GHz') is not None
+    assert cache.get('6GHz') is not None
+
+
+def test_invalidate(clock):
+    cache = ScanCache(ttl=300, max_entries=4, clock=clock)
+    cache.put_many({'2.4GHz': _channels('2.4GHz'), '5GHz': _channels('5GHz')})
+    cache.invalidate('5GHz')
+    assert cache.get('5GHz') is None and cache.get('2.4GHz') is not None
+    cache.invalidate()
+    assert cache.get('2.4GHz') is None
+
+
+def test_persistence_round_trip(tmp_path, clock):
+    path = str(tmp_path / 'cache' / 'scan_cache.json')
+    cache = ScanCache(ttl=300, max_entries=4, path=path, clock=clock)
+    cache.put_many({'2.4GHz': _channels('2.4GHz', -55), '5GHz': _channels('5GHz', -70)})
+    
+    clock.now += 10
+    restored = ScanCache(ttl=300, max_entries=4, path=path, clock=clock)
+    channels, age = restored.get('5GHz')
+    assert age == pytest.approx(10)
+    assert channels == _channels('5GHz', -70)
+    
+    # 加载时跳过已过期的条目
+    clock.now += 300
+    assert ScanCache(ttl=300, max_entries=4, path=path, clock=clock).get('2.4GHz') is None
+
+
+def test_no_path_does_not_write(tmp_path, clock, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ScanCache(ttl=300, max_entries=4, clock=clock).put('2.4GHz', _channels('2.4GHz'))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,118 @@
+import os
+import pytest
+from src.services.scan_parser import (FORMAT_IW, FORMAT_NETSH, FORMAT_NMCLI, NO_SIGNAL_DBM, band_of_channel,
+                                      build_channel_infos, channel_to_frequency, detect_format,
+                                      frequency_to_channel, parse_scan_file, parse_scan_output, percent_to_dbm)
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'scans')
+
+
+def _parse(name):
+    return {network.bssid: network for network in parse_scan_file(os.path.join(FIXTURES, name))}
+
+
+def _summary(network):
+    return network.ssid, network.channel, network.signal_strength
+
+
+def test_netsh_english():
+    networks = _parse('netsh_bssid_en.txt')
+    assert {bssid: _summary(n) for bssid, n in networks.items()} == {
+        '3c:37:86:a1:10:01': ('Office-Main', 36, -54),
+        '3c:37:86:a1:10:02': ('Office-Main', 6, -65),
+        '3c:37:86:a1:20:01': ('Guest', 1, -68),
+        '80:2a:a8:5c:33:9f': ('', 149, -85),
+        'f4:f2:6d:00:41:7c': ('Lab-IoT', 7, -78),
+    }
+    assert networks['3c:37:86:a1:10:01'].encryption_type == 'WPA2-Enterprise'
+    assert networks['3c:37:86:a1:10:01'].frequency == pytest.approx(5.18)
+
+
+def test_netsh_chinese():
+    networks = _parse('netsh_bssid_zh.txt')
+    assert {bssid: _summary(n) for bssid, n in networks.items()} == {
+        '48:7d:2e:11:22:33': ('ChinaNet-5G', 44, -60),
+        '50:bd:5f:8a:2c:01': ('TP-LINK_8A2C', 11, -72),
+    }
+    assert networks['48:7d:2e:11:22:33'].encryption_type == 'WPA2 - 个人'
+
+
+def test_nmcli_terse_unescapes_colons():
+    networks = _parse('nmcli_terse.txt')
+    assert len(networks) == 6
+    # SSID中的转义冒号与BSSID中的转义冒号都应还原
+    assert _summary(networks['00:1a:2b:3c:4d:5e']) == ('Cafe:Corner', 11, -74)
+    assert _summary(networks['3c:37:86:a1:10:01']) == ('Office-Main', 36, -54)
+    assert _summary(networks['80:2a:a8:5c:33:9f']) == ('', 149, -85)
+    assert networks['f4:f2:6d:00:41:7c'].encryption_type == 'Open'
+    assert networks['00:1a:2b:3c:4d:5e'].encryption_type == 'WPA1 WPA2'
+
+
+def test_iw_scan():
+    networks = _parse('iw_scan.txt')
+    assert {bssid: _summary(n) for bssid, n in networks.items()} == {
+        '3c:37:86:a1:10:01': ('Office-Main', 36, -42),
+        '3c:37:86:a1:10:02': ('Office-Main', 6, -58),
+        '3c:37:86:a1:20:01': ('Guest', 1, -64),
+        'f4:f2:6d:00:41:7c': ('Lab-IoT', 7, -77),
+        '80:2a:a8:5c:33:9f': ('', 149, -85),
+    }
+    assert networks['3c:37:86:a1:10:01'].encryption_type == 'WPA2'
+    assert networks['3c:37:86:a1:20:01'].encryption_type == 'WPA'
+    assert networks['f4:f2:6d:00:41:7c'].encryption_type == 'Open'
+    # 最后一个BSS没有信道字段(信道由频率换算)，只有Privacy标志时视为WEP
+    assert networks['80:2a:a8:5c:33:9f'].encryption_type == 'WEP'
+
+
+@pytest.mark.parametrize('name, fmt', [
+    ('netsh_bssid_en.txt', FORMAT_NETSH),
+    ('netsh_bssid_zh.txt', FORMAT_NETSH),
+    ('nmcli_terse.txt', FORMAT_NMCLI),
+    ('iw_scan.txt', FORMAT_IW),
+])
+def test_detect_format(name, fmt):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        first_line = next(line for line in f if line.strip())
+    assert detect_format(first_line) == fmt
+
+
+def test_nmcli_skips_malformed_lines_and_missing_signal():
+    lines = [
+        "garbage line without fields",
+        "Net:AA\\:BB\\:CC\\:DD\\:EE\\:FF:6:2437 MHz::WPA2",
+        "NoChan:AA\\:BB\\:CC\\:DD\\:EE\\:00::5200 MHz:50:",
+    ]
+    networks = parse_scan_output(lines, FORMAT_NMCLI)
+    assert [(n.ssid, n.channel, n.signal_strength) for n in networks] == [
+        ('Net', 6, NO_SIGNAL_DBM),
+        ('NoChan', 40, -75),
+    ]
+
+
+def test_unit_conversions():
+    assert percent_to_dbm(0) == -100
+    assert percent_to_dbm(100) == -50
+    assert percent_to_dbm(150) == -50
+    assert channel_to_frequency(1) == pytest.approx(2.412)
+    assert channel_to_frequency(14) == pytest.approx(2.484)
+    assert channel_to_frequency(36) == pytest.approx(5.18)
+    assert frequency_to_channel(2412) == 1
+    assert frequency_to_channel(2484) == 14
+    assert frequency_to_channel(5745) == 149
+    assert band_of_channel(11) == '2.4GHz'
+    assert band_of_channel(36) == '5GHz'
+
+
+def test_build_channel_infos_from_fixture():
+    networks = parse_scan_file(os.path.join(FIXTURES, 'netsh_bssid_en.txt'))
+    channels = {info.channel: info for info in build_channel_infos(networks, '2.4GHz', list(range(1, 14)))}
+    
+    assert len(channels) == 13
+    assert channels[6].signal_strength == -65
+    assert channels[6].networks == ['Office-Main']
+    assert channels[13].networks == []
+    assert channels[13].signal_strength == NO_SIGNAL_DBM
+    # 有同信道网络的信道占用率更高，邻信道网络造成干扰
+    assert channels[6].occupancy > 0 and channels[13].occupancy == 0
+    assert channels[4].interference > 0
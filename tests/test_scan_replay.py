@@ -0,0 +1,84 @@
+import os
+import pytest
+from src.managers.channel_scan_manager import SOURCE_REPLAY, ChannelScanManager
+from src.models.data_models import ChannelInfo, ChannelScanResult
+from src.services.scan_replay import SPEED_UNLIMITED, ReplayExhausted, ScanReplay
+from src.services.session_store import SessionWriter
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'scans')
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _replay(timestamps, **kwargs):
+    clock = FakeClock()
+    snapshots = [(t, {'2.4GHz': [ChannelInfo(1, 2.412, '2.4GHz', -60 - i, 0.0, 0.0, [])]})
+                 for i, t in enumerate(timestamps)]
+    return ScanReplay(lambda: iter(snapshots), 'test', clock=clock, sleep=clock.sleep, **kwargs), clock
+
+
+def test_replay_paces_by_recorded_intervals():
+    replay, clock = _replay([100.0, 110.0, 130.0], speed=2.0)
+    signals = [replay()['2.4GHz'][0].signal_strength for _ in range(3)]
+    assert signals == [-60, -61, -62]
+    assert clock.sleeps == pytest.approx([5.0, 10.0])
+
+
+def test_unlimited_speed_and_exhaustion():
+    replay, clock = _replay([0.0, 60.0], speed=SPEED_UNLIMITED)
+    replay()
+    replay()
+    assert clock.sleeps == []
+    with pytest.raises(ReplayExhausted):
+        replay()
+    
+    replay.reset()
+    assert replay()['2.4GHz'][0].signal_strength == -60
+
+
+def test_loop_restarts_without_waiting():
+    replay, clock = _replay([0.0, 10.0], speed=1.0, loop=True)
+    signals = [replay()['2.4GHz'][0].signal_strength for _ in range(4)]
+    assert signals == [-60, -61, -60, -61]
+    assert clock.sleeps == pytest.approx([10.0, 10.0])
+    assert replay.scans == 4
+
+
+def test_fixture_directory_replay_through_manager():
+    replay = ScanReplay.from_path(FIXTURES, speed=SPEED_UNLIMITED)
+    manager = ChannelScanManager(scanner=replay, history=None, source=SOURCE_REPLAY)
+    results = [manager.scan(fallback=False) for _ in range(len(os.listdir(FIXTURES)))]
+    assert all(result.source == SOURCE_REPLAY for result in results)
+    assert all(result.channels('2.4GHz') for result in results)
+    with pytest.raises(ReplayExhausted):
+        manager.scan(fallback=False)
+
+
+def test_session_replay(tmp_path):
+    path = str(tmp_path / 'survey.wts')
+    bands = {'5GHz': [ChannelInfo(36, 5.18, '5GHz', -50, 10.0, 5.0, ['Office'])], '2.4GHz': []}
+    with SessionWriter(path, compression='none') as writer:
+        writer.write_scan(ChannelScanResult(bands=bands, source='scan', duration=0.5), timestamp=1.0)
+    
+    replay = ScanReplay.from_path(path, speed=SPEED_UNLIMITED)
+    assert replay.description == f'session {path}'
+    assert replay() == bands
+
+
+def test_missing_source():
+    with pytest.raises(FileNotFoundError):
+        ScanReplay.from_path('/nonexistent/replay')
+    with pytest.raises(ValueError):
+        ScanReplay.from_fixtures([])
@@ -0,0 +1,64 @@
+import asyncio
+import time
+from src.models.data_models import ServerProbeResult
+from src.services.connection_pool import ConnectionPool
+from src.services.server_selector import ServerSelector
+
+
+def _selector(**kwargs):
+    options = dict(probe_timeout=0.5, rtt_probes=1, probe_bytes=5000, probe_duration=1.0, rtt_prune_factor=3.0,
+                   top_k=2)
+    options.update(kwargs)
+    return ServerSelector(**options)
+
+
+def _fixed_rtts(selector, monkeypatch, rtts):
+    # 本机服务器的RTT几乎相同，按URL给定RTT以检验剔除
+    async def probe_rtt(url):
+        return ServerProbeResult(url=url, rtt=rtts[url])
+    monkeypatch.setattr(selector, '_probe_rtt', probe_rtt)
+
+
+def test_servers_pruned_by_rtt_factor_are_not_probed(base_url, monkeypatch):
+    near, far = f'{base_url}/bytes/5000', f'{base_url}/bytes/6000'
+    selector = _selector()
+    _fixed_rtts(selector, monkeypatch, {near: 1.0, far: 3.5})
+    
+    ranked = asyncio.run(selector.probe_all([far, near]))
+    assert [result.url for result in ranked] == [near, far]
+    assert ranked[0].usable and ranked[0].probe_bytes == 5000
+    # 超过最快服务器3倍RTT的服务器被剔除，不做吞吐量探测
+    assert ranked[1].pruned and ranked[1].throughput is None and ranked[1].probe_bytes == 0
+    # select只返回可用的服务器
+    assert [result.url for result in selector.run([far, near], k=5)] == [near]
+
+
+def test_ranking_puts_usable_servers_first_by_throughput(base_url, monkeypatch):
+    urls = [f'{base_url}/error', f'{base_url}/bytes/5000', f'{base_url}/bytes/8000', f'{base_url}/bytes/20000']
+    selector = _selector()
+    _fixed_rtts(selector, monkeypatch, dict.fromkeys(urls, 1.0))
+    
+    ranked = asyncio.run(selector.probe_all(urls))
+    usable = [result for result in ranked if result.usable]
+    assert len(usable) == 3
+    assert [result.throughput for result in usable] == sorted((result.throughput for result in usable), reverse=True)
+    # 失败的服务器排在最后
+    assert (ranked[-1].url, ranked[-1].error) == (urls[0], 'HTTP 500')
+    selected = selector.run(urls)
+    assert len(selected) == 2 and all(result.usable for result in selected)
+
+
+def test_probe_timeout_applies_with_shared_pool(base_url, monkeypatch):
+    url = f'{base_url}/stall/1'
+    selector = _selector(probe_timeout=0.2, probe_duration=3.0)
+    _fixed_rtts(selector, monkeypatch, {url: 1.0})
+    
+    async def run():
+        # 共享连接池的超时远大于probe_timeout
+        async with ConnectionPool(timeout=10) as pool:
+            return await selector.probe_all([url], pool)
+    
+    start = time.monotonic()
+    [result] = asyncio.run(run())
+    assert time.monotonic() - start < 0.8
+    assert not result.usable and 'no response' in result.error
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from src.models.data_models import ChannelInfo, ChannelScanResult, ChannelTestDataStore
+from src.services import session_store
+from src.services.session_store import (COMPRESSION_NONE, COMPRESSION_ZLIB, SessionReader, SessionWriter,
+                                        is_session_file)
+
+
+def _info(band, channel, signal, networks):
+    return ChannelInfo(channel=channel, frequency=2.412 if band == '2.4GHz' else 5.18, band=band,
+                       signal_strength=signal, occupancy=12.5, interference=3.25, networks=networks)
+
+
+def _scan(i):
+    return ChannelScanResult(bands={
+        '2.4GHz': [_info('2.4GHz', 1, -60 - i, ['Office', '办公室']), _info('2.4GHz', 6, -70, [])],
+        '5GHz': [_info('5GHz', 36, -55, ['Office-5G'])],
+    }, source='scan', duration=0.5)
+
+
+def _samples(channel, count):
+    return ChannelTestDataStore(channel, '5GHz', 80.0, rssi=np.arange(count) - 90, snr=np.arange(count) / 2,
+                                throughput=np.linspace(10, 500, count), packet_loss=np.full(count, 0.25),
+                                timestamp_ns=np.arange(count, dtype=np.int64) * 1000)
+
+
+def _assert_same_samples(actual, expected):
+    assert (actual.channel, actual.band, actual.bandwidth) == (expected.channel, expected.band, expected.bandwidth)
+    for name in ('rssi', 'snr', 'throughput', 'packet_loss', 'timestamp_ns'):
+        np.testing.assert_array_equal(getattr(actual, name), getattr(expected, name))
+
+
+@pytest.mark.parametrize('compression', [COMPRESSION_NONE, COMPRESSION_ZLIB])
+def test_round_trip(tmp_path, compression):
+    path = str(tmp_path / 'survey.wts')
+    samples = _samples(36, 1000)
+    with SessionWriter(path, compression=compression, block_rows=300, metadata={'site': 'lab'}) as writer:
+        for i in range(3):
+            writer.write_scan(_scan(i), timestamp=100.0 + i)
+        writer.write_samples(samples)
+        writer.write_channel_tests({40: {'test_data': _samples(40, 10)}})
+    
+    assert is_session_file(path)
+    with SessionReader(path) as reader:
+        assert (reader.snapshot_count, reader.sample_set_count, reader.sample_count) == (3, 2, 1010)
+        assert reader.metadata == {'site': 'lab'}
+        assert reader.time_range() == (100.0, 102.0)
+        
+        snapshots = list(reader.iter_snapshots())
+        assert [timestamp for timestamp, _ in snapshots] == [100.0, 101.0, 102.0]
+        for i, (_, result) in enumerate(snapshots):
+            assert result == _scan(i)
+        assert reader.snapshot(-1) == snapshots[2]
+        assert [t for t, _ in reader.iter_snapshots(1, 2)] == [101.0]
+        
+        _assert_same_samples(reader.samples(0), samples)
+        [channel_40] = reader.iter_samples(channel=40)
+        _assert_same_samples(channel_40, _samples(40, 10))
+
+
+def test_empty_bands_round_trip(tmp_path):
+    path = str(tmp_path / 'survey.wts')
+    results = [
+        ChannelScanResult(bands={'2.4GHz': [_info('2.4GHz', 1, -60, ['a'])], '5GHz': []}, source='scan',
+                          duration=0.5),
+        ChannelScanResult(bands={'5GHz': []}, source='simulated', duration=0.0),
+        ChannelScanResult(bands={}, source='scan', duration=0.0),
+    ]
+    with SessionWriter(path, compression=COMPRESSION_NONE) as writer:
+        for i, result in enumerate(results):
+            writer.write_scan(result, timestamp=float(i))
+    
+    with SessionReader(path) as reader:
+        assert [result for _, result in reader.iter_snapshots()] == results
+
+
+def test_snapshots_span_multiple_blocks(tmp_path, monkeypatch):
+    # 每个快照3个信道，块在第2、4个快照后切分
+    monkeypatch.setattr(session_store, 'SCAN_BLOCK_ROWS', 5)
+    path = str(tmp_path / 'survey.wts')
+    with SessionWriter(path, compression=COMPRESSION_ZLIB) as writer:
+        for i in range(5):
+            writer.write_scan(_scan(i), timestamp=float(i))
+    
+    with SessionReader(path) as reader:
+        assert len(reader._scan_blocks) == 3
+        assert reader.snapshot(3) == (3.0, _scan(3))
+        assert [t for t, _ in reader.iter_snapshots(start=1, stop=4)] == [1.0, 2.0, 3.0]
+
+
+def test_rejects_unclosed_and_foreign_files(tmp_path):
+    path = str(tmp_path / 'partial.wts')
+    writer = SessionWriter(path, compression=COMPRESSION_NONE)
+    writer.write_samples(_samples(36, 100))
+    writer._file.flush()
+    with pytest.raises(ValueError, match='incomplete'):
+        SessionReader(path)
+    writer.close()
+    
+    other = tmp_path / 'scan.txt'
+    other.write_text('not a session')
+    assert not is_session_file(str(other))
+    with pytest.raises(ValueError, match='not a session file'):
+        SessionReader(str(other))
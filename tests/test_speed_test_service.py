@@ -0,0 +1,130 @@
+import asyncio
+import pytest
+from src.services.connection_pool import ConnectionPool
+from src.services.speed_test_service import (ConvergenceDetector, SlidingWindowMeter, SpeedTestError, SpeedTestService,
+                                             _until_stopped, iter_upload_chunks)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def _service():
+    return SpeedTestService(streams=2, warmup=0.05, window=0.2, sample_interval=0.05, max_duration=0.5,
+                            timeout=5, preconnect=True)
+
+
+def test_download_reports_ttfb_and_throughput(base_url):
+    result = asyncio.run(_service().measure_download(f'{base_url}/bytes/5000000'))
+    assert result.bytes_transferred > 0
+    assert result.throughput > 0
+    # 首字节时间在响应头到达时记录
+    assert result.ttfb is not None and result.ttfb > 0
+    assert result.connection_stats.connections_opened == 2
+
+
+def test_download_rejects_error_status(base_url):
+    with pytest.raises(SpeedTestError, match='HTTP 500'):
+        asyncio.run(_service().measure_download(f'{base_url}/error'))
+
+
+def test_latency_over_keep_alive_connection(base_url):
+    async def run():
+        return await _service().measure_latency(f'{base_url}/bytes/10', count=3)
+    
+    result = asyncio.run(run())
+    assert (result.sent, result.received) == (3, 3)
+    assert result.min > 0
+
+
+def test_stopped_upload_ends_chunked_body_cleanly(base_url):
+    metered = []
+    
+    def chunks(stop):
+        # 发出5块后请求停止，_until_stopped在下一块之前结束请求体
+        for index, chunk in enumerate(iter_upload_chunks(100 * 4096, memoryview(bytes(4096)))):
+            if index == 5:
+                stop.set()
+            yield chunk
+    
+    async def run():
+        stop = asyncio.Event()
+        async with ConnectionPool(timeout=5) as pool:
+            return await pool.request("POST", f'{base_url}/sink', body=_until_stopped(chunks(stop), stop),
+                                      on_sent_bytes=metered.append)
+    
+    response = asyncio.run(run())
+    assert response.headers['x-terminated'] == 'True'
+    assert int(response.headers['x-received']) == sum(metered) == 5 * 4096
+
+
+def test_meter_needs_half_a_window_and_trims_old_samples():
+    clock = _FakeClock()
+    meter = SlidingWindowMeter(window=1.0, clock=clock)
+    meter.reset()
+    # 每0.25秒31250字节即1 Mbps；不足半个窗口时没有估计值
+    rates = []
+    for _ in range(8):
+        clock.now += 0.25
+        meter.add(31250)
+        rates.append(meter.sample())
+    assert rates[0] is None
+    assert rates[1:] == [pytest.approx(1.0)] * 7
+    
+    # 速率翻倍，一个完整窗口之后窗口内只剩新速率的采样
+    rates = []
+    for _ in range(4):
+        clock.now += 0.25
+        meter.add(62500)
+        rates.append(meter.sample())
+    assert 1.0 < rates[0] < 2.0
+    assert rates[-1] == pytest.approx(2.0)
+    assert meter.average() == pytest.approx((8 * 31250 + 4 * 62500) * 8 / 3.0 / 1e6)
+
+
+def test_meter_reset_discards_warmup():
+    clock = _FakeClock()
+    meter = SlidingWindowMeter(window=1.0, clock=clock)
+    meter.add(1_000_000)
+    clock.now = 1.0
+    meter.sample()
+    
+    # 预热结束后重新计量，之前的字节与采样都不计入
+    meter.reset()
+    assert (meter.measured_bytes, meter.elapsed, meter.sample()) == (0, 0.0, None)
+    clock.now = 1.25
+    meter.add(31250)
+    assert meter.sample() is None
+    clock.now = 1.5
+    meter.add(31250)
+    assert meter.sample() == pytest.approx(1.0)
+    assert (meter.measured_bytes, meter.elapsed) == (62500, 0.5)
+    assert meter.average() == pytest.approx(1.0)
+
+
+def test_convergence_around_tolerance():
+    detector = ConvergenceDetector(samples=3, tolerance=0.1)
+    detector.add(95.0)
+    detector.add(105.0)
+    assert not detector.converged()
+    # 相对极差恰好等于容差时收敛
+    detector.add(100.0)
+    assert detector.converged()
+    assert detector.estimate() == 100.0
+    
+    # 只保留最近3个估计值，相对极差超过容差则未收敛
+    detector.add(94.8)
+    assert not detector.converged()
+    detector.add(100.0)
+    detector.add(102.0)
+    assert detector.converged()
+    
+    zero = ConvergenceDetector(samples=1, tolerance=0.1)
+    zero.add(0.0)
+    zero.add(0.0)
+    assert not zero.converged()
+    assert ConvergenceDetector(samples=3, tolerance=0.1).estimate() == 0.0
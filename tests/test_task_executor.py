@@ -0,0 +1,102 @@
+import threading
+import pytest
+from src.services.task_executor import TaskExecutor, TaskPriority, TaskQueueFullError
+
+
+@pytest.fixture
+def executor():
+    executor = TaskExecutor(max_workers=1, max_queue_size=3)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def _block(executor):
+    """占用唯一的工作线程，返回(释放事件, 句柄)"""
+    started = threading.Event()
+    release = threading.Event()
+    
+    def run():
+        started.set()
+        release.wait(5)
+    
+    handle = executor.submit(run, name='blocker')
+    assert started.wait(5)
+    return release, handle
+
+
+def test_higher_priority_runs_first(executor):
+    release, _ = _block(executor)
+    order = []
+    handles = [executor.submit(order.append, priority, priority=priority)
+               for priority in (TaskPriority.BACKGROUND, TaskPriority.RECOMMENDATION, TaskPriority.SCAN)]
+    release.set()
+    for handle in handles:
+        handle.result(5)
+    assert order == [TaskPriority.SCAN, TaskPriority.RECOMMENDATION, TaskPriority.BACKGROUND]
+
+
+def test_same_priority_is_fifo(executor):
+    release, _ = _block(executor)
+    order = []
+    handles = [executor.submit(order.append, i, priority=TaskPriority.SCAN) for i in range(3)]
+    release.set()
+    handles[-1].result(5)
+    assert order == [0, 1, 2]
+
+
+def test_queue_bound(executor):
+    release, _ = _block(executor)
+    handles = [executor.submit(lambda: None) for _ in range(3)]
+    assert executor.pending_count() == 3
+    with pytest.raises(TaskQueueFullError):
+        executor.submit(lambda: None)
+    
+    # 已取消的任务不再占用队列
+    assert handles[0].cancel()
+    executor.submit(lambda: None)
+    release.set()
+
+
+def test_cancel_queued_and_running(executor):
+    release, running = _block(executor)
+    ran = []
+    queued = executor.submit(ran.append, 1)
+    
+    assert queued.cancel()
+    assert queued.cancelled() and queued.done()
+    
+    # 运行中的任务只设置取消标志，由任务自行结束
+    assert not running.cancel()
+    assert running.running() and running.is_cancel_requested()
+    release.set()
+    running.result(5)
+    assert running.done() and not running.cancelled()
+    assert ran == []
+
+
+def test_result_and_exceptions(executor):
+    assert executor.submit(lambda x: x * 2, 21).result(5) == 42
+    
+    def fail():
+        raise ValueError("boom")
+    
+    handle = executor.submit(fail)
+    with pytest.raises(ValueError, match='boom'):
+        handle.result(5)
+    
+    callbacks = []
+    handle.add_done_callback(callbacks.append)
+    assert callbacks == [handle]
+
+
+def test_shutdown_cancels_pending_tasks(executor):
+    release, running = _block(executor)
+    pending = executor.submit(lambda: None)
+    executor.shutdown(wait=False)
+    assert pending.cancelled()
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+    
+    release.set()
+    executor.shutdown(wait=True)
+    assert running.done() and not running.cancelled()
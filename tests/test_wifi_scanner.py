@@ -0,0 +1,45 @@
+import os
+import pytest
+from src.services import wifi_scanner
+from src.services.config_service import config_service
+from src.services.scan_parser import FORMAT_NMCLI, NO_SIGNAL_DBM
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'scans')
+
+
+def _fake_scan_command(monkeypatch, output):
+    calls = []
+    
+    def run_scan_command():
+        calls.append(1)
+        return output, FORMAT_NMCLI
+    
+    monkeypatch.setattr(wifi_scanner, 'run_scan_command', run_scan_command)
+    return calls
+
+
+def test_scan_all_bands_builds_both_bands_from_one_scan(monkeypatch):
+    with open(os.path.join(FIXTURES, 'nmcli_terse.txt'), encoding='utf-8') as f:
+        calls = _fake_scan_command(monkeypatch, f.read())
+    
+    results = wifi_scanner.scan_all_bands()
+    # 只执行一次扫描命令，按信道拆分到各频段
+    assert len(calls) == 1
+    assert list(results) == config_service.get_bands()
+    for band, channels in results.items():
+        assert [info.channel for info in channels] == config_service.get_channels_for_band(band)
+        assert all(info.band == band for info in channels)
+    
+    channels_24 = {info.channel: info for info in results['2.4GHz']}
+    channels_5 = {info.channel: info for info in results['5GHz']}
+    assert channels_24[6].networks == ['Office-Main']
+    assert channels_5[36].networks == ['Office-Main']
+    assert channels_5[149].signal_strength < channels_5[36].signal_strength
+    assert channels_5[44].signal_strength == NO_SIGNAL_DBM
+
+
+def test_scan_all_bands_rejects_empty_scan(monkeypatch):
+    _fake_scan_command(monkeypatch, '')
+    with pytest.raises(RuntimeError, match='No networks'):
+        wifi_scanner.scan_all_bands()